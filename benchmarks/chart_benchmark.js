@@ -0,0 +1,84 @@
+// Times the chart's rendering and dependency cascade in Node, on the headless DOM.
+//
+//     node benchmarks/chart_benchmark.js plan.json [repeats]
+//
+// plan.json is a project as gantt_data holds it (run.py writes one from gantt_core.synthetic).
+// The chart's scripts are loaded as index.html loads them and started with the plan, then each
+// entry point is called `repeats` times after one untimed warm-up call. Prints one JSON object of
+// timings in milliseconds: a single `initGanttChart` and lists for the rest. Without a Worker the
+// scheduling engine runs on the page, so getDependencyUpdatePlan times the engine itself rather
+// than a round trip to a worker.
+
+const fs = require('fs');
+const path = require('path');
+const { performance } = require('perf_hooks');
+const { addElementsWithIds } = require('./headless_dom');
+
+const FRONTEND_DIR = path.join(__dirname, '..', 'frontend');
+// Loaded after streamlit.js, in the order of index.html.
+const CHART_SCRIPTS = ['gantt-engine.js', 'gantt.js'];
+const DAY_MS = 86400000;
+
+const loadChartScripts = () => {
+    addElementsWithIds(fs.readFileSync(path.join(FRONTEND_DIR, 'index.html'), 'utf8'));
+    new Function(fs.readFileSync(path.join(FRONTEND_DIR, 'streamlit.js'), 'utf8'))();
+    // In a browser `window` is the global object; here what streamlit.js sets on it is copied over.
+    globalThis.Streamlit = window.Streamlit;
+    const source = CHART_SCRIPTS.map(name => fs.readFileSync(path.join(FRONTEND_DIR, name), 'utf8')).join('\n;\n');
+    return new Function(`${source}\nreturn initGanttChart;`)();
+};
+
+const shiftDate = (text, days) => {
+    const [day, month, year] = text.split('/').map(Number);
+    const date = new Date(Date.UTC(year, month - 1, day) + days * DAY_MS);
+    return `${String(date.getUTCDate()).padStart(2, '0')}/${String(date.getUTCMonth() + 1).padStart(2, '0')}/${date.getUTCFullYear()}`;
+};
+
+const time = async (fn, repeats) => {
+    await fn();
+    const samples = [];
+    for (let i = 0; i < repeats; i++) {
+        const start = performance.now();
+        await fn();
+        samples.push(performance.now() - start);
+    }
+    return samples;
+};
+
+const main = async () => {
+    const [planPath, repeatsArg] = process.argv.slice(2);
+    if (!planPath) {
+        console.error('usage: node benchmarks/chart_benchmark.js plan.json [repeats]');
+        process.exit(2);
+    }
+    const plan = JSON.parse(fs.readFileSync(planPath, 'utf8'));
+    const repeats = parseInt(repeatsArg || '5', 10);
+    const initGanttChart = loadChartScripts();
+
+    const started = performance.now();
+    const chart = initGanttChart(plan);
+    const results = { initGanttChart: performance.now() - started };
+
+    results.renderGanttChart = await time(() => chart.renderGanttChart(), repeats);
+    results.drawDependencyArrows = await time(() => chart.drawDependencyArrows(), repeats);
+    // Drags a week later the task without predecessors that most tasks depend on directly, so the
+    // cascade runs through as much of the plan as it can.
+    const successorCounts = new Map();
+    plan.tasks.forEach(task => String(task.dependencies || '').split(',').filter(Boolean)
+        .forEach(id => successorCounts.set(Number(id), (successorCounts.get(Number(id)) || 0) + 1)));
+    const root = plan.tasks.filter(task => !task.dependencies)
+        .reduce((best, task) => (successorCounts.get(task.id) || 0) > (successorCounts.get(best.id) || 0) ? task : best);
+    const moved = { ...root, start: shiftDate(root.start, 7), end: shiftDate(root.end, 7) };
+    let shifted = 0;
+    results.getDependencyUpdatePlan = await time(async () => { shifted = (await chart.getDependencyUpdatePlan(moved)).length; }, repeats);
+    results.shiftedTasks = shifted;
+
+    process.stdout.write(`${JSON.stringify(results)}\n`);
+    // The chart leaves timers behind (saves, idle work); they are of no interest here.
+    process.exit(0);
+};
+
+main().catch(error => {
+    console.error(error);
+    process.exit(1);
+});
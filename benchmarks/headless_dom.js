@@ -0,0 +1,274 @@
+// A minimal stand-in for the browser DOM: just enough of it for frontend/gantt.js to build and
+// render the chart in Node, so the chart's own code can be timed without a browser. Elements keep
+// their children, classes, styles and attributes; layout is fixed (every element reports the same
+// size) and canvases draw nothing. It makes no attempt to be a general DOM.
+//
+// Requiring this module installs `window`, `document` and the few other globals the chart uses;
+// addElementsWithIds then creates the elements of a page the chart expects to find by id.
+
+const listenersByTarget = new WeakMap();
+
+class ClassList {
+    constructor() { this.names = new Set(); }
+    add(...names) { names.forEach(name => this.names.add(name)); }
+    remove(...names) { names.forEach(name => this.names.delete(name)); }
+    contains(name) { return this.names.has(name); }
+    toggle(name, force) {
+        const add = force === undefined ? !this.names.has(name) : force;
+        if (add) this.names.add(name);
+        else this.names.delete(name);
+        return add;
+    }
+}
+
+class Style {
+    setProperty(name, value) { this[name] = value; }
+    getPropertyValue(name) { return this[name] || ''; }
+}
+
+const counters = { elementsCreated: 0 };
+
+class Element {
+    constructor(tagName = 'div') {
+        counters.elementsCreated++;
+        this.tagName = tagName.toUpperCase();
+        this.id = '';
+        this.children = [];
+        this.parentNode = null;
+        this.classList = new ClassList();
+        this.style = new Style();
+        this.dataset = {};
+        this.attributes = {};
+        this.textContent = '';
+        this.value = '';
+        this.title = '';
+        this.options = [];
+        this.selectedOptions = [];
+        this.innerHTMLText = '';
+        // Fixed layout: a viewport-sized container with room to scroll.
+        this.offsetLeft = 0;
+        this.offsetTop = 0;
+        this.offsetWidth = 1200;
+        this.offsetHeight = 40;
+        this.clientWidth = 1200;
+        this.clientHeight = 700;
+        this.scrollLeft = 0;
+        this.scrollTop = 0;
+        this.scrollWidth = 2000;
+        this.scrollHeight = 2000;
+        this.width = 0;
+        this.height = 0;
+        // Markup assigned to innerHTML is not parsed, so querySelector returns a detached
+        // placeholder, one per selector, where nothing matches.
+        this.placeholders = {};
+    }
+
+    set className(value) {
+        this.classList = new ClassList();
+        this.classList.add(...value.split(/\s+/).filter(Boolean));
+    }
+    get className() { return [...this.classList.names].join(' '); }
+
+    // Markup is not parsed: setting it clears the children, as assigning '' does in a browser.
+    set innerHTML(value) {
+        this.innerHTMLText = value;
+        this.children.forEach(child => { child.parentNode = null; });
+        this.children = [];
+        this.placeholders = {};
+    }
+    get innerHTML() { return this.innerHTMLText; }
+    get outerHTML() { return `<${this.tagName.toLowerCase()}>${this.innerHTMLText}</${this.tagName.toLowerCase()}>`; }
+
+    get firstChild() { return this.children[0] || null; }
+    get lastChild() { return this.children[this.children.length - 1] || null; }
+    get nextSibling() {
+        if (!this.parentNode) return null;
+        const siblings = this.parentNode.children;
+        return siblings[siblings.indexOf(this) + 1] || null;
+    }
+    get isConnected() {
+        let node = this;
+        while (node.parentNode) node = node.parentNode;
+        return node === document.documentElement;
+    }
+
+    appendChild(child) {
+        if (child instanceof DocumentFragment) {
+            const moved = child.children;
+            child.children = [];
+            moved.forEach(node => this.appendChild(node));
+            return child;
+        }
+        child.remove();
+        child.parentNode = this;
+        this.children.push(child);
+        return child;
+    }
+    append(...children) { children.forEach(child => this.appendChild(child)); }
+    prepend(...children) { [...children].reverse().forEach(child => this.insertBefore(child, this.firstChild)); }
+    insertBefore(child, reference) {
+        if (!reference) return this.appendChild(child);
+        child.remove();
+        child.parentNode = this;
+        this.children.splice(this.children.indexOf(reference), 0, child);
+        return child;
+    }
+    replaceChildren(...children) {
+        this.innerHTML = '';
+        this.append(...children);
+    }
+    removeChild(child) {
+        child.remove();
+        return child;
+    }
+    remove() {
+        if (!this.parentNode) return;
+        const siblings = this.parentNode.children;
+        siblings.splice(siblings.indexOf(this), 1);
+        this.parentNode = null;
+    }
+
+    setAttribute(name, value) { this.attributes[name] = String(value); }
+    getAttribute(name) { return this.attributes[name] ?? null; }
+    removeAttribute(name) { delete this.attributes[name]; }
+
+    addEventListener(type, listener) {
+        if (!listenersByTarget.has(this)) listenersByTarget.set(this, {});
+        const listeners = listenersByTarget.get(this);
+        (listeners[type] = listeners[type] || []).push(listener);
+    }
+    removeEventListener(type, listener) {
+        const listeners = listenersByTarget.get(this);
+        if (listeners?.[type]) listeners[type] = listeners[type].filter(other => other !== listener);
+    }
+    // Calls the listeners for an event directly; there is no capturing or bubbling.
+    dispatch(type, event = {}) {
+        event.target = event.target || this;
+        event.preventDefault = event.preventDefault || (() => {});
+        event.stopPropagation = event.stopPropagation || (() => {});
+        ((listenersByTarget.get(this) || {})[type] || []).slice().forEach(listener => listener(event));
+    }
+
+    // Selectors are limited to what the chart uses: a tag, .classes, or [data-attribute], or a
+    // comma-separated list of those.
+    matches(selectors) {
+        return selectors.split(',').some(selector => {
+            selector = selector.trim();
+            const attribute = selector.match(/^\[data-([a-z-]+)\]$/);
+            if (attribute) return this.dataset[attribute[1].replace(/-([a-z])/g, (_, c) => c.toUpperCase())] !== undefined;
+            if (selector.startsWith('.')) return selector.slice(1).split('.').every(name => this.classList.contains(name));
+            return this.tagName === selector.toUpperCase();
+        });
+    }
+    closest(selectors) {
+        for (let node = this; node instanceof Element; node = node.parentNode) {
+            if (node.matches(selectors)) return node;
+        }
+        return null;
+    }
+    descendants() {
+        const found = [];
+        const walk = (node) => node.children.forEach(child => { found.push(child); walk(child); });
+        walk(this);
+        return found;
+    }
+    querySelectorAll(selectors) { return this.descendants().filter(node => node.matches(selectors)); }
+    querySelector(selectors) {
+        const found = this.descendants().find(node => node.matches(selectors));
+        if (found) return found;
+        if (!this.placeholders[selectors]) {
+            this.placeholders[selectors] = new Element('div');
+            this.placeholders[selectors].parentNode = this;
+        }
+        return this.placeholders[selectors];
+    }
+
+    getBoundingClientRect() {
+        return { left: 0, top: 0, right: this.clientWidth, bottom: this.clientHeight, width: this.clientWidth, height: this.clientHeight };
+    }
+    // A 2D context that accepts every call and property and draws nothing.
+    getContext() {
+        return new Proxy({}, {
+            get: (context, name) => name in context ? context[name] : name === 'measureText' ? () => ({ width: 10 }) : () => {},
+            set: (context, name, value) => { context[name] = value; return true; }
+        });
+    }
+    click() { this.dispatch('click'); }
+    focus() {}
+    blur() {}
+    reset() {}
+}
+
+class DocumentFragment extends Element {
+    constructor() { super('#document-fragment'); }
+}
+
+const elementsById = {};
+const documentElement = new Element('html');
+const body = new Element('body');
+documentElement.appendChild(body);
+
+const document = {
+    documentElement,
+    body,
+    readyState: 'complete',
+    visibilityState: 'visible',
+    getElementById(id) {
+        const registered = elementsById[id];
+        if (registered?.isConnected && registered.id === id) return registered;
+        return documentElement.descendants().find(node => node.id === id) || null;
+    },
+    createElement: (tagName) => new Element(tagName),
+    createElementNS: (namespace, tagName) => new Element(tagName),
+    createDocumentFragment: () => new DocumentFragment(),
+    createTextNode(text) {
+        const node = new Element('#text');
+        node.textContent = text;
+        return node;
+    },
+    addEventListener: (type, listener) => documentElement.addEventListener(type, listener),
+    removeEventListener: (type, listener) => documentElement.removeEventListener(type, listener),
+    querySelectorAll: (selectors) => documentElement.querySelectorAll(selectors),
+    querySelector: (selectors) => documentElement.querySelector(selectors),
+    dispatch: (type, event) => documentElement.dispatch(type, event)
+};
+
+const window = new Element('window');
+window.document = document;
+window.devicePixelRatio = 1;
+window.location = { href: 'http://localhost/' };
+// Messages the page posts to its parent (Streamlit), kept for inspection.
+window.postedMessages = [];
+window.parent = { postMessage: (message) => window.postedMessages.push(message) };
+window.print = () => {};
+
+Object.assign(globalThis, {
+    window,
+    document,
+    HTMLElement: Element,
+    addEventListener: window.addEventListener.bind(window),
+    removeEventListener: window.removeEventListener.bind(window),
+    requestAnimationFrame: (callback) => setTimeout(() => callback(performance.now()), 0),
+    cancelAnimationFrame: (handle) => clearTimeout(handle),
+    requestIdleCallback: (callback) => setTimeout(() => callback({ timeRemaining: () => 50, didTimeout: false }), 0),
+    cancelIdleCallback: (handle) => clearTimeout(handle),
+    getComputedStyle: () => new Style()
+});
+window.requestAnimationFrame = globalThis.requestAnimationFrame;
+window.requestIdleCallback = globalThis.requestIdleCallback;
+window.cancelIdleCallback = globalThis.cancelIdleCallback;
+URL.createObjectURL = () => 'blob:headless';
+URL.revokeObjectURL = () => {};
+
+// Creates an element in the body for every tag with an id attribute in a page's markup, without
+// nesting them: the chart finds what it needs by id and fills in the rest itself.
+const addElementsWithIds = (html) => {
+    for (const [, tagName, id] of html.matchAll(/<([a-zA-Z]+)\b[^>]*\sid="([^"]+)"/g)) {
+        const element = new Element(tagName);
+        element.id = id;
+        elementsById[id] = element;
+        body.appendChild(element);
+    }
+};
+
+module.exports = { Element, document, window, counters, addElementsWithIds };
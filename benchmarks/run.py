@@ -0,0 +1,191 @@
+"""Benchmarks the Python data handling and the chart's rendering on synthetic plans.
+
+    python benchmarks/run.py                          # 1k, 10k and 100k tasks, Python and chart
+    python benchmarks/run.py --sizes 1000 10000 --repeat 3
+    python benchmarks/run.py --skip-chart --check     # exit 1 if anything got slower
+
+Plans come from gantt_core.synthetic, seeded, so every run times the same work. For each size the
+Python side times serialization (the wire columns, plain and gzipped, and the chart's payload) and
+the scheduling paths (dependency graph, critical path, cycles, rescheduling and validation). The
+chart side runs chart_benchmark.js under Node on a headless DOM and times initGanttChart,
+renderGanttChart, drawDependencyArrows and getDependencyUpdatePlan; it is skipped when node is not
+on PATH.
+
+Every run is appended to benchmarks/results.jsonl (--results) with the commit, the machine and the
+fastest and median time of each benchmark, and compared with the last run on the same machine with
+the same plan shape. Regressions are judged on the fastest time, which garbage collection and other
+load disturb least: one more than --tolerance slower than in that run, and by at least
+MIN_REGRESSION_MS, is reported. Timings are only comparable on one machine, so the file is not
+committed.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARKS_DIR)
+sys.path.insert(0, REPO_DIR)
+
+from gantt_core.scheduling import build_dependency_graph, compute_schedule, find_dependency_cycles, reschedule_tasks  # noqa: E402
+from gantt_core.serialization import decode_tasks, encode_project_payload, encode_tasks  # noqa: E402
+from gantt_core.synthetic import generate_project  # noqa: E402
+from gantt_core.validation import validate_project  # noqa: E402
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+DEFAULT_RESULTS = os.path.join(BENCHMARKS_DIR, 'results.jsonl')
+CHART_BENCHMARK = os.path.join(BENCHMARKS_DIR, 'chart_benchmark.js')
+# Differences below this are noise however large they are relative to the timing.
+MIN_REGRESSION_MS = 1.0
+
+
+def time_calls(fn, repeat):
+    """Calls ``fn`` once to warm up and then ``repeat`` times; returns the timings in ms."""
+    fn()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def python_benchmarks(project):
+    """Returns (name, function) pairs timing the Python paths on one plan."""
+    tasks = project['tasks']
+    graph = build_dependency_graph(tasks)
+    wire_columns = encode_tasks(tasks, compress=False)
+    wire_gzip = encode_tasks(tasks, compress=True)
+    return [
+        ('encode_tasks', lambda: encode_tasks(tasks, compress=False)),
+        ('encode_tasks_gzip', lambda: encode_tasks(tasks, compress=True)),
+        ('decode_tasks', lambda: decode_tasks(wire_columns)),
+        ('decode_tasks_gzip', lambda: decode_tasks(wire_gzip)),
+        ('encode_project_payload', lambda: encode_project_payload(project)),
+        ('build_dependency_graph', lambda: build_dependency_graph(tasks)),
+        ('compute_schedule', lambda: compute_schedule(tasks, graph)),
+        ('find_dependency_cycles', lambda: find_dependency_cycles(tasks, graph)),
+        ('reschedule_tasks', lambda: reschedule_tasks(tasks, graph)),
+        ('validate_project', lambda: validate_project(project, graph)),
+    ]
+
+
+def run_chart_benchmark(node, project, repeat):
+    """Runs chart_benchmark.js on a plan and returns its timings, with lists for repeated calls."""
+    with tempfile.TemporaryDirectory() as folder:
+        plan_path = os.path.join(folder, 'plan.json')
+        with open(plan_path, 'w') as f:
+            json.dump(project, f)
+        completed = subprocess.run([node, CHART_BENCHMARK, plan_path, str(repeat)],
+                                   capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout)
+
+
+def current_commit():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=REPO_DIR,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{commit}+" if dirty else commit
+
+
+def previous_run(path, machine, plan):
+    """Returns the last recorded run on ``machine`` with the same plan shape, or None."""
+    if not os.path.exists(path):
+        return None
+    last = None
+    with open(path) as f:
+        for line in f:
+            record = json.loads(line)
+            if record.get('machine') == machine and record.get('plan') == plan:
+                last = record
+    return last
+
+
+def _format_ms(value):
+    return f"{value:,.1f}" if value >= 10 else f"{value:.2f}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="task counts to benchmark")
+    parser.add_argument('--groups', type=int, default=20)
+    parser.add_argument('--depth', type=int, default=50, help="dependency levels in each plan")
+    parser.add_argument('--fan-in', type=int, default=3, help="most predecessors of a task")
+    parser.add_argument('--fan-out', type=int, default=4, help="most successors of a task")
+    parser.add_argument('--conflicts', type=float, default=0.05,
+                        help="share of tasks starting before a predecessor ends (default: %(default)s)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=5, help="timed calls of each function (default: %(default)s)")
+    parser.add_argument('--skip-chart', action='store_true', help="only benchmark the Python side")
+    parser.add_argument('--results', default=DEFAULT_RESULTS, help="file the run is appended to")
+    parser.add_argument('--no-record', action='store_true', help="compare with earlier runs but do not record this one")
+    parser.add_argument('--machine', default=platform.node(), help="name runs are compared under (default: host name)")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="slowdown reported as a regression, as a fraction (default: %(default)s)")
+    parser.add_argument('--check', action='store_true', help="exit with status 1 if anything regressed")
+    args = parser.parse_args(argv)
+
+    node = None if args.skip_chart else shutil.which('node')
+    if not args.skip_chart and node is None:
+        print("node is not on PATH; skipping the chart benchmarks", file=sys.stderr)
+    plan = {'groups': args.groups, 'depth': args.depth, 'fan_in': args.fan_in, 'fan_out': args.fan_out,
+            'conflicts': args.conflicts, 'seed': args.seed}
+    previous = previous_run(args.results, args.machine, plan)
+    baseline = previous['results'] if previous else {}
+
+    results = {}
+    regressions = []
+    print(f"{'benchmark':<40} {'min ms':>10} {'median ms':>11} {'previous':>10} {'change':>8}")
+    for size in args.sizes:
+        project = generate_project(size, **plan)
+        timings = [(f"python/{name}", time_calls(fn, args.repeat)) for name, fn in python_benchmarks(project)]
+        if node:
+            chart = run_chart_benchmark(node, project, args.repeat)
+            timings += [(f"chart/{name}", value if isinstance(value, list) else [value])
+                        for name, value in chart.items() if name != 'shiftedTasks']
+        for name, samples in timings:
+            key = f"{name}/{size}"
+            fastest, median = min(samples), statistics.median(samples)
+            results[key] = {'min': round(fastest, 3), 'median': round(median, 3)}
+            line = f"{key:<40} {_format_ms(fastest):>10} {_format_ms(median):>11}"
+            if key in baseline:
+                before = baseline[key]['min']
+                change = fastest / before - 1 if before else 0
+                regressed = change > args.tolerance and fastest - before >= MIN_REGRESSION_MS
+                line += f" {_format_ms(before):>10} {change:>+8.0%}{'  REGRESSION' if regressed else ''}"
+                if regressed:
+                    regressions.append(key)
+            print(line, flush=True)
+
+    if not args.no_record:
+        record = {
+            'recorded': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'commit': current_commit(),
+            'machine': args.machine,
+            'python': platform.python_version(),
+            'node': subprocess.run([node, '--version'], capture_output=True, text=True).stdout.strip() if node else None,
+            'repeat': args.repeat,
+            'plan': plan,
+            'results': results,
+        }
+        with open(args.results, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+    if previous:
+        print(f"\ncompared with {previous['commit'] or 'a run'} recorded {previous['recorded']}: "
+              f"{len(regressions)} regression{'' if len(regressions) == 1 else 's'}")
+    return 1 if args.check and regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
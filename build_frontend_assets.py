@@ -0,0 +1,61 @@
+"""Builds the chart's third-party assets into frontend/vendor/ so the page needs no CDN at runtime.
+
+    python build_frontend_assets.py              # Tailwind stylesheet and SheetJS
+    python build_frontend_assets.py --css-only   # just the stylesheet, e.g. after editing markup
+
+The stylesheet is compiled from frontend/tailwind.input.css with the Tailwind CLI, found on PATH
+(``pip install tailwindcss-bin`` provides one) or given with --tailwind. Only the utilities used
+by index.html and gantt.js are emitted. SheetJS is downloaded once, at a pinned version; the
+chart loads it from vendor/ the first time a workbook is imported or exported. Run this where the
+network is reachable and ship the resulting files; vendor/tailwind.css is kept in the repository.
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import urllib.request
+
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend")
+VENDOR_DIR = os.path.join(FRONTEND_DIR, "vendor")
+TAILWIND_INPUT = os.path.join(FRONTEND_DIR, "tailwind.input.css")
+TAILWIND_OUTPUT = os.path.join(VENDOR_DIR, "tailwind.css")
+# Keep in step with the CDN fallback in frontend/gantt.js.
+SHEETJS_URL = "https://cdnjs.cloudflare.com/ajax/libs/xlsx/0.18.5/xlsx.full.min.js"
+SHEETJS_OUTPUT = os.path.join(VENDOR_DIR, "xlsx.full.min.js")
+
+
+def build_stylesheet(tailwind):
+    subprocess.run([tailwind, "--input", TAILWIND_INPUT, "--output", TAILWIND_OUTPUT, "--minify"],
+                   cwd=FRONTEND_DIR, check=True)
+
+
+def fetch_sheetjs(force=False):
+    if os.path.exists(SHEETJS_OUTPUT) and not force:
+        return
+    with urllib.request.urlopen(SHEETJS_URL, timeout=60) as response:
+        script = response.read()
+    temporary = SHEETJS_OUTPUT + ".part"
+    with open(temporary, "wb") as f:
+        f.write(script)
+    os.replace(temporary, SHEETJS_OUTPUT)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tailwind", default=shutil.which("tailwindcss"), help="path to the Tailwind CLI")
+    parser.add_argument("--css-only", action="store_true", help="skip downloading SheetJS")
+    parser.add_argument("--force", action="store_true", help="download SheetJS even if it is present")
+    args = parser.parse_args(argv)
+    os.makedirs(VENDOR_DIR, exist_ok=True)
+    if not args.tailwind:
+        parser.error("Tailwind CLI not found; install tailwindcss-bin or pass --tailwind")
+    build_stylesheet(args.tailwind)
+    print(f"Wrote {os.path.relpath(TAILWIND_OUTPUT)}")
+    if not args.css_only:
+        fetch_sheetjs(args.force)
+        print(f"Wrote {os.path.relpath(SHEETJS_OUTPUT)}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
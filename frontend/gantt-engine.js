@@ -0,0 +1,569 @@
+// Scheduling engine for the Gantt chart. It holds its own columnar copy of the plan (ids, start and
+// end days, names, groups and the dependency graph) and answers the expensive questions about it:
+// dependency cascades, cycles, the row order for a sort and parsing imported workbooks. The chart
+// runs it in a Web Worker so that none of this blocks input or painting; where a worker cannot be
+// started the chart drives the same engine on the page.
+//
+// Messages are plain objects with a `type`. Task columns travel as typed arrays, which are
+// transferred rather than copied:
+//   load     { columns }                                 replaces the plan
+//   update   { columns, removedIds }                     upserts and removes tasks
+//   plan     { rootId, endDay, parentIds }               -> { ids, startDays, endDays } or { cycles }
+//   cycles   {}                                          -> { cycles }
+//   sort     { key, direction }                          -> { order }
+//   parse-workbook { source, xlsxUrls }                  -> { imported, skipped, issues }, tasks in progress reports
+//   parse-csv      { source }                            -> the same
+// where `columns` is { ids, startDays, endDays, depOffsets, depIds, names, groups } and a task's
+// predecessor ids are depIds[depOffsets[i]] up to depIds[depOffsets[i + 1]].
+// A workbook's `source` is the uploaded File, read in the worker, or its ArrayBuffer on the page.
+
+// Day value of a missing or unreadable date in the day columns.
+const NO_DAY = -2147483648;
+// Task ids, and the ids in dependency lists, are kept in Int32Arrays here and in the chart.
+const MIN_TASK_ID = -2147483648;
+const MAX_TASK_ID = 2147483647;
+const isTaskIdInRange = (id) => Number.isInteger(id) && id >= MIN_TASK_ID && id <= MAX_TASK_ID;
+
+const createSchedulingEngine = () => {
+    let capacity = 0;
+    let ids = new Int32Array(0);
+    let startDays = new Int32Array(0);
+    let endDays = new Int32Array(0);
+    let names = [];
+    let groups = [];
+    let parentIdsByRow = [];
+    let rowOf = new Map();
+    let freeRows = [];
+    // Ids of the tasks that list an id as a dependency (which may include missing ids).
+    let childIdsById = new Map();
+    const noIds = [];
+    const textCollator = new Intl.Collator();
+
+    const grow = (needed) => {
+        if (needed <= capacity) return;
+        capacity = Math.max(needed, capacity * 2, 64);
+        const resize = (column) => {
+            const larger = new Int32Array(capacity);
+            larger.set(column);
+            return larger;
+        };
+        ids = resize(ids);
+        startDays = resize(startDays);
+        endDays = resize(endDays);
+    };
+
+    const childIds = (id) => childIdsById.get(id) || noIds;
+    const parentIds = (id) => rowOf.has(id) ? parentIdsByRow[rowOf.get(id)] : noIds;
+
+    const unlink = (row) => {
+        parentIdsByRow[row].forEach(parentId => childIdsById.get(parentId)?.delete(ids[row]));
+        parentIdsByRow[row] = noIds;
+    };
+
+    const removeTask = (id) => {
+        const row = rowOf.get(id);
+        if (row === undefined) return;
+        unlink(row);
+        rowOf.delete(id);
+        names[row] = groups[row] = undefined;
+        freeRows.push(row);
+    };
+
+    const upsertColumns = (columns) => {
+        grow(rowOf.size + freeRows.length + columns.ids.length);
+        for (let i = 0; i < columns.ids.length; i++) {
+            const id = columns.ids[i];
+            let row = rowOf.get(id);
+            if (row === undefined) {
+                row = freeRows.length > 0 ? freeRows.pop() : rowOf.size;
+                rowOf.set(id, row);
+            } else {
+                unlink(row);
+            }
+            ids[row] = id;
+            startDays[row] = columns.startDays[i];
+            endDays[row] = columns.endDays[i];
+            names[row] = columns.names[i];
+            groups[row] = columns.groups[i];
+            const rowParentIds = Array.from(columns.depIds.subarray(columns.depOffsets[i], columns.depOffsets[i + 1]));
+            parentIdsByRow[row] = rowParentIds;
+            rowParentIds.forEach(parentId => {
+                if (!childIdsById.has(parentId)) childIdsById.set(parentId, new Set());
+                childIdsById.get(parentId).add(id);
+            });
+        }
+    };
+
+    // Returns the set of `rootId` and every task downstream of it.
+    const collectDependants = (rootId) => {
+        const dependants = new Set([rootId]);
+        const stack = [rootId];
+        while (stack.length > 0) {
+            for (const childId of childIds(stack.pop())) {
+                if (!dependants.has(childId) && rowOf.has(childId)) {
+                    dependants.add(childId);
+                    stack.push(childId);
+                }
+            }
+        }
+        return dependants;
+    };
+
+    // Tarjan's strongly connected components over the dependency graph between the given task
+    // ids, in linear time. It is iterative so a long chain cannot overflow the call stack.
+    // Returns every cycle as the list of its member ids: each component of more than one task,
+    // and any task that depends on itself.
+    const findDependencyCycles = (taskIds) => {
+        const members = new Set(taskIds);
+        const indexOf = new Map();
+        const lowLink = new Map();
+        const stack = [];
+        const onStack = new Set();
+        const cycles = [];
+        const visit = (id) => {
+            indexOf.set(id, indexOf.size);
+            lowLink.set(id, indexOf.get(id));
+            stack.push(id);
+            onStack.add(id);
+            return { id, children: childIds(id)[Symbol.iterator]() };
+        };
+        for (const rootId of members) {
+            if (indexOf.has(rootId)) continue;
+            const work = [visit(rootId)];
+            while (work.length > 0) {
+                const frame = work[work.length - 1];
+                const next = frame.children.next();
+                if (!next.done) {
+                    const childId = next.value;
+                    if (!members.has(childId)) continue;
+                    if (!indexOf.has(childId)) {
+                        work.push(visit(childId));
+                    } else if (onStack.has(childId)) {
+                        lowLink.set(frame.id, Math.min(lowLink.get(frame.id), indexOf.get(childId)));
+                    }
+                    continue;
+                }
+                work.pop();
+                if (work.length > 0) {
+                    const parentId = work[work.length - 1].id;
+                    lowLink.set(parentId, Math.min(lowLink.get(parentId), lowLink.get(frame.id)));
+                }
+                if (lowLink.get(frame.id) !== indexOf.get(frame.id)) continue;
+                const component = [];
+                let memberId;
+                do {
+                    memberId = stack.pop();
+                    onStack.delete(memberId);
+                    component.push(memberId);
+                } while (memberId !== frame.id);
+                if (component.length > 1 || parentIds(frame.id).includes(frame.id)) cycles.push(component.reverse());
+            }
+        }
+        return cycles;
+    };
+
+    // Calculates the cascading date shifts for the tasks that depend on a changed one. Only the
+    // changed task's descendants are visited: they are collected with a DFS and put in topological
+    // order among themselves, so the cost follows the size of the affected cone rather than the
+    // size of the plan. Returns the shifted tasks in topological order.
+    const planDependencyUpdate = ({ rootId, endDay, parentIds: rootParentIds }) => {
+        // The changed task is judged by its proposed dependencies, everything else by the model.
+        const proposedParentIds = Array.from(rootParentIds);
+        const parentIdsOf = (id) => id === rootId ? proposedParentIds : parentIds(id);
+
+        const cone = collectDependants(rootId);
+
+        // Topological sort of the cone (Kahn), counting only predecessors inside it. The queue is
+        // walked with a read index; shifting the array would make the sort quadratic.
+        const inDegree = new Map();
+        cone.forEach(id => inDegree.set(id, parentIdsOf(id).filter(parentId => cone.has(parentId)).length));
+        const sortedOrder = [...cone].filter(id => inDegree.get(id) === 0);
+        for (let head = 0; head < sortedOrder.length; head++) {
+            for (const childId of childIds(sortedOrder[head])) {
+                if (!cone.has(childId)) continue;
+                inDegree.set(childId, inDegree.get(childId) - 1);
+                if (inDegree.get(childId) === 0) sortedOrder.push(childId);
+            }
+        }
+
+        if (sortedOrder.length !== cone.size) {
+            const sorted = new Set(sortedOrder);
+            return { cycles: findDependencyCycles([...cone].filter(id => !sorted.has(id))) };
+        }
+
+        // Propagate date changes through the dependency chain. Predecessors outside the cone
+        // keep their current dates.
+        const newEndDays = new Map([[rootId, endDay]]);
+        const parentEndDay = (parentId) => {
+            if (newEndDays.has(parentId)) return newEndDays.get(parentId);
+            return rowOf.has(parentId) ? endDays[rowOf.get(parentId)] : NO_DAY;
+        };
+        const shiftedIds = [];
+        const shiftedStartDays = [];
+        const shiftedEndDays = [];
+        for (const taskId of sortedOrder) {
+            if (taskId === rootId) continue;
+            const row = rowOf.get(taskId);
+            let latestParentEndDay = NO_DAY;
+            for (const parentId of parentIds(taskId)) {
+                latestParentEndDay = Math.max(latestParentEndDay, parentEndDay(parentId));
+            }
+
+            // If a task now starts before its parent ends, it must be moved forward.
+            const taskStartDay = startDays[row];
+            const taskEndDay = endDays[row];
+            if (latestParentEndDay !== NO_DAY && taskStartDay !== NO_DAY && latestParentEndDay + 1 > taskStartDay) {
+                const shift = latestParentEndDay + 1 - taskStartDay;
+                const shiftedEndDay = taskEndDay === NO_DAY ? NO_DAY : taskEndDay + shift;
+                newEndDays.set(taskId, shiftedEndDay);
+                shiftedIds.push(taskId);
+                shiftedStartDays.push(taskStartDay + shift);
+                shiftedEndDays.push(shiftedEndDay);
+            } else {
+                newEndDays.set(taskId, taskEndDay);
+            }
+        }
+        return {
+            ids: Int32Array.from(shiftedIds),
+            startDays: Int32Array.from(shiftedStartDays),
+            endDays: Int32Array.from(shiftedEndDays)
+        };
+    };
+
+    // Orders the tasks for the chart's sort columns. Dates compare as day numbers with missing
+    // dates last; text compares with the collator, empty groups after every named one. Ties fall
+    // back to the start day and then the id, so the order does not depend on row positions.
+    const sortTaskIds = ({ key, direction }) => {
+        const dir = direction === 'ascending' ? 1 : -1;
+        const rows = Int32Array.from(rowOf.values());
+        const compareDays = (dayA, dayB) => {
+            if (dayA === dayB) return 0;
+            if (dayA === NO_DAY) return 1;
+            if (dayB === NO_DAY) return -1;
+            return dayA - dayB;
+        };
+        if (key === 'start' || key === 'end') {
+            const days = key === 'end' ? endDays : startDays;
+            rows.sort((a, b) => {
+                if (days[a] === NO_DAY && days[b] === NO_DAY) return ids[a] - ids[b];
+                return compareDays(days[a], days[b]) * dir || ids[a] - ids[b];
+            });
+        } else {
+            const values = key === 'group' ? groups.map(group => group || 'zzzz') : names;
+            rows.sort((a, b) => textCollator.compare(values[a] || '', values[b] || '') * dir
+                || compareDays(startDays[a], startDays[b]) || ids[a] - ids[b]);
+        }
+        return { order: rows.map(row => ids[row]) };
+    };
+
+    const formatDateToDDMMYYYY = (date) => {
+        if (!date || isNaN(date.getTime())) return '';
+        const day = String(date.getUTCDate()).padStart(2, '0');
+        const month = String(date.getUTCMonth() + 1).padStart(2, '0');
+        return `${day}/${month}/${date.getUTCFullYear()}`;
+    };
+
+    // Loads SheetJS into the worker from the first of `urls` that works. On the page the chart
+    // loads it before asking.
+    const importSheetJs = (urls) => {
+        if (typeof importScripts !== 'function') throw new Error('SheetJS is not loaded.');
+        for (const url of urls) {
+            try {
+                importScripts(url);
+                return;
+            } catch (error) {
+                // Try the next copy
+            }
+        }
+        throw new Error('Excel support is unavailable: SheetJS could not be loaded.');
+    };
+
+    // Day number of a DD/MM/YYYY or YYYY-MM-DD string, with the chart's rules, or null.
+    const readDay = (text) => {
+        for (const [separator, yearAt, dayAt] of [['/', 2, 0], ['-', 0, 2]]) {
+            const parts = text.split(separator);
+            if (parts.length !== 3) continue;
+            const [year, month, day] = [parts[yearAt], parts[1], parts[dayAt]].map(Number);
+            if (year > 1000 && month >= 1 && month <= 12 && day >= 1 && day <= 31) return Date.UTC(year, month - 1, day) / 86400000;
+        }
+        return null;
+    };
+
+    // Turns task rows into tasks, validating them as they are read, and hands them to `report`
+    // in batches, the first one small so the chart can draw a screenful while the rest is read:
+    //   { project, tasks, done, total }   project info and groups ride on the first batch
+    // `rows` yields arrays of cell values under `headers`; `progress` tracks how far through the
+    // file they are, in whatever unit suits it. Rows without a name or dates are skipped, as are a
+    // repeated ID and IDs outside the Int32 range; the result counts them and describes the first few, along with dates that
+    // cannot be read or run backwards.
+    const firstImportBatchRows = 100;
+    const importBatchRows = 5000;
+    const maxImportIssues = 5;
+    const importTaskRows = ({ project, headers, rows, firstRowNumber, progress }, report) => {
+        const columnOf = {};
+        headers.forEach((header, c) => {
+            header = String(header ?? '').trim();
+            if (!(header in columnOf)) columnOf[header] = c;
+        });
+        const cellValue = (row, header) => columnOf[header] === undefined ? undefined : row[columnOf[header]];
+        const asText = (value) => value instanceof Date ? formatDateToDDMMYYYY(value) : String(value || '');
+
+        const seenIds = new Set();
+        const issues = [];
+        let skipped = 0;
+        let imported = 0;
+        let batch = [];
+        let batchRows = firstImportBatchRows;
+        let sentProject = false;
+        const noteIssue = (rowNumber, message) => {
+            if (issues.length < maxImportIssues) issues.push(`row ${rowNumber}: ${message}`);
+        };
+        const flush = () => {
+            report({ project: sentProject ? undefined : project, tasks: batch, done: progress.done, total: progress.total });
+            sentProject = true;
+            imported += batch.length;
+            batch = [];
+            batchRows = importBatchRows;
+        };
+        let i = 0;
+        for (const row of rows) {
+            const rowNumber = firstRowNumber + i;
+            const id = cellValue(row, 'ID');
+            const task = {
+                id: id ? parseInt(id) : i + 1,
+                name: String(cellValue(row, 'Task Name') || ''),
+                group: String(cellValue(row, 'Group') || ''),
+                start: asText(cellValue(row, 'Start Date')),
+                end: asText(cellValue(row, 'End Date')),
+                progress: parseInt(cellValue(row, 'Progress (%)') || 0),
+                dependencies: String(cellValue(row, 'Dependencies') || ''),
+                color: cellValue(row, 'Color') ? String(cellValue(row, 'Color')) : null
+            };
+            i++;
+            if (!task.name && !task.start && !task.end) continue;
+            if (!task.name || !task.start || !task.end) {
+                skipped++;
+                noteIssue(rowNumber, 'missing a name, start or end date');
+            } else if (isNaN(task.id) || !isTaskIdInRange(task.id) || seenIds.has(task.id)) {
+                skipped++;
+                noteIssue(rowNumber, `${isNaN(task.id) ? 'unreadable' : seenIds.has(task.id) ? 'repeated' : 'out of range'} ID ${id}`);
+            } else if (!String(task.dependencies).split(',').every(part => isNaN(parseInt(part)) || isTaskIdInRange(parseInt(part)))) {
+                skipped++;
+                noteIssue(rowNumber, `dependency ID out of range in ${task.dependencies}`);
+            } else {
+                const startDay = readDay(task.start);
+                const endDay = readDay(task.end);
+                if (startDay === null || endDay === null) noteIssue(rowNumber, 'a date cannot be read');
+                else if (endDay < startDay) noteIssue(rowNumber, 'ends before it starts');
+                seenIds.add(task.id);
+                batch.push(task);
+            }
+            if (batch.length >= batchRows) flush();
+        }
+        progress.done = progress.total;
+        if (batch.length > 0 || !sentProject) flush();
+        return { imported, skipped, issues };
+    };
+
+    // Reads an exported workbook: project info, groups and the task sheet. SheetJS is loaded
+    // into the worker the first time a workbook arrives. SheetJS has no streaming reader, so the
+    // sheets are still parsed whole, but only the three the import uses: a first pass lists the
+    // sheet names without reading any cells. Cells are parsed in dense mode (an array of cells
+    // per row rather than an object keyed by address), and task rows are read straight from it
+    // rather than through an array of arrays of the whole sheet.
+    const parseWorkbook = ({ source, xlsxUrls }, report) => {
+        if (typeof XLSX === 'undefined') importSheetJs(xlsxUrls);
+        const buffer = source instanceof ArrayBuffer ? source : new FileReaderSync().readAsArrayBuffer(source);
+        const data = new Uint8Array(buffer);
+        const { SheetNames: sheetNames } = XLSX.read(data, { type: 'array', bookSheets: true });
+        const tasksSheetName = sheetNames.includes("Tasks") ? "Tasks" : sheetNames[0];
+        if (!tasksSheetName) throw new Error("No task data sheet found.");
+        const workbook = XLSX.read(data, {
+            type: 'array', cellDates: true, dense: true,
+            sheets: ["ProjectInfo", "Groups", tasksSheetName].filter(name => sheetNames.includes(name))
+        });
+        const project = { projectGroups: [] };
+        if (workbook.Sheets["ProjectInfo"]) {
+            const infoJson = XLSX.utils.sheet_to_json(workbook.Sheets["ProjectInfo"], { header: 1 });
+            const titleRow = infoJson.find(row => row[0] === 'Project Title');
+            const subtitleRow = infoJson.find(row => row[0] === 'Project Subtitle');
+            if (titleRow && titleRow[1]) project.projectTitle = titleRow[1];
+            if (subtitleRow && subtitleRow[1]) project.projectSubtitle = subtitleRow[1];
+        }
+        if (workbook.Sheets["Groups"]) {
+            project.projectGroups = XLSX.utils.sheet_to_json(workbook.Sheets["Groups"]);
+        }
+        const worksheet = workbook.Sheets[tasksSheetName];
+        if (!worksheet) throw new Error("No task data sheet found.");
+
+        const range = XLSX.utils.decode_range(worksheet['!ref'] || 'A1');
+        // SheetJS 0.19 and later keep dense cells under '!data'; 0.18 makes the sheet the array.
+        const cellRows = worksheet['!data'] || worksheet;
+        const columns = [];
+        for (let c = range.s.c; c <= range.e.c; c++) columns.push(c);
+        const rowValues = (r) => {
+            const cells = cellRows[r] || [];
+            return columns.map(c => cells[c]?.v);
+        };
+        const progress = { done: 0, total: range.e.r - range.s.r };
+        function* rows() {
+            for (let r = range.s.r + 1; r <= range.e.r; r++) {
+                progress.done = r - range.s.r;
+                yield rowValues(r);
+            }
+        }
+        return importTaskRows({ project, headers: rowValues(range.s.r), rows: rows(), firstRowNumber: range.s.r + 2, progress }, report);
+    };
+
+    // Decodes a File (read in slices) or an ArrayBuffer as UTF-8 text, a chunk at a time, and
+    // counts the bytes read in `progress`.
+    const importChunkBytes = 1 << 20;
+    function* textChunks(source, progress) {
+        const decoder = new TextDecoder();
+        const size = source instanceof ArrayBuffer ? source.byteLength : source.size;
+        progress.total = size;
+        for (let offset = 0; offset < size; offset += importChunkBytes) {
+            const end = Math.min(size, offset + importChunkBytes);
+            const bytes = source instanceof ArrayBuffer
+                ? new Uint8Array(source, offset, end - offset)
+                : new Uint8Array(new FileReaderSync().readAsArrayBuffer(source.slice(offset, end)));
+            progress.done = end;
+            yield decoder.decode(bytes, { stream: end < size });
+        }
+    }
+
+    // Splits CSV text into rows of fields as the chunks arrive (RFC 4180: quoted fields may hold
+    // commas, doubled quotes and line breaks; lines end in LF or CRLF).
+    function* csvRows(chunks) {
+        const special = /[",\r\n]/g;
+        let row = [];
+        let field = '';
+        let quoted = false;
+        let quoteAtChunkEnd = false;
+        let skipLineFeed = false;
+        for (const chunk of chunks) {
+            let i = 0;
+            if (quoteAtChunkEnd) {
+                // The quote that ended the last chunk either doubled a quote or closed the field.
+                quoteAtChunkEnd = false;
+                if (chunk[0] === '"') {
+                    field += '"';
+                    i = 1;
+                } else {
+                    quoted = false;
+                }
+            }
+            if (skipLineFeed && chunk[i] === '\n') i++;
+            skipLineFeed = false;
+            while (i < chunk.length) {
+                if (quoted) {
+                    const close = chunk.indexOf('"', i);
+                    if (close < 0) {
+                        field += chunk.slice(i);
+                        break;
+                    }
+                    field += chunk.slice(i, close);
+                    if (close + 1 === chunk.length) {
+                        quoteAtChunkEnd = true;
+                        break;
+                    }
+                    if (chunk[close + 1] === '"') {
+                        field += '"';
+                        i = close + 2;
+                    } else {
+                        quoted = false;
+                        i = close + 1;
+                    }
+                    continue;
+                }
+                special.lastIndex = i;
+                const match = special.exec(chunk);
+                if (!match) {
+                    field += chunk.slice(i);
+                    break;
+                }
+                field += chunk.slice(i, match.index);
+                i = match.index + 1;
+                const c = match[0];
+                if (c === '"') {
+                    quoted = true;
+                } else if (c === ',') {
+                    row.push(field);
+                    field = '';
+                } else {
+                    row.push(field);
+                    field = '';
+                    yield row;
+                    row = [];
+                    if (c === '\r') {
+                        if (i === chunk.length) skipLineFeed = true;
+                        else if (chunk[i] === '\n') i++;
+                    }
+                }
+            }
+        }
+        if (field !== '' || row.length > 0) {
+            row.push(field);
+            yield row;
+        }
+    }
+
+    // Reads tasks from a CSV file with the task sheet's columns, streaming it in slices.
+    const parseCsv = ({ source }, report) => {
+        const progress = { done: 0, total: 0 };
+        const rows = csvRows(textChunks(source, progress));
+        const headers = rows.next();
+        if (headers.done) throw new Error("The CSV file is empty.");
+        return importTaskRows({ project: {}, headers: headers.value, rows, firstRowNumber: 2, progress }, report);
+    };
+
+    const handlers = {
+        load({ columns }) {
+            capacity = 0;
+            ids = new Int32Array(0);
+            startDays = new Int32Array(0);
+            endDays = new Int32Array(0);
+            names = [];
+            groups = [];
+            parentIdsByRow = [];
+            rowOf = new Map();
+            freeRows = [];
+            childIdsById = new Map();
+            upsertColumns(columns);
+        },
+        update({ columns, removedIds }) {
+            removedIds.forEach(removeTask);
+            upsertColumns(columns);
+        },
+        plan: planDependencyUpdate,
+        cycles: () => ({ cycles: findDependencyCycles(rowOf.keys()) }),
+        sort: sortTaskIds,
+        'parse-workbook': parseWorkbook,
+        'parse-csv': parseCsv
+    };
+
+    // Handles one message and returns its result along with the buffers to transfer back. A
+    // long-running handler passes partial results to `report` on the way.
+    const handle = (message, report = () => {}) => {
+        const handler = handlers[message.type];
+        if (!handler) throw new Error(`Unknown engine message: ${message.type}`);
+        const result = handler(message, report) || {};
+        const transfer = Object.values(result).filter(value => ArrayBuffer.isView(value)).map(value => value.buffer);
+        return { result, transfer };
+    };
+
+    return { handle };
+};
+
+if (typeof WorkerGlobalScope !== 'undefined' && self instanceof WorkerGlobalScope) {
+    const engine = createSchedulingEngine();
+    self.onmessage = ({ data: message }) => {
+        try {
+            const report = (progress) => self.postMessage({ requestId: message.requestId, progress });
+            const { result, transfer } = engine.handle(message, report);
+            self.postMessage({ requestId: message.requestId, result }, transfer);
+        } catch (error) {
+            self.postMessage({ requestId: message.requestId, error: error.message });
+        }
+    };
+}
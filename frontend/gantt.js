@@ -0,0 +1,2596 @@
+// Builds the chart into the page and wires up its controls. `initialState` is the project data;
+// `options.onChange` receives every persisted change as a compact set of changed fields and tasks.
+const initGanttChart = (initialState, options = {}) => {
+    // --- STATE & CONFIGURATION ---
+    let viewMode = initialState.viewMode || 'day'; 
+    let timelineRenderer = initialState.timelineRenderer || 'dom';
+    let projectGroups = initialState.projectGroups || [];
+    let sortConfig = initialState.sortConfig || { key: 'start', direction: 'ascending' };
+    let columnWidths = initialState.columnWidths || {
+        group: 150, taskName: 250, startDate: 120, deps: 100
+    };
+
+    // Chart rendering dimensions, calculated dynamically
+    let chartStartDate = null;
+    let pixelsPerDay = 0;
+    let taskRowHeight = 40;
+
+    // Windowed rendering: only the rows and timeline columns inside the visible part of
+    // the chart container (plus some overscan) are created as DOM nodes.
+    const overscanRows = 10;
+    const overscanColumns = 4;
+    let isWindowingEnabled = true;
+    let chartLayout = null;
+    // What the cached layout, canvas tiles and arrows were computed from; null forces a rebuild.
+    let layoutKey = null;
+    let canvasTilesKey = null;
+    let arrowsKey = null;
+    let renderedWindow = null;
+    let windowUpdateFrame = null;
+    let timelineHeaderLayerEl = null;
+    let taskRowsLayerEl = null;
+    let timelineCanvasEl = null;
+    let sortHeaderEls = null;
+    // The parsed dependency edges, collected once per change of the dependency graph and reused
+    // by arrows and the canvas.
+    let dependencyEdges = [];
+    let dependencyPathEls = null;
+    // Rendered row nodes keyed by task id, used to patch rows in place between renders.
+    const rowNodesById = new Map();
+
+    // Drag-and-drop state variables
+    let isDragging = false;
+    let currentTaskId = null;
+    let dragStartPos = 0;
+    let dragType = 'move';
+    let originalTaskData = null;
+    let dragStartStyles = null;
+    let dragPreview = null;
+    // Ids of tasks that are part of a dependency cycle; their rows are flagged in the chart.
+    let cyclicTaskIds = new Set();
+    let isResizing = false;
+    let resizingColumn = null;
+
+    // --- DOM ELEMENTS CACHE ---
+    const ganttChartContainerEl = document.getElementById('gantt-chart-container');
+    const ganttChartEl = document.getElementById('gantt-chart');
+    const dependencyLinesEl = document.getElementById('dependency-lines');
+    const currentDateEl = document.getElementById('current-date');
+    const addTaskBtn = document.getElementById('add-task-btn');
+    const taskModal = document.getElementById('task-modal');
+    const taskForm = document.getElementById('task-form');
+    const cancelBtn = document.getElementById('cancel-btn');
+    const deleteTaskBtn = document.getElementById('delete-task-btn');
+    const downloadBtn = document.getElementById('download-btn');
+    const downloadHtmlBtn = document.getElementById('download-html-btn');
+    const downloadCsvBtn = document.getElementById('download-csv-btn');
+    const clearDataBtn = document.getElementById('clear-data-btn');
+    const printBtn = document.getElementById('print-btn');
+    const fileInput = document.getElementById('file-input');
+    const projectTitleEl = document.getElementById('project-title');
+    const projectSubtitleEl = document.getElementById('project-subtitle');
+    const viewModeSelect = document.getElementById('view-mode');
+    const timelineRendererSelect = document.getElementById('timeline-renderer');
+    const manageGroupsBtn = document.getElementById('manage-groups-btn');
+    const groupModal = document.getElementById('group-modal');
+    const closeGroupModalBtn = document.getElementById('close-group-modal-btn');
+    const addGroupForm = document.getElementById('add-group-form');
+    const groupListEl = document.getElementById('group-list');
+    const dependencyModal = document.getElementById('dependency-modal');
+    const dependencyModalText = document.getElementById('dependency-modal-text');
+    const dependentTasksListEl = document.getElementById('dependent-tasks-list');
+    const confirmDependencyUpdateBtn = document.getElementById('confirm-dependency-update');
+    const cancelDependencyUpdateBtn = document.getElementById('cancel-dependency-update');
+
+    // --- UTILITY FUNCTIONS ---
+    const formatDateToDDMMYYYY = (date) => {
+        if (!date || isNaN(date.getTime())) return '';
+        const day = String(date.getUTCDate()).padStart(2, '0');
+        const month = String(date.getUTCMonth() + 1).padStart(2, '0');
+        const year = date.getUTCFullYear();
+        return `${day}/${month}/${year}`;
+    };
+
+    const formatDateToYYYYMMDD = (date) => {
+        if (!date || isNaN(date.getTime())) return '';
+        return date.toISOString().slice(0, 10);
+    };
+
+    const parseDate = (dateStr) => {
+        if (!dateStr) return null;
+        if (dateStr instanceof Date) {
+            return new Date(Date.UTC(dateStr.getFullYear(), dateStr.getMonth(), dateStr.getDate()));
+        }
+        if (typeof dateStr !== 'string') return null;
+
+        // Try parsing DD/MM/YYYY format
+        const partsDMY = dateStr.split('/');
+        if (partsDMY.length === 3) {
+            const [day, month, year] = partsDMY.map(Number);
+            if (year > 1000 && month >= 1 && month <= 12 && day >= 1 && day <= 31) {
+                return new Date(Date.UTC(year, month - 1, day));
+            }
+        }
+        // Try parsing YYYY-MM-DD format
+        const partsYMD = dateStr.split('-');
+        if (partsYMD.length === 3) {
+            const [year, month, day] = partsYMD.map(Number);
+             if (year > 1000 && month >= 1 && month <= 12 && day >= 1 && day <= 31) {
+                return new Date(Date.UTC(year, month - 1, day));
+            }
+        }
+        return null;
+    };
+
+    const addDays = (date, days) => {
+        const result = new Date(date);
+        result.setUTCDate(result.getUTCDate() + days);
+        return result;
+    };
+
+    const dayDiff = (startDateStr, endDateStr) => {
+        const msPerDay = 1000 * 60 * 60 * 24;
+        const start = parseDate(startDateStr);
+        const end = parseDate(endDateStr);
+        if (!start || !end) return 0;
+        // Add a small epsilon to handle floating point inaccuracies before rounding
+        return Math.round((end - start) / msPerDay + 0.00001);
+    };
+
+    // Dates are also handled as whole days since 1970-01-01 (UTC) so that hot paths can
+    // compare, shift and measure them with plain integer arithmetic.
+    const msPerDay = 1000 * 60 * 60 * 24;
+    const toEpochDay = (date) => date ? Math.round(date.getTime() / msPerDay) : null;
+    const fromEpochDay = (day) => new Date(day * msPerDay);
+
+    // Day number of a civil date, and back, with integer arithmetic only (Howard Hinnant's
+    // days_from_civil and civil_from_days), so no Date objects are built for the task columns.
+    const epochDayFromCivil = (year, month, day) => {
+        const y = month <= 2 ? year - 1 : year;
+        const era = Math.floor(y / 400);
+        const yearOfEra = y - era * 400;
+        const dayOfYear = Math.floor((153 * (month + (month > 2 ? -3 : 9)) + 2) / 5) + day - 1;
+        const dayOfEra = yearOfEra * 365 + Math.floor(yearOfEra / 4) - Math.floor(yearOfEra / 100) + dayOfYear;
+        return era * 146097 + dayOfEra - 719468;
+    };
+    const formatEpochDay = (epochDay) => {
+        const z = epochDay + 719468;
+        const era = Math.floor(z / 146097);
+        const dayOfEra = z - era * 146097;
+        const yearOfEra = Math.floor((dayOfEra - Math.floor(dayOfEra / 1460) + Math.floor(dayOfEra / 36524) - Math.floor(dayOfEra / 146096)) / 365);
+        const dayOfYear = dayOfEra - (365 * yearOfEra + Math.floor(yearOfEra / 4) - Math.floor(yearOfEra / 100));
+        const monthIndex = Math.floor((5 * dayOfYear + 2) / 153);
+        const day = dayOfYear - Math.floor((153 * monthIndex + 2) / 5) + 1;
+        const month = monthIndex < 10 ? monthIndex + 3 : monthIndex - 9;
+        const year = yearOfEra + era * 400 + (month <= 2 ? 1 : 0);
+        return `${String(day).padStart(2, '0')}/${String(month).padStart(2, '0')}/${year}`;
+    };
+    // Reads the same DD/MM/YYYY and YYYY-MM-DD strings as parseDate, straight into a day number.
+    const parseEpochDay = (value) => {
+        if (typeof value !== 'string') return toEpochDay(parseDate(value));
+        const dmy = value.split('/');
+        if (dmy.length === 3) {
+            const [day, month, year] = dmy.map(Number);
+            if (year > 1000 && month >= 1 && month <= 12 && day >= 1 && day <= 31) return epochDayFromCivil(year, month, day);
+        }
+        const ymd = value.split('-');
+        if (ymd.length === 3) {
+            const [year, month, day] = ymd.map(Number);
+            if (year > 1000 && month >= 1 && month <= 12 && day >= 1 && day <= 31) return epochDayFromCivil(year, month, day);
+        }
+        return null;
+    };
+    const parseTaskDays = (task) => ({
+        startDay: parseEpochDay(task.start),
+        endDay: parseEpochDay(task.end)
+    });
+
+    // Returns the distinct predecessor ids listed in a dependency string.
+    const parseDependencyIds = (dependencies) => {
+        if (!dependencies) return [];
+        return [...new Set(String(dependencies).split(',').map(id => parseInt(id.trim())).filter(id => !isNaN(id)))];
+    };
+
+    // Interns strings: each distinct value is stored once and referred to by its index.
+    const createStringTable = (firstValue) => {
+        const values = [firstValue];
+        const indexOf = new Map([[firstValue, 0]]);
+        return {
+            values,
+            intern(value) {
+                let index = indexOf.get(value);
+                if (index === undefined) {
+                    index = values.length;
+                    values.push(value);
+                    indexOf.set(value, index);
+                }
+                return index;
+            }
+        };
+    };
+
+    // --- TASK STORE ---
+    // Holds the tasks column by column: ids and start/end epoch days in Int32Arrays (NO_DAY for a
+    // missing date), progress in a Uint8Array, groups and colours as indices into interned string
+    // tables, names in a plain array and the dependency edges in CSR form (each task's predecessor
+    // ids as a slice of one Int32Array). A task lives in a storage slot; the display order is a
+    // separate list of slots, so sorting never moves column data.
+    //
+    // The UI reads tasks through a thin facade: get() and at() build a plain task object
+    // ({ id, name, group, start, end, progress, dependencies, color }) from the columns, and every
+    // write goes through update(), add() or remove(). Hot paths read the columns directly through
+    // the row accessors (idAt, startDayAt, endDayAt) and forEachDependency().
+    //
+    // Edited dependency lists are kept aside until the CSR arrays are next rebuilt, which happens
+    // lazily together with the reverse index (the ids of the tasks that depend on each id) the
+    // first time it is needed after tasks were added, removed or re-linked. Date changes leave
+    // the graph alone.
+    // Writes are reported to change feeds: one for saving, one for the scheduling engine.
+    const createTaskStore = (initialTasks) => {
+        let capacity = 0;
+        let count = 0;
+        let ids = new Int32Array(0);
+        let startDays = new Int32Array(0);
+        let endDays = new Int32Array(0);
+        let progress = new Uint8Array(0);
+        let groupIndices = new Uint32Array(0);
+        let colorIndices = new Uint32Array(0);
+        let order = new Int32Array(0);
+        let names = [];
+        let slotOf = new Map();
+        let freeSlots = [];
+        let maxId = 0;
+        let groupTable = createStringTable('');
+        let colorTable = createStringTable(null);
+        // The text of dates that are set but unreadable, by slot, so they are shown and saved as
+        // the user typed them rather than as blanks.
+        let rawStarts = new Map();
+        let rawEnds = new Map();
+
+        // Dependency graph: CSR by slot, edits since the last rebuild, and the reverse index.
+        let depOffsets = new Int32Array(1);
+        let depIds = new Int32Array(0);
+        let editedParentIds = new Map();
+        let childOffsets = null;
+        let childIdList = null;
+        let danglingChildIds = null;
+        const noIds = new Int32Array(0);
+
+        // Counts writes, so that work started on an older version of the tasks can tell, and
+        // separately changes to the row order and to the dependency graph, which the renderer
+        // caches row positions and edges by.
+        let generation = 0;
+        let orderGeneration = 0;
+        let graphGeneration = 0;
+        // Row index of each slot, rebuilt on first use after the order changed.
+        let rowOfSlot = new Int32Array(0);
+        let rowOfSlotGeneration = -1;
+        let cachedDayRange = null;
+        let dayRangeGeneration = -1;
+        // Each feed collects the writes since it was last taken: `upserted` maps a task id to the
+        // set of fields that changed (null for a new task), `removed` holds deleted ids and `reset`
+        // means the whole list was replaced. A reset feed is read as the whole current list, so
+        // writes after the reset are not recorded in it.
+        const emptyChanges = (reset) => ({ reset, upserted: new Map(), removed: new Set() });
+        const feeds = [];
+        const eachFeed = (record) => {
+            generation++;
+            feeds.forEach(feed => {
+                if (!feed.changes.reset) record(feed.changes);
+            });
+        };
+        const openChangeFeed = () => {
+            const feed = { changes: emptyChanges(false) };
+            feeds.push(feed);
+            return () => {
+                const taken = feed.changes;
+                feed.changes = emptyChanges(false);
+                return taken;
+            };
+        };
+
+        const grow = (needed) => {
+            if (needed <= capacity) return;
+            capacity = Math.max(needed, capacity * 2, 64);
+            const resize = (column) => {
+                const larger = new column.constructor(capacity);
+                larger.set(column);
+                return larger;
+            };
+            ids = resize(ids);
+            startDays = resize(startDays);
+            endDays = resize(endDays);
+            progress = resize(progress);
+            groupIndices = resize(groupIndices);
+            colorIndices = resize(colorIndices);
+            order = resize(order);
+            const offsets = new Int32Array(capacity + 1);
+            offsets.set(depOffsets);
+            offsets.fill(depOffsets[depOffsets.length - 1], depOffsets.length);
+            depOffsets = offsets;
+        };
+
+        const slotParentIds = (slot) => editedParentIds.get(slot) || depIds.subarray(depOffsets[slot], depOffsets[slot + 1]);
+
+        // Folds the edited dependency lists into fresh CSR arrays and rebuilds the reverse index.
+        const rebuildGraph = () => {
+            const offsets = new Int32Array(capacity + 1);
+            let edgeCount = 0;
+            for (let slot = 0; slot < capacity; slot++) {
+                edgeCount += slotOf.get(ids[slot]) === slot ? slotParentIds(slot).length : 0;
+                offsets[slot + 1] = edgeCount;
+            }
+            const flat = new Int32Array(edgeCount);
+            const childCounts = new Int32Array(capacity + 1);
+            danglingChildIds = new Map();
+            for (let slot = 0; slot < capacity; slot++) {
+                if (offsets[slot + 1] === offsets[slot]) continue;
+                const parentIds = slotParentIds(slot);
+                flat.set(parentIds, offsets[slot]);
+                parentIds.forEach(parentId => {
+                    const parentSlot = slotOf.get(parentId);
+                    if (parentSlot !== undefined) {
+                        childCounts[parentSlot + 1]++;
+                    } else {
+                        if (!danglingChildIds.has(parentId)) danglingChildIds.set(parentId, []);
+                        danglingChildIds.get(parentId).push(ids[slot]);
+                    }
+                });
+            }
+            depOffsets = offsets;
+            depIds = flat;
+            editedParentIds = new Map();
+            for (let slot = 0; slot < capacity; slot++) childCounts[slot + 1] += childCounts[slot];
+            childOffsets = childCounts;
+            childIdList = new Int32Array(childCounts[capacity]);
+            const fill = childCounts.slice(0, capacity);
+            for (let slot = 0; slot < capacity; slot++) {
+                for (let edge = offsets[slot]; edge < offsets[slot + 1]; edge++) {
+                    const parentSlot = slotOf.get(flat[edge]);
+                    if (parentSlot !== undefined) childIdList[fill[parentSlot]++] = ids[slot];
+                }
+            }
+        };
+        const invalidateGraph = () => {
+            childOffsets = null;
+            graphGeneration++;
+        };
+        // Ids outside the Int32 columns would silently wrap around, so they are refused instead.
+        const checkIds = (taskIds) => {
+            const outOfRange = taskIds.find(id => !isTaskIdInRange(id));
+            if (outOfRange !== undefined) throw new RangeError(`Task id ${outOfRange} is outside the supported range (${MIN_TASK_ID} to ${MAX_TASK_ID}).`);
+        };
+        const setParentIds = (slot, dependencies) => {
+            const parentIds = parseDependencyIds(dependencies);
+            checkIds(parentIds);
+            editedParentIds.set(slot, Int32Array.from(parentIds));
+            invalidateGraph();
+        };
+
+        const writeTask = (slot, task) => {
+            checkIds([task.id]);
+            ids[slot] = task.id;
+            names[slot] = task.name;
+            writeFields(slot, task);
+            setParentIds(slot, task.dependencies);
+        };
+        const writeDate = (days, rawDates, slot, value) => {
+            const day = parseEpochDay(value);
+            days[slot] = day ?? NO_DAY;
+            if (day === null && value) rawDates.set(slot, String(value));
+            else rawDates.delete(slot);
+        };
+        // Writes every column but the id, name and dependencies that a task object provides.
+        const writeFields = (slot, fields) => {
+            if ('start' in fields) writeDate(startDays, rawStarts, slot, fields.start);
+            if ('end' in fields) writeDate(endDays, rawEnds, slot, fields.end);
+            if ('progress' in fields) progress[slot] = Math.min(100, Math.max(0, parseInt(fields.progress) || 0));
+            if ('group' in fields) groupIndices[slot] = groupTable.intern(fields.group || '');
+            if ('color' in fields) colorIndices[slot] = colorTable.intern(fields.color || null);
+            if ('name' in fields) names[slot] = fields.name;
+        };
+
+        // Fills the freshly reset columns from the wire encoding (see decodeWireTasks).
+        const loadWireColumns = (wire) => {
+            checkIds(wire.ids);
+            checkIds(wire.depIds);
+            grow(wire.count);
+            const rawStartOf = wire.rawStarts || {};
+            const rawEndOf = wire.rawEnds || {};
+            const groupIndexOf = wire.groups.map(group => groupTable.intern(group || ''));
+            const colorIndexOf = wire.colors.map(color => colorTable.intern(color || null));
+            for (let i = 0; i < wire.count; i++) {
+                const id = wire.ids[i];
+                const slot = slotOf.has(id) ? slotOf.get(id) : count;
+                if (slot === count) {
+                    slotOf.set(id, slot);
+                    order[count++] = slot;
+                }
+                ids[slot] = id;
+                names[slot] = wire.names[i];
+                startDays[slot] = wire.startDays[i] ?? NO_DAY;
+                endDays[slot] = wire.endDays[i] ?? NO_DAY;
+                if (i in rawStartOf) rawStarts.set(slot, rawStartOf[i]);
+                else rawStarts.delete(slot);
+                if (i in rawEndOf) rawEnds.set(slot, rawEndOf[i]);
+                else rawEnds.delete(slot);
+                progress[slot] = wire.progress[i];
+                groupIndices[slot] = groupIndexOf[wire.groupIndex[i]];
+                colorIndices[slot] = colorIndexOf[wire.colorIndex[i]];
+                editedParentIds.set(slot, Int32Array.from(wire.depIds.slice(wire.depOffsets[i], wire.depOffsets[i + 1])));
+                if (id > maxId) maxId = id;
+            }
+        };
+
+        const taskAtSlot = (slot) => ({
+            id: ids[slot],
+            name: names[slot],
+            group: groupTable.values[groupIndices[slot]],
+            start: startDays[slot] === NO_DAY ? rawStarts.get(slot) ?? '' : formatEpochDay(startDays[slot]),
+            end: endDays[slot] === NO_DAY ? rawEnds.get(slot) ?? '' : formatEpochDay(endDays[slot]),
+            progress: progress[slot],
+            dependencies: slotParentIds(slot).join(','),
+            color: colorTable.values[colorIndices[slot]]
+        });
+        const dayOrNull = (day) => day === NO_DAY ? null : day;
+
+        const store = {
+            // Every task as a facade object, in display order. Builds one object per task, so hot
+            // paths use the row accessors instead.
+            get list() { return Array.from(order.subarray(0, count), taskAtSlot); },
+            get size() { return count; },
+            get generation() { return generation; },
+            get orderGeneration() { return orderGeneration; },
+            get graphGeneration() { return graphGeneration; },
+            at: (rowIndex) => rowIndex >= 0 && rowIndex < count ? taskAtSlot(order[rowIndex]) : undefined,
+            get: (id) => slotOf.has(id) ? taskAtSlot(slotOf.get(id)) : undefined,
+            has: (id) => slotOf.has(id),
+            nextId: () => maxId + 1,
+            idAt: (rowIndex) => ids[order[rowIndex]],
+            nameAt: (rowIndex) => names[order[rowIndex]],
+            startDayAt: (rowIndex) => dayOrNull(startDays[order[rowIndex]]),
+            endDayAt: (rowIndex) => dayOrNull(endDays[order[rowIndex]]),
+            // Display row of a task, or -1 if there is none with that id.
+            rowIndexOf(id) {
+                const slot = slotOf.get(id);
+                if (slot === undefined) return -1;
+                if (rowOfSlotGeneration !== orderGeneration) {
+                    if (rowOfSlot.length < capacity) rowOfSlot = new Int32Array(capacity);
+                    for (let rowIndex = 0; rowIndex < count; rowIndex++) rowOfSlot[order[rowIndex]] = rowIndex;
+                    rowOfSlotGeneration = orderGeneration;
+                }
+                return rowOfSlot[slot];
+            },
+            parentIds: (id) => slotOf.has(id) ? slotParentIds(slotOf.get(id)) : noIds,
+            // Ids of the tasks that list `id` as a dependency (`id` itself may be missing).
+            childIds(id) {
+                if (!childOffsets) rebuildGraph();
+                const slot = slotOf.get(id);
+                if (slot === undefined) return danglingChildIds.get(id) || noIds;
+                return childIdList.subarray(childOffsets[slot], childOffsets[slot + 1]);
+            },
+            // Calls `visit(parentId, childId)` for every dependency between existing tasks.
+            forEachDependency(visit) {
+                for (let rowIndex = 0; rowIndex < count; rowIndex++) {
+                    const slot = order[rowIndex];
+                    slotParentIds(slot).forEach(parentId => {
+                        if (slotOf.has(parentId)) visit(parentId, ids[slot]);
+                    });
+                }
+            },
+            // Earliest and latest day over every start and end date, or nulls when none is set.
+            // Worked out again only after a write.
+            dayRange() {
+                if (dayRangeGeneration === generation) return cachedDayRange;
+                let minDay = null, maxDay = null;
+                for (let rowIndex = 0; rowIndex < count; rowIndex++) {
+                    const slot = order[rowIndex];
+                    for (const day of [startDays[slot], endDays[slot]]) {
+                        if (day === NO_DAY) continue;
+                        if (minDay === null || day < minDay) minDay = day;
+                        if (maxDay === null || day > maxDay) maxDay = day;
+                    }
+                }
+                cachedDayRange = { minDay, maxDay };
+                dayRangeGeneration = generation;
+                return cachedDayRange;
+            },
+            // Copies of the columns for the given ids (every task by default), for the engine.
+            columns(taskIds = null) {
+                const slots = taskIds ? Int32Array.from(taskIds, id => slotOf.get(id)) : order.slice(0, count);
+                const offsets = new Int32Array(slots.length + 1);
+                slots.forEach((slot, i) => { offsets[i + 1] = offsets[i] + slotParentIds(slot).length; });
+                const parentIdList = new Int32Array(offsets[slots.length]);
+                slots.forEach((slot, i) => parentIdList.set(slotParentIds(slot), offsets[i]));
+                return {
+                    ids: slots.map(slot => ids[slot]),
+                    startDays: slots.map(slot => startDays[slot]),
+                    endDays: slots.map(slot => endDays[slot]),
+                    depOffsets: offsets,
+                    depIds: parentIdList,
+                    names: Array.from(slots, slot => names[slot]),
+                    groups: Array.from(slots, slot => groupTable.values[groupIndices[slot]])
+                };
+            },
+
+            // The task list in the wire encoding, in display order.
+            toWire() {
+                const slots = order.subarray(0, count);
+                const depOffsetList = [0];
+                const depIdList = [];
+                const rawStartList = {};
+                const rawEndList = {};
+                slots.forEach((slot, rowIndex) => {
+                    depIdList.push(...slotParentIds(slot));
+                    depOffsetList.push(depIdList.length);
+                    if (rawStarts.has(slot)) rawStartList[rowIndex] = rawStarts.get(slot);
+                    if (rawEnds.has(slot)) rawEndList[rowIndex] = rawEnds.get(slot);
+                });
+                const day = (value) => value === NO_DAY ? null : value;
+                return {
+                    format: wireFormat, version: wireVersion, count,
+                    ids: Array.from(slots, slot => ids[slot]),
+                    names: Array.from(slots, slot => names[slot]),
+                    startDays: Array.from(slots, slot => day(startDays[slot])),
+                    endDays: Array.from(slots, slot => day(endDays[slot])),
+                    progress: Array.from(slots, slot => progress[slot]),
+                    groups: groupTable.values, groupIndex: Array.from(slots, slot => groupIndices[slot]),
+                    colors: colorTable.values, colorIndex: Array.from(slots, slot => colorIndices[slot]),
+                    depOffsets: depOffsetList, depIds: depIdList,
+                    rawStarts: rawStartList, rawEnds: rawEndList
+                };
+            },
+
+            // Start/end epoch days of a task (null where a date is missing or unreadable).
+            days(task) {
+                const slot = slotOf.get(task.id);
+                return { startDay: dayOrNull(startDays[slot]), endDay: dayOrNull(endDays[slot]) };
+            },
+            // Whole days from start to end, or 0 when either date is unreadable (as dayDiff).
+            durationDays(task) {
+                const slot = slotOf.get(task.id);
+                return startDays[slot] !== NO_DAY && endDays[slot] !== NO_DAY ? endDays[slot] - startDays[slot] : 0;
+            },
+
+            // Takes an array of task objects or the wire columns of a task list.
+            replaceAll(newTasks) {
+                capacity = count = 0;
+                ids = new Int32Array(0);
+                startDays = new Int32Array(0);
+                endDays = new Int32Array(0);
+                progress = new Uint8Array(0);
+                groupIndices = new Uint32Array(0);
+                colorIndices = new Uint32Array(0);
+                order = new Int32Array(0);
+                depOffsets = new Int32Array(1);
+                depIds = new Int32Array(0);
+                editedParentIds = new Map();
+                invalidateGraph();
+                names = [];
+                slotOf = new Map();
+                freeSlots = [];
+                maxId = 0;
+                groupTable = createStringTable('');
+                colorTable = createStringTable(null);
+                rawStarts = new Map();
+                rawEnds = new Map();
+                orderGeneration++;
+                if (!Array.isArray(newTasks)) {
+                    loadWireColumns(newTasks);
+                    generation++;
+                    feeds.forEach(feed => { feed.changes = emptyChanges(true); });
+                    return;
+                }
+                grow(newTasks.length);
+                newTasks.forEach(task => {
+                    // A repeated id overwrites the earlier task, as it would in an id index.
+                    if (slotOf.has(task.id)) {
+                        writeTask(slotOf.get(task.id), task);
+                        return;
+                    }
+                    slotOf.set(task.id, count);
+                    writeTask(count, task);
+                    order[count] = count;
+                    count++;
+                    if (task.id > maxId) maxId = task.id;
+                });
+                generation++;
+                feeds.forEach(feed => { feed.changes = emptyChanges(true); });
+            },
+            add(task) {
+                grow(count + 1);
+                const slot = freeSlots.length > 0 ? freeSlots.pop() : count;
+                slotOf.set(task.id, slot);
+                writeTask(slot, task);
+                order[count++] = slot;
+                orderGeneration++;
+                if (task.id > maxId) maxId = task.id;
+                eachFeed(changes => {
+                    changes.removed.delete(task.id);
+                    changes.upserted.set(task.id, null);
+                });
+                return taskAtSlot(slot);
+            },
+            // Applies field changes to a task; its row keeps its position in the display order.
+            update(id, fields) {
+                const slot = slotOf.get(id);
+                if (slot === undefined) return null;
+                const current = taskAtSlot(slot);
+                const changedFields = Object.keys(fields).filter(key => key !== 'id' && key in current && current[key] !== fields[key]);
+                if (changedFields.length === 0) return current;
+                const changed = Object.fromEntries(changedFields.map(key => [key, fields[key]]));
+                writeFields(slot, changed);
+                if ('dependencies' in changed) setParentIds(slot, changed.dependencies);
+                eachFeed(changes => {
+                    if (!changes.upserted.has(id)) changes.upserted.set(id, new Set());
+                    changedFields.forEach(key => changes.upserted.get(id)?.add(key));
+                });
+                return taskAtSlot(slot);
+            },
+            remove(id) {
+                const slot = slotOf.get(id);
+                if (slot === undefined) return;
+                const rowIndex = order.subarray(0, count).indexOf(slot);
+                order.copyWithin(rowIndex, rowIndex + 1, count);
+                count--;
+                orderGeneration++;
+                slotOf.delete(id);
+                names[slot] = undefined;
+                rawStarts.delete(slot);
+                rawEnds.delete(slot);
+                editedParentIds.set(slot, noIds);
+                invalidateGraph();
+                freeSlots.push(slot);
+                eachFeed(changes => {
+                    changes.upserted.delete(id);
+                    changes.removed.add(id);
+                });
+            },
+            openChangeFeed,
+            // Puts the rows in the given order of ids; ignored unless it covers every task.
+            setOrder(orderedIds) {
+                if (orderedIds.length !== count) return;
+                const slots = Int32Array.from(orderedIds, id => slotOf.get(id) ?? -1);
+                if (slots.includes(-1)) return;
+                order.set(slots);
+                orderGeneration++;
+            }
+        };
+        store.takeChanges = openChangeFeed();
+        store.replaceAll(initialTasks);
+        store.takeChanges();
+        return store;
+    };
+
+    const taskStore = createTaskStore(initialState.tasks || []);
+
+    // --- SCHEDULING ENGINE ---
+    // Dependency cascades, cycle detection, sorting and workbook parsing are done by the engine in
+    // gantt-engine.js, in a worker when one can be started. The engine keeps its own columnar copy
+    // of the task columns, brought up to date from the store's change feed before every request; the
+    // worker handles messages in order, so each request sees every write made before it.
+    const columnBuffers = (columns) => ['ids', 'startDays', 'endDays', 'depOffsets', 'depIds'].map(key => columns[key].buffer);
+
+    const createEngineClient = () => {
+        const takeEngineChanges = taskStore.openChangeFeed();
+        const pending = new Map();
+        let nextRequestId = 0;
+        let worker = null;
+        let localEngine = null;
+
+        const loadMessage = () => {
+            takeEngineChanges();
+            return { type: 'load', columns: taskStore.columns() };
+        };
+        const run = (message, transfer = [], onProgress = () => {}) => {
+            if (!worker) {
+                try {
+                    return Promise.resolve(localEngine.handle(message, onProgress).result);
+                } catch (error) {
+                    return Promise.reject(error);
+                }
+            }
+            return new Promise((resolve, reject) => {
+                const requestId = ++nextRequestId;
+                pending.set(requestId, { message, resolve, reject, onProgress });
+                worker.postMessage({ ...message, requestId }, transfer);
+            });
+        };
+        // Falls back to running the engine on the page, reloaded from the store, and answers the
+        // requests the worker left unanswered.
+        const useLocalEngine = () => {
+            worker?.terminate();
+            worker = null;
+            localEngine = createSchedulingEngine();
+            localEngine.handle(loadMessage());
+            const unanswered = [...pending.values()].filter(({ message }) => message.type !== 'load' && message.type !== 'update');
+            pending.clear();
+            unanswered.forEach(({ message, resolve, reject, onProgress }) => run(message, [], onProgress).then(resolve, reject));
+        };
+        const syncTasks = () => {
+            const changes = takeEngineChanges();
+            if (changes.reset) {
+                const message = loadMessage();
+                run(message, columnBuffers(message.columns));
+            } else if (changes.upserted.size > 0 || changes.removed.size > 0) {
+                const columns = taskStore.columns([...changes.upserted.keys()]);
+                run({ type: 'update', columns, removedIds: [...changes.removed] }, columnBuffers(columns));
+            }
+        };
+
+        try {
+            // An exported page carries the engine inline and starts the worker from that source.
+            const inlineEngineEl = document.getElementById('gantt-engine-script');
+            worker = new Worker(inlineEngineEl
+                ? URL.createObjectURL(new Blob([inlineEngineEl.textContent], { type: 'text/javascript' }))
+                : 'gantt-engine.js');
+            worker.onmessage = ({ data }) => {
+                const request = pending.get(data.requestId);
+                if (!request) return;
+                if (data.progress !== undefined) {
+                    request.onProgress(data.progress);
+                    return;
+                }
+                pending.delete(data.requestId);
+                if (data.error !== undefined) request.reject(new Error(data.error));
+                else request.resolve(data.result);
+            };
+            worker.onerror = (event) => {
+                event.preventDefault();
+                console.warn('Scheduling worker unavailable, running the engine on the page.', event.message);
+                useLocalEngine();
+            };
+            const message = loadMessage();
+            run(message, columnBuffers(message.columns));
+        } catch (error) {
+            useLocalEngine();
+        }
+
+        return {
+            get inWorker() { return worker !== null; },
+            // `onProgress` receives the partial results a long request reports along the way.
+            request(message, onProgress) {
+                syncTasks();
+                return run(message, [], onProgress);
+            }
+        };
+    };
+
+    const engine = createEngineClient();
+
+    const showToast = (message, isError = false) => {
+        const toastId = 'gantt-toast';
+        document.getElementById(toastId)?.remove();
+        const toast = document.createElement('div');
+        toast.id = toastId;
+        toast.className = `fixed bottom-5 right-5 p-4 rounded-lg shadow-lg text-white z-50 transform translate-y-20 opacity-0 transition-all duration-300 ${isError ? 'bg-red-600' : 'bg-green-600'}`;
+        toast.textContent = message;
+        document.body.appendChild(toast);
+        setTimeout(() => toast.classList.remove('translate-y-20', 'opacity-0'), 10);
+        setTimeout(() => {
+            toast.classList.add('translate-y-20', 'opacity-0');
+            setTimeout(() => toast.remove(), 300);
+        }, 3000);
+    };
+
+    // A status line that stays up while a long job runs; null takes it down.
+    const showProgress = (message) => {
+        const progressId = 'gantt-progress';
+        let status = document.getElementById(progressId);
+        if (message === null) {
+            status?.remove();
+            return;
+        }
+        if (!status) {
+            status = document.createElement('div');
+            status.id = progressId;
+            status.className = 'fixed bottom-5 left-5 p-4 rounded-lg shadow-lg text-white z-50 bg-gray-800';
+            document.body.appendChild(status);
+        }
+        status.textContent = message;
+    };
+
+    // --- STATE MANAGEMENT ---
+    // Each save reports what changed since the previous one as a list of patch operations: view
+    // and project fields that differ from their last reported JSON, and one operation per task
+    // written through the store. A change to a task's dates alone is sent as a compact move-task.
+    const viewFieldNames = ['viewMode', 'timelineRenderer', 'columnWidths', 'sortConfig'];
+    const getProjectFields = () => ({
+        projectGroups, viewMode, timelineRenderer,
+        projectTitle: projectTitleEl.value,
+        projectSubtitle: projectSubtitleEl.value,
+        columnWidths, sortConfig
+    });
+    let syncedFields = {};
+    const markFieldsSynced = () => {
+        syncedFields = Object.fromEntries(Object.entries(getProjectFields()).map(([key, value]) => [key, JSON.stringify(value)]));
+    };
+
+    // The project with its tasks in the wire encoding, as sent to Python and embedded in exports.
+    const getState = () => ({ tasks: taskStore.toWire(), ...getProjectFields() });
+
+    const flushState = () => {
+        try {
+            const ops = [];
+            const viewFields = {};
+            const projectFields = {};
+            for (const [key, value] of Object.entries(getProjectFields())) {
+                const json = JSON.stringify(value);
+                if (syncedFields[key] === json) continue;
+                (viewFieldNames.includes(key) ? viewFields : projectFields)[key] = value;
+                syncedFields[key] = json;
+            }
+            if (Object.keys(viewFields).length > 0) ops.push({ op: 'set-view', fields: viewFields });
+            if (Object.keys(projectFields).length > 0) ops.push({ op: 'set-project', fields: projectFields });
+
+            const taskChanges = taskStore.takeChanges();
+            if (taskChanges.reset) ops.push({ op: 'replace-tasks', tasks: taskStore.toWire() });
+            taskChanges.removed.forEach(id => ops.push({ op: 'delete-task', id }));
+            taskChanges.upserted.forEach((fields, id) => {
+                const task = taskStore.get(id);
+                if (fields && [...fields].every(key => key === 'start' || key === 'end')) {
+                    ops.push({ op: 'move-task', id, start: task.start, end: task.end });
+                } else {
+                    ops.push({ op: 'upsert-task', task });
+                }
+            });
+            // Send the operations back to the Streamlit parent
+            if (ops.length > 0 && options.onChange) options.onChange(ops);
+        } catch (e) { console.error("Failed to save state", e); }
+    };
+
+    // Saves are coalesced: a burst of edits (several drags in a row, typing a title) is reported
+    // once, after it has settled and the browser is idle, instead of once per edit. Hiding or
+    // leaving the page flushes a pending save straight away.
+    const saveDebounceMs = 300;
+    const saveIdleTimeoutMs = 1000;
+    let saveTimer = null;
+    let saveIdleHandle = null;
+    const requestIdle = (callback) => window.requestIdleCallback
+        ? window.requestIdleCallback(callback, { timeout: saveIdleTimeoutMs })
+        : setTimeout(callback, 1);
+    const cancelIdle = (handle) => window.cancelIdleCallback ? window.cancelIdleCallback(handle) : clearTimeout(handle);
+
+    const saveState = () => {
+        clearTimeout(saveTimer);
+        saveTimer = setTimeout(() => {
+            saveTimer = null;
+            if (saveIdleHandle !== null) return;
+            saveIdleHandle = requestIdle(() => {
+                saveIdleHandle = null;
+                flushState();
+            });
+        }, saveDebounceMs);
+    };
+
+    const flushPendingSave = () => {
+        if (saveTimer === null && saveIdleHandle === null) return;
+        clearTimeout(saveTimer);
+        saveTimer = null;
+        if (saveIdleHandle !== null) cancelIdle(saveIdleHandle);
+        saveIdleHandle = null;
+        flushState();
+    };
+
+    // Replaces the whole project with data sent from Python (sample data, clearing the project).
+    const receiveState = (state) => {
+        taskStore.replaceAll(state.tasks || []);
+        taskStore.takeChanges();
+        projectGroups = state.projectGroups || [];
+        viewMode = state.viewMode || 'day';
+        viewModeSelect.value = viewMode;
+        sortConfig = state.sortConfig || { key: 'start', direction: 'ascending' };
+        columnWidths = state.columnWidths || { group: 150, taskName: 250, startDate: 120, deps: 100 };
+        projectTitleEl.value = state.projectTitle || 'Project Timeline';
+        projectSubtitleEl.value = state.projectSubtitle || 'Interactive Gantt Chart';
+        refreshDependencyCycles(true);
+        markFieldsSynced();
+        setTimelineRenderer(state.timelineRenderer || 'dom');
+    };
+
+    // --- DRAG-AND-DROP LOGIC ---
+    // A single delegated pointerdown handler on the chart replaces per-bar listeners, so bars
+    // created or patched by the renderer need no wiring of their own.
+    const handleChartPointerDown = (e) => {
+        const resizer = e.target.closest('.resizer');
+        if (resizer) {
+            handleResizeStart(e, resizer.dataset.column);
+            return;
+        }
+        if (e.button !== 0 || isResizing) return;
+        if (timelineCanvasEl && e.target === timelineCanvasEl) {
+            const hit = hitTestCanvas(e);
+            if (!hit) return;
+            beginBarDrag(e, hit.task.id, { left: hit.left, width: hit.width }, hit.handleType);
+            invalidateCanvasTiles(); // Repaint the tiles without the dragged bar
+            paintTimelineCanvas();
+            return;
+        }
+        if (!e.target.closest('.gantt-bar-bg, .gantt-bar-handle')) return;
+        const barWrapper = e.target.closest('.gantt-bar-wrapper');
+        if (!barWrapper) return;
+
+        e.stopPropagation();
+        beginBarDrag(e, parseInt(barWrapper.dataset.taskBarId), { left: barWrapper.offsetLeft, width: barWrapper.offsetWidth }, e.target.dataset.handleType || 'move');
+        barWrapper.style.zIndex = 30;
+        drawDependencyArrows(); // Move the bar's arrows over to the paths redrawn while dragging
+    };
+
+    const beginBarDrag = (e, taskId, startStyles, type) => {
+        isDragging = true;
+        currentTaskId = taskId;
+        dragStartPos = e.clientX;
+        originalTaskData = { ...taskStore.get(currentTaskId) };
+        dragStartStyles = startStyles;
+        dragType = type; 
+        document.body.classList.add('select-none'); // Prevent text selection during drag
+    };
+
+    const handleChartClick = (e) => {
+        if (e.target.closest('.resizer')) return;
+        const header = e.target.closest('[data-sort-key]');
+        if (header) {
+            if (isResizing) return;
+            const key = header.dataset.sortKey;
+            if (sortConfig.key === key) {
+                sortConfig.direction = sortConfig.direction === 'ascending' ? 'descending' : 'ascending';
+            } else {
+                sortConfig.key = key;
+                sortConfig.direction = 'ascending';
+            }
+            saveState();
+            renderGanttChart();
+            return;
+        }
+        const editCell = e.target.closest('[data-edit-task-id]');
+        if (editCell) {
+            const task = taskStore.get(parseInt(editCell.dataset.editTaskId));
+            if (task) openModal(task);
+        }
+    };
+
+    const handleChartContextMenu = (e) => {
+        let task = null;
+        if (timelineCanvasEl && e.target === timelineCanvasEl) {
+            task = hitTestCanvas(e)?.task;
+        } else {
+            const barWrapper = e.target.closest('.gantt-bar-wrapper');
+            if (barWrapper) task = taskStore.get(parseInt(barWrapper.dataset.taskBarId));
+        }
+        if (!task) return;
+        e.preventDefault();
+        openModal(task);
+    };
+
+    const handleDragMove = (e) => {
+        if (!isDragging) return;
+        e.preventDefault();
+        const barWrapper = rowNodesById.get(currentTaskId)?.barWrapper;
+        if (!barWrapper && !timelineCanvasEl) return;
+        const deltaX = e.clientX - dragStartPos;
+        let left = dragPreview ? dragPreview.left : dragStartStyles.left;
+        let width = dragPreview ? dragPreview.width : dragStartStyles.width;
+
+        if (dragType === 'move') {
+            left = dragStartStyles.left + deltaX;
+        } else if (dragType === 'resize-right') {
+            const newWidth = dragStartStyles.width + deltaX;
+            if (newWidth > pixelsPerDay / 2) { width = newWidth; }
+        } else if (dragType === 'resize-left') {
+            const newWidth = dragStartStyles.width - deltaX;
+            if (newWidth > pixelsPerDay / 2) {
+                left = dragStartStyles.left + deltaX;
+                width = newWidth;
+            }
+        }
+        dragPreview = { taskId: currentTaskId, left, width };
+        if (timelineCanvasEl) {
+            paintTimelineCanvas();
+            return;
+        }
+        barWrapper.style.left = `${left}px`;
+        barWrapper.style.width = `${width}px`;
+        drawDraggedArrows(); // Redraw the bar's own arrows during drag for immediate feedback
+    };
+
+    // *** MODIFIED FUNCTION ***
+    // This function now correctly handles moves to the past by checking for dependency violations.
+    const handleDragEnd = (e) => {
+        if (!isDragging || !currentTaskId) return;
+
+        const task = taskStore.get(currentTaskId);
+        if (!task) { isDragging = false; return; }
+
+        document.body.classList.remove('select-none');
+
+        const rowNode = rowNodesById.get(currentTaskId);
+        canvasDragArrows = null;
+        if (rowNode?.barWrapper) {
+            rowNode.barWrapper.style.zIndex = 10;
+            rowNode.geometryKey = null; // The drag moved the bar; let the next render reposition it
+        }
+
+        isDragging = false;
+        dragPreview = null;
+        arrowsKey = null; // The arrows were last drawn to the dragged bar
+        if (timelineCanvasEl) {
+            invalidateCanvasTiles(); // Bring the dragged bar back into the cached tiles
+            paintTimelineCanvas();
+        }
+        const finalDayShift = Math.round((e.clientX - dragStartPos) / pixelsPerDay);
+
+        const updatedTaskData = { ...task };
+        const { startDay, endDay } = taskStore.days(task);
+        let newStartDay, newEndDay;
+
+        // Calculate the new start and end days based on the drag type and distance
+        if (dragType === 'move') {
+            newStartDay = startDay + finalDayShift;
+            newEndDay = endDay + finalDayShift;
+        } else if (dragType === 'resize-right') {
+            newStartDay = startDay;
+            newEndDay = Math.max(startDay, endDay + finalDayShift);
+        } else { // resize-left
+            newEndDay = endDay;
+            newStartDay = Math.min(endDay, startDay + finalDayShift);
+        }
+
+        updatedTaskData.start = formatEpochDay(newStartDay);
+        updatedTaskData.end = formatEpochDay(newEndDay);
+
+        // If no actual date change occurred, just redraw and exit.
+        if (updatedTaskData.start === originalTaskData.start && updatedTaskData.end === originalTaskData.end) {
+            renderGanttChart();
+            currentTaskId = null;
+            return;
+        }
+
+        // **FIX:** Check for predecessor dependency violations before applying the change.
+        if (updatedTaskData.dependencies) {
+            const parentIds = parseDependencyIds(updatedTaskData.dependencies);
+            let conflictingParent = null;
+            for (const parentId of parentIds) {
+                const parentTask = taskStore.get(parentId);
+                if (parentTask) {
+                    const parentEndDay = taskStore.days(parentTask).endDay;
+                    // A task cannot start on the same day its predecessor ends. It must start on the next day or later.
+                    if (parentEndDay !== null && newStartDay <= parentEndDay) {
+                        conflictingParent = parentTask;
+                        break;
+                    }
+                }
+            }
+
+            if (conflictingParent) {
+                showToast(`Action blocked: Violates dependency on "${conflictingParent.name}".`, true);
+                renderGanttChart(); // Revert visual changes
+                currentTaskId = null;
+                return;
+            }
+        }
+
+        // If the move is valid, calculate the cascading effect on descendant tasks. The engine
+        // works it out off the main thread, so further drags are not held up meanwhile.
+        getDependencyUpdatePlan(updatedTaskData).then((updatePlan) => {
+            // Uses the task's own id rather than currentTaskId, which has been cleared by the
+            // time the plan or a confirmation from the dependency modal arrives.
+            const performUpdate = () => {
+                taskStore.update(updatedTaskData.id, updatedTaskData);
+                updatePlan.forEach(plannedUpdate => {
+                    taskStore.update(plannedUpdate.id, { start: plannedUpdate.start, end: plannedUpdate.end });
+                });
+                renderGanttChart();
+                saveState();
+            };
+
+            if (updatePlan.length > 0) {
+                const dateShift = newStartDay - startDay;
+                const direction = dateShift > 0 ? 'forward' : 'backward';
+                const modalText = `Shifting this task ${direction} by ${Math.abs(dateShift)} day(s) will also shift ${updatePlan.length} dependent task(s). Do you want to proceed?`;
+
+                showDependencyModal(updatePlan, modalText, performUpdate, () => renderGanttChart());
+            } else {
+                performUpdate();
+            }
+        }).catch((error) => {
+            reportEngineError('work out the dependent tasks', error);
+            renderGanttChart(); // Put the bar back where it was before the drag
+        });
+        currentTaskId = null;
+    };
+
+    // --- DEPENDENCY LOGIC ---
+    // Returns the set of `rootId` and every task downstream of it.
+    const collectDependants = (rootId) => {
+        const dependants = new Set([rootId]);
+        const stack = [rootId];
+        while (stack.length > 0) {
+            for (const childId of taskStore.childIds(stack.pop())) {
+                if (!dependants.has(childId) && taskStore.has(childId)) {
+                    dependants.add(childId);
+                    stack.push(childId);
+                }
+            }
+        }
+        return dependants;
+    };
+
+    // Reports a scheduling engine request that failed. Callers leave or put the chart back the
+    // way it was before the request.
+    const reportEngineError = (action, error) => {
+        console.error(`Could not ${action}`, error);
+        showToast(`Could not ${action}: ${error.message}`, true);
+    };
+
+    const describeCycles = (cycles) => {
+        const shown = cycles.slice(0, 3).map(cycle => cycle.map(id => `#${id}`).join(', ')).join('; ');
+        return cycles.length > 3 ? `${shown} and ${cycles.length - 3} more` : shown;
+    };
+
+    // Re-runs cycle detection over the whole plan and flags the members (after loading, importing
+    // or deleting), rendering again if the flags changed. With `announce`, cycles found are also
+    // reported in a toast.
+    const refreshDependencyCycles = (announce = false) => {
+        engine.request({ type: 'cycles' }).then(({ cycles }) => {
+            const flagged = new Set(cycles.flat());
+            const changed = flagged.size !== cyclicTaskIds.size || [...flagged].some(id => !cyclicTaskIds.has(id));
+            cyclicTaskIds = flagged;
+            if (changed) renderGanttChart();
+            if (announce && cycles.length > 0) showToast(`Dependency cycle between tasks ${describeCycles(cycles)}.`, true);
+        }).catch((error) => reportEngineError('check the dependencies for cycles', error));
+    };
+
+    // Returns the path that would close a cycle if `taskId` depended on `parentIds`, as
+    // [taskId, ..., parentId, taskId], or null if those dependencies are safe.
+    const findCycleThrough = (taskId, parentIds) => {
+        if (parentIds.includes(taskId)) return [taskId, taskId];
+        const targets = new Set(parentIds);
+        const cameFrom = new Map([[taskId, null]]);
+        const queue = [taskId];
+        for (let head = 0; head < queue.length; head++) {
+            for (const childId of taskStore.childIds(queue[head])) {
+                if (cameFrom.has(childId) || !taskStore.has(childId)) continue;
+                cameFrom.set(childId, queue[head]);
+                if (targets.has(childId)) {
+                    const path = [taskId];
+                    for (let step = childId; step !== null; step = cameFrom.get(step)) path.unshift(step);
+                    return path;
+                }
+                queue.push(childId);
+            }
+        }
+        return null;
+    };
+
+    const showDependencyModal = (updatePlan, text, onConfirm, onCancel) => {
+        dependencyModalText.textContent = text;
+        dependentTasksListEl.innerHTML = updatePlan.map(d => `<p class="p-2 bg-gray-100 rounded-md">#${d.id}: ${d.name}</p>`).join('');
+        dependencyModal.classList.remove('hidden');
+        dependencyModal.classList.add('flex');
+
+        const cleanup = () => {
+            dependencyModal.classList.add('hidden');
+            dependencyModal.classList.remove('flex');
+            confirmDependencyUpdateBtn.removeEventListener('click', confirmHandler);
+            cancelDependencyUpdateBtn.removeEventListener('click', cancelHandler);
+        };
+
+        const confirmHandler = () => { cleanup(); onConfirm(); };
+        const cancelHandler = () => { cleanup(); onCancel(); };
+
+        confirmDependencyUpdateBtn.addEventListener('click', confirmHandler, { once: true });
+        cancelDependencyUpdateBtn.addEventListener('click', cancelHandler, { once: true });
+    };
+
+    // Calculates the cascading date shifts for tasks that depend on the one that was moved. The
+    // engine walks only the changed task's descendants; the plan is asked for again if the tasks
+    // changed while it was being worked out. Resolves to the shifted tasks in topological order.
+    const getDependencyUpdatePlan = async (updatedTaskData) => {
+        const message = {
+            type: 'plan',
+            rootId: updatedTaskData.id,
+            endDay: parseTaskDays(updatedTaskData).endDay ?? NO_DAY,
+            parentIds: parseDependencyIds(updatedTaskData.dependencies)
+        };
+        let generation, result;
+        do {
+            generation = taskStore.generation;
+            result = await engine.request(message);
+        } while (generation !== taskStore.generation);
+
+        if (result.cycles) {
+            console.error("Circular dependency detected!", result.cycles);
+            showToast(`Error: Circular dependency between tasks ${describeCycles(result.cycles)}. Cannot update dates.`, true);
+            return [];
+        }
+        const updatePlan = [];
+        result.ids.forEach((id, i) => {
+            const task = taskStore.get(id);
+            if (!task) return;
+            updatePlan.push({
+                ...task,
+                start: formatEpochDay(result.startDays[i]),
+                end: result.endDays[i] === NO_DAY ? task.end : formatEpochDay(result.endDays[i])
+            });
+        });
+        return updatePlan;
+    };
+
+    // --- Rest of the JavaScript (rendering, modals, file handling, etc.) ---
+    // This part of the code remains the same as it was functioning correctly.
+    // It includes functions for rendering the chart, handling modals, saving/loading data, etc.
+
+    const clearState = () => {
+        taskStore.replaceAll([]);
+        cyclicTaskIds = new Set();
+        projectGroups = [];
+        projectTitleEl.value = "Project Timeline";
+        projectSubtitleEl.value = "Interactive Gantt Chart";
+        viewMode = 'day';
+        viewModeSelect.value = 'day';
+        columnWidths = { group: 150, taskName: 250, startDate: 120, deps: 100 };
+        sortConfig = { key: 'start', direction: 'ascending' };
+        renderGanttChart();
+        saveState();
+        showToast("All data has been cleared.");
+    };
+
+    const handleResizeStart = (e, column) => {
+        e.preventDefault();
+        isResizing = true;
+        resizingColumn = column;
+        dragStartPos = e.clientX;
+        document.body.style.cursor = 'col-resize';
+        document.addEventListener('pointermove', handleResizeMove);
+        document.addEventListener('pointerup', handleResizeEnd, { once: true });
+    };
+
+    const handleResizeMove = (e) => {
+        if (!isResizing) return;
+        const deltaX = e.clientX - dragStartPos;
+        const originalWidth = columnWidths[resizingColumn];
+        const newWidth = originalWidth + deltaX;
+        if (newWidth > 50) {
+            document.documentElement.style.setProperty(`--${resizingColumn}-width`, `${newWidth}px`);
+        }
+    };
+
+    const handleResizeEnd = (e) => {
+        if (!isResizing) return;
+        const deltaX = e.clientX - dragStartPos;
+        const originalWidth = columnWidths[resizingColumn];
+        let newWidth = originalWidth + deltaX;
+        if (newWidth < 50) newWidth = 50;
+
+        columnWidths[resizingColumn] = newWidth;
+
+        isResizing = false;
+        document.body.style.cursor = 'default';
+        document.removeEventListener('pointermove', handleResizeMove);
+
+        saveState();
+        renderGanttChart(); 
+    };
+
+    const saveTask = (e) => {
+        e.preventDefault();
+        const id = document.getElementById('task-id').value;
+        const name = document.getElementById('task-name').value;
+        const group = document.getElementById('task-group').value;
+        const startValue = document.getElementById('task-start').value;
+        const endValue = document.getElementById('task-end').value;
+        const progress = parseInt(document.getElementById('task-progress').value, 10);
+        const colorInput = document.getElementById('task-color');
+        const color = colorInput.disabled ? null : colorInput.value;
+        const selectedOptions = Array.from(document.getElementById('task-dependencies').selectedOptions);
+        const dependencies = selectedOptions.map(opt => opt.value).join(',');
+
+        // A new task takes the next id, which dangling dependencies elsewhere may already name.
+        const cyclePath = findCycleThrough(id ? parseInt(id) : taskStore.nextId(), parseDependencyIds(dependencies));
+        if (cyclePath) {
+            showToast(`These dependencies would create a cycle: ${cyclePath.map(taskId => `#${taskId}`).join(' → ')}.`, true);
+            return;
+        }
+
+        if (parseDate(startValue) > parseDate(endValue)) {
+            showToast("End date must be after start date.", true);
+            return;
+        }
+
+        const finalTaskData = {
+            id: id ? parseInt(id) : null,
+            name, group, 
+            start: formatDateToDDMMYYYY(parseDate(startValue)), 
+            end: formatDateToDDMMYYYY(parseDate(endValue)), 
+            progress, dependencies, color 
+        };
+
+        const performUpdate = (isNew = false, updatePlan = []) => {
+            if (isNew) {
+                taskStore.add({ ...finalTaskData, id: taskStore.nextId() });
+            } else {
+                taskStore.update(finalTaskData.id, finalTaskData);
+                updatePlan.forEach(plannedUpdate => {
+                    taskStore.update(plannedUpdate.id, { start: plannedUpdate.start, end: plannedUpdate.end });
+                });
+                if (cyclicTaskIds.size > 0) refreshDependencyCycles();
+            }
+            renderGanttChart();
+            closeModal();
+            saveState();
+        };
+
+        if (id) {
+            getDependencyUpdatePlan(finalTaskData).then((updatePlan) => {
+                if (updatePlan.length > 0) {
+                    const modalText = `Updating this task's dates will shift ${updatePlan.length} dependent task(s). Do you want to proceed?`;
+                    showDependencyModal(updatePlan, modalText, () => performUpdate(false, updatePlan), () => {});
+                } else {
+                    performUpdate(false);
+                }
+            }).catch((error) => reportEngineError('work out the dependent tasks', error)); // The modal stays open
+        } else {
+            performUpdate(true);
+        }
+    };
+
+    const deleteTask = () => {
+        const id = parseInt(document.getElementById('task-id').value);
+        const dependantIds = [...taskStore.childIds(id)];
+        taskStore.remove(id);
+        dependantIds.forEach(childId => {
+            taskStore.update(childId, { dependencies: taskStore.parentIds(childId).filter(parentId => parentId !== id).join(',') });
+        });
+        if (cyclicTaskIds.size > 0) refreshDependencyCycles();
+        renderGanttChart();
+        closeModal();
+        saveState();
+    };
+
+    const openModal = (task = null) => {
+        taskForm.reset();
+        delete taskForm.dataset.duration;
+        document.getElementById('task-end').min = '';
+        const taskId = task ? task.id : null;
+        const depsSelect = document.getElementById('task-dependencies');
+        depsSelect.innerHTML = '';
+        // Tasks downstream of this one cannot become its dependencies without closing a cycle.
+        const dependants = taskId !== null ? collectDependants(taskId) : new Set();
+        for (let rowIndex = 0; rowIndex < taskStore.size; rowIndex++) {
+            const optionId = taskStore.idAt(rowIndex);
+            if (optionId !== taskId) {
+                const option = document.createElement('option');
+                option.value = optionId;
+                option.textContent = `#${optionId}: ${taskStore.nameAt(rowIndex)}`;
+                if (dependants.has(optionId)) {
+                    option.disabled = true;
+                    option.textContent += ' (depends on this task)';
+                }
+                depsSelect.appendChild(option);
+            }
+        }
+        const groupSelect = document.getElementById('task-group');
+        groupSelect.innerHTML = `<option value="">-- No Group --</option>`;
+        projectGroups.forEach(group => {
+            const option = document.createElement('option');
+            option.value = group.name;
+            option.textContent = group.name;
+            groupSelect.appendChild(option);
+        });
+        if (task) {
+            document.getElementById('modal-title').textContent = 'Edit Task';
+            document.getElementById('task-id').value = task.id;
+            document.getElementById('task-name').value = task.name;
+            groupSelect.value = task.group || '';
+            document.getElementById('task-start').value = formatDateToYYYYMMDD(parseDate(task.start));
+            document.getElementById('task-end').value = formatDateToYYYYMMDD(parseDate(task.end));
+            document.getElementById('task-end').min = formatDateToYYYYMMDD(parseDate(task.start));
+            document.getElementById('task-progress').value = task.progress;
+            document.getElementById('progress-value').textContent = task.progress;
+            document.getElementById('delete-task-btn').classList.remove('hidden');
+            taskForm.dataset.duration = dayDiff(task.start, task.end);
+            const depIds = Array.from(taskStore.parentIds(task.id), String);
+            if (depIds.length > 0) {
+                for (const option of depsSelect.options) {
+                    // An existing cyclic dependency stays selectable so that it can be removed.
+                    if (depIds.includes(option.value)) {
+                        option.selected = true;
+                        option.disabled = false;
+                    }
+                }
+            }
+        } else {
+            document.getElementById('modal-title').textContent = 'Add New Task';
+            document.getElementById('task-id').value = '';
+            document.getElementById('progress-value').textContent = '0';
+            document.getElementById('delete-task-btn').classList.add('hidden');
+        }
+        updateColorPickerState();
+        taskModal.classList.remove('hidden');
+        taskModal.classList.add('flex');
+    };
+
+    const closeModal = () => {
+        taskModal.classList.add('hidden');
+        taskModal.classList.remove('flex');
+    };
+
+    const updateColorPickerState = () => {
+        const groupSelect = document.getElementById('task-group');
+        const colorInput = document.getElementById('task-color');
+        const selectedGroup = projectGroups.find(g => g.name === groupSelect.value);
+        if (selectedGroup) {
+            colorInput.value = selectedGroup.color;
+            colorInput.disabled = true;
+        } else {
+            colorInput.disabled = false;
+            const taskId = document.getElementById('task-id').value;
+            const currentTask = taskStore.get(parseInt(taskId));
+            if (currentTask && !currentTask.group && currentTask.color) {
+                colorInput.value = currentTask.color;
+            }
+        }
+    };
+
+    const openGroupModal = () => {
+        renderGroupList();
+        groupModal.classList.remove('hidden');
+        groupModal.classList.add('flex');
+    };
+
+    const closeGroupModal = () => {
+        groupModal.classList.add('hidden');
+        groupModal.classList.remove('flex');
+    };
+
+    const renderGroupList = () => {
+        groupListEl.innerHTML = '';
+        if (projectGroups.length === 0) {
+            groupListEl.innerHTML = `<p class="text-sm text-gray-500">No groups defined yet.</p>`;
+            return;
+        }
+        projectGroups.forEach(group => {
+            const groupEl = document.createElement('div');
+            groupEl.className = 'flex items-center justify-between p-2 bg-gray-50 rounded-lg';
+            groupEl.innerHTML = `<div class="flex items-center gap-3"><div class="w-5 h-5 rounded-full" style="background-color: ${group.color};"></div><span class="font-medium text-gray-800">${group.name}</span></div><button data-group-name="${group.name}" class="text-gray-400 hover:text-red-600 delete-group-btn">&times;</button>`;
+            groupListEl.appendChild(groupEl);
+        });
+        groupListEl.querySelectorAll('.delete-group-btn').forEach(btn => {
+            btn.addEventListener('click', () => deleteGroup(btn.dataset.groupName));
+        });
+    };
+
+    const addGroup = (e) => {
+        e.preventDefault();
+        const nameInput = document.getElementById('new-group-name');
+        const colorInput = document.getElementById('new-group-color');
+        const name = nameInput.value.trim();
+        if (!name) {
+            showToast("Group name cannot be empty.", true); return;
+        }
+        if (projectGroups.some(g => g.name.toLowerCase() === name.toLowerCase())) {
+            showToast("A group with this name already exists.", true); return;
+        }
+        projectGroups.push({ name, color: colorInput.value });
+        addGroupForm.reset();
+        colorInput.value = '#79D3C9';
+        renderGroupList();
+        saveState();
+    };
+
+    const deleteGroup = (groupName) => {
+        projectGroups = projectGroups.filter(g => g.name !== groupName);
+        taskStore.list.forEach(task => {
+            if (task.group === groupName) taskStore.update(task.id, { group: '' });
+        });
+        renderGroupList();
+        renderGanttChart();
+        saveState();
+    };
+
+    const downloadAsExcel = async () => {
+        try {
+            await loadSheetJs();
+        } catch (err) {
+            showToast(err.message, true);
+            return;
+        }
+        const workbook = XLSX.utils.book_new();
+        const projectInfoData = [
+            ['Project Title', projectTitleEl.value],
+            ['Project Subtitle', projectSubtitleEl.value]
+        ];
+        const projectInfoWorksheet = XLSX.utils.aoa_to_sheet(projectInfoData);
+        projectInfoWorksheet['!cols'] = [{ wch: 20 }, { wch: 50 }];
+        XLSX.utils.book_append_sheet(workbook, projectInfoWorksheet, "ProjectInfo");
+        if (projectGroups.length > 0) {
+            const groupsWorksheet = XLSX.utils.json_to_sheet(projectGroups);
+            groupsWorksheet['!cols'] = [{ wch: 25 }, { wch: 10 }];
+            XLSX.utils.book_append_sheet(workbook, groupsWorksheet, "Groups");
+        }
+        const tasksExportData = taskStore.list.map(({ id, name, group, start, end, progress, dependencies, color }) => ({
+            'Group': group || '', 'Task Name': name, 'ID': id, 'Start Date': start,
+            'End Date': end, 'Progress (%)': progress, 'Dependencies': dependencies || '', 'Color': color || ''
+        }));
+        const tasksWorksheet = XLSX.utils.json_to_sheet(tasksExportData);
+        tasksWorksheet['!cols'] = [{ wch: 20 }, { wch: 40 }, { wch: 5 }, { wch: 12 }, { wch: 12 }, { wch: 12 }, { wch: 15 }, { wch: 10 }];
+        XLSX.utils.book_append_sheet(workbook, tasksWorksheet, "Tasks");
+        const safeFilename = projectTitleEl.value.replace(/[^a-z0-9]/gi, '_').toLowerCase() || 'gantt_chart';
+        XLSX.writeFile(workbook, `${safeFilename}.xlsx`);
+    };
+
+    // Assembles a self-contained page: the frontend's own assets are inlined and the current state
+    // is embedded for the bootstrap to pick up. An exported page re-exports from its own DOM.
+    const buildStandaloneHtml = async (state) => {
+        const stateScript = `window.ganttStandaloneState = ${JSON.stringify(state).replace(/</g, '\\u003c')};`;
+        const standaloneStateEl = document.getElementById('gantt-standalone-state');
+        if (standaloneStateEl) {
+            standaloneStateEl.textContent = stateScript;
+            return '<!DOCTYPE html>\n' + document.documentElement.outerHTML;
+        }
+        const [pageHtml, tailwindCss, css, engineScript, script] = await Promise.all(['index.html', 'vendor/tailwind.css', 'gantt.css', 'gantt-engine.js', 'gantt.js'].map(async (asset) => {
+            const response = await fetch(asset);
+            if (!response.ok) throw new Error(`Could not load ${asset}`);
+            return response.text();
+        }));
+        const inlineScript = (code) => code.replace(/<\/script/gi, '<\\/script');
+        return pageHtml
+            .replace('<link rel="stylesheet" href="vendor/tailwind.css">', () => `<style>\n${tailwindCss}</style>`)
+            .replace('<link rel="stylesheet" href="gantt.css">', () => `<style>\n${css}</style>`)
+            .replace('<script src="streamlit.js"></script>', () => `<script id="gantt-standalone-state">${stateScript}</script>`)
+            .replace('<script src="gantt-engine.js"></script>', () => `<script id="gantt-engine-script">\n${inlineScript(engineScript)}</script>`)
+            .replace('<script src="gantt.js"></script>', () => `<script>\n${inlineScript(script)}</script>`);
+    };
+
+    // Saves a blob as a download named after the project.
+    const downloadBlob = (blob, extension) => {
+        const url = URL.createObjectURL(blob);
+        const a = document.createElement('a');
+        const safeFilename = projectTitleEl.value.replace(/[^a-z0-9]/gi, '_').toLowerCase() || 'gantt_chart';
+        a.download = `${safeFilename}.${extension}`;
+        a.href = url;
+        a.style.display = 'none';
+        document.body.appendChild(a);
+        a.click();
+        document.body.removeChild(a);
+        URL.revokeObjectURL(url);
+    };
+
+    const downloadAsHtml = async () => {
+        let htmlContent;
+        try {
+            htmlContent = await buildStandaloneHtml(getState());
+        } catch (err) {
+            showToast(`HTML export failed: ${err.message}`, true);
+            return;
+        }
+        downloadBlob(new Blob([htmlContent], { type: 'text/html' }), 'html');
+    };
+
+    // Writes the task sheet's columns as CSV, a row at a time from the store. The text is handed
+    // to the Blob in pieces rather than joined into one string.
+    const csvColumns = ['Group', 'Task Name', 'ID', 'Start Date', 'End Date', 'Progress (%)', 'Dependencies', 'Color'];
+    const csvField = (value) => {
+        const text = String(value ?? '');
+        return /[",\r\n]/.test(text) ? `"${text.replace(/"/g, '""')}"` : text;
+    };
+    const downloadAsCsv = () => {
+        const pieces = [csvColumns.join(',') + '\r\n'];
+        let lines = [];
+        for (let rowIndex = 0; rowIndex < taskStore.size; rowIndex++) {
+            const { id, name, group, start, end, progress, dependencies, color } = taskStore.at(rowIndex);
+            lines.push([group, name, id, start, end, progress, dependencies, color].map(csvField).join(','));
+            if (lines.length === 10000) {
+                pieces.push(lines.join('\r\n') + '\r\n');
+                lines = [];
+            }
+        }
+        if (lines.length > 0) pieces.push(lines.join('\r\n') + '\r\n');
+        downloadBlob(new Blob(pieces, { type: 'text/csv' }), 'csv');
+    };
+
+    // Workbooks and CSV files are parsed by the engine. A worker reads the file (and loads SheetJS)
+    // itself; on the page both are done here first. Tasks arrive in batches: the first replaces the chart and
+    // is drawn at once, later ones are appended and drawn at most every importRenderInterval ms.
+    // Starting another import abandons the batches still coming from this one.
+    const importRenderInterval = 500;
+    let importCount = 0;
+    const handleFileUpload = (event) => {
+        const input = event.target;
+        const file = input.files[0];
+        if (!file) return;
+        const importId = ++importCount;
+        let lastRender = 0;
+        const isCsv = /\.csv$/i.test(file.name);
+        const onProgress = ({ project, tasks, done, total }) => {
+            if (importId !== importCount) return;
+            if (project) {
+                if (project.projectTitle) projectTitleEl.value = project.projectTitle;
+                if (project.projectSubtitle) projectSubtitleEl.value = project.projectSubtitle;
+                // A CSV file holds tasks only and keeps the current groups.
+                if (project.projectGroups) projectGroups = project.projectGroups;
+                taskStore.replaceAll(tasks);
+                viewModeSelect.value = 'day';
+            } else {
+                tasks.forEach(task => taskStore.add(task));
+            }
+            showProgress(`Importing tasks… ${total > 0 ? Math.floor(done / total * 100) : 100}% (${taskStore.size.toLocaleString()} so far)`);
+            if (project || Date.now() - lastRender >= importRenderInterval) {
+                lastRender = Date.now();
+                renderGanttChart();
+            }
+        };
+        showProgress(`Reading ${file.name}…`);
+        (engine.inWorker ? Promise.resolve(file) : (isCsv ? Promise.resolve() : loadSheetJs()).then(() => file.arrayBuffer()))
+            .then((source) => engine.request(isCsv
+                ? { type: 'parse-csv', source }
+                : { type: 'parse-workbook', source, xlsxUrls: sheetJsUrls() }, onProgress))
+            .then(({ imported, skipped, issues }) => {
+                if (importId !== importCount) return;
+                refreshDependencyCycles(true);
+                renderGanttChart();
+                saveState();
+                const details = issues.length > 0 ? ` Check ${issues.join('; ')}.` : '';
+                showToast(skipped > 0
+                    ? `Imported ${imported} tasks, skipped ${skipped} rows.${details}`
+                    : `Successfully imported project data!${details}`, skipped > 0);
+            })
+            .catch((error) => showToast(error.message, true))
+            .finally(() => {
+                if (importId === importCount) showProgress(null);
+                input.value = '';
+            });
+    };
+
+    // Clears the chart and shows a placeholder message instead of the grid.
+    const showChartMessage = (message) => {
+        ganttChartEl.innerHTML = `<div class="text-center p-10 text-gray-500 col-span-full">${message}</div>`;
+        ganttChartEl.style.gridTemplateRows = '';
+        dependencyLinesEl.innerHTML = '';
+        dependencyPathEls = null;
+        rowNodesById.clear();
+        chartLayout = null;
+        layoutKey = canvasTilesKey = arrowsKey = null;
+        renderedWindow = null;
+        sortHeaderEls = null;
+        timelineCanvasEl = null;
+    };
+
+    // Builds the persistent parts of the grid: frozen header cells and the windowed layers.
+    const buildChartSkeleton = () => {
+        ganttChartEl.innerHTML = '';
+        const createHeaderCell = (content, col, stickyLeft, resizerKey = null, sortKey = null) => {
+            const cell = document.createElement('div');
+            cell.className = 'sticky top-0 z-20 bg-gray-100 px-3 font-semibold text-sm border-b border-r border-gray-200 flex items-center justify-between relative whitespace-nowrap';
+            cell.style.gridColumn = col;
+            cell.style.gridRow = '1';
+
+            let innerHTML = `<span>${content}</span>`;
+            if (sortKey) {
+                cell.dataset.sortKey = sortKey;
+                cell.classList.add('cursor-pointer', 'hover:bg-gray-200', 'select-none');
+                innerHTML += `<span class="sort-indicator text-xs ml-2 text-gray-500"></span>`;
+            }
+            cell.innerHTML = innerHTML;
+
+            if (stickyLeft !== null) {
+                cell.style.left = stickyLeft;
+                cell.classList.add('bg-white'); // Give frozen headers a solid background
+            }
+            if (resizerKey) cell.innerHTML += `<div class="resizer" data-column="${resizerKey}"></div>`;
+            return cell;
+        }
+
+        const groupHeader = createHeaderCell('Group', '1', '0px', 'group', 'group');
+        groupHeader.classList.add('z-30');
+        ganttChartEl.appendChild(groupHeader);
+        ganttChartEl.appendChild(createHeaderCell('Task Name', '2', 'var(--group-width)', 'taskName', 'name'));
+        ganttChartEl.appendChild(createHeaderCell('Start Date', '3', 'calc(var(--group-width) + var(--task-name-width))', 'startDate', 'start'));
+        ganttChartEl.appendChild(createHeaderCell('Depends On', '4', 'calc(var(--group-width) + var(--task-name-width) + var(--start-date-width))', 'deps'));
+        sortHeaderEls = Array.from(ganttChartEl.querySelectorAll('[data-sort-key]'));
+
+        // Windowed cells live in `display: contents` layers so they still take part in the grid
+        // but can be managed separately from the frozen header cells.
+        timelineHeaderLayerEl = document.createElement('div');
+        timelineHeaderLayerEl.style.display = 'contents';
+        taskRowsLayerEl = document.createElement('div');
+        taskRowsLayerEl.style.display = 'contents';
+        ganttChartEl.append(timelineHeaderLayerEl, taskRowsLayerEl);
+
+        // In canvas mode one sticky canvas covers the visible part of the timeline body.
+        timelineCanvasEl = null;
+        if (timelineRenderer === 'canvas') {
+            timelineCanvasEl = document.createElement('canvas');
+            timelineCanvasEl.style.cssText = `grid-row: 2 / -1; grid-column: 5 / -1; position: sticky; top: ${taskRowHeight}px; left: calc(var(--group-width) + var(--task-name-width) + var(--start-date-width) + var(--deps-width)); align-self: start; justify-self: start; display: block;`;
+            ganttChartEl.appendChild(timelineCanvasEl);
+        }
+    };
+
+    // Switches between DOM and canvas bars; the grid skeleton and row nodes are rebuilt.
+    const setTimelineRenderer = (renderer) => {
+        timelineRenderer = renderer;
+        timelineRendererSelect.value = renderer;
+        sortHeaderEls = null;
+        rowNodesById.clear();
+        renderGanttChart();
+    };
+
+    const updateSortIndicators = () => {
+        sortHeaderEls.forEach(header => {
+            const isActive = sortConfig.key === header.dataset.sortKey;
+            header.querySelector('.sort-indicator').textContent = isActive ? (sortConfig.direction === 'ascending' ? '▲' : '▼') : '';
+        });
+    };
+
+    // The rows are put in order by the engine. A render draws the current order straight away;
+    // when the tasks or the sort have changed since that order was computed, a fresh one is
+    // requested and the chart renders again once it arrives.
+    let rowOrderKey = null;
+    let requestedRowOrderKey = null;
+    const requestRowOrder = () => {
+        const currentOrderKey = () => `${taskStore.generation}:${sortConfig.key}:${sortConfig.direction}`;
+        const orderKey = currentOrderKey();
+        if (orderKey === rowOrderKey || orderKey === requestedRowOrderKey) return;
+        requestedRowOrderKey = orderKey;
+        engine.request({ type: 'sort', key: sortConfig.key, direction: sortConfig.direction }).then(({ order }) => {
+            if (requestedRowOrderKey !== orderKey) return; // A newer order is on its way
+            requestedRowOrderKey = null;
+            if (orderKey !== currentOrderKey()) {
+                requestRowOrder();
+                return;
+            }
+            rowOrderKey = orderKey;
+            taskStore.setOrder(order);
+            renderGanttChart();
+        }).catch((error) => {
+            if (requestedRowOrderKey !== orderKey) return;
+            // The rows keep their current order until the tasks or the sort change again.
+            requestedRowOrderKey = null;
+            rowOrderKey = orderKey;
+            reportEngineError('sort the tasks', error);
+        });
+    };
+
+    // Re-sorts, re-measures and reconciles the chart. Existing row nodes are kept (keyed by
+    // task id) and only patched where their data, position or row changed. Everything sized by
+    // the whole plan is cached: the timeline layout until the date range, zoom or column widths
+    // change, bar geometry is worked out per row as rows are drawn, the dependency edges until the
+    // graph changes, canvas tiles until the tasks or the layout change, and arrows until those
+    // or the rendered window change. A render that changes nothing touches only the rows in the
+    // visible window.
+    const renderGanttChart = () => {
+        if (!ganttChartEl) return;
+
+        // Apply dynamic column widths from state
+        Object.keys(columnWidths).forEach(key => {
+            document.documentElement.style.setProperty(`--${key.replace('taskName', 'task-name').replace('startDate', 'start-date')}-width`, `${columnWidths[key]}px`);
+        });
+
+        if (taskStore.size === 0) {
+            showChartMessage("No tasks yet. Click '+ Add Task' to begin.");
+            return;
+        }
+
+        requestRowOrder();
+
+        const groupColors = Object.fromEntries(projectGroups.map(g => [g.name, g.color]));
+        const { minDay, maxDay } = taskStore.dayRange();
+
+        if (minDay === null) {
+            showChartMessage('No valid dates found in tasks.');
+            return;
+        };
+
+        const nextLayoutKey = JSON.stringify([minDay, maxDay, viewMode, columnWidths, ganttChartContainerEl.offsetWidth]);
+        if (nextLayoutKey !== layoutKey || !chartLayout) {
+            chartStartDate = fromEpochDay(minDay - 2);
+            let chartEndDate = fromEpochDay(maxDay + 2);
+            let headers = [];
+            const columnWidth = viewMode === 'day' ? 40 : viewMode === 'week' ? 60 : viewMode === 'month' ? 80 : 120;
+
+            if (viewMode === 'day') {
+                let d = new Date(chartStartDate);
+                while (d <= chartEndDate) {
+                    headers.push({
+                        label: d.getUTCDate(),
+                        subLabel: d.getUTCDate() === 1 || headers.length === 0 ? d.toLocaleString('default', { month: 'short', timeZone: 'UTC' }) : '',
+                        isWeekend: [0, 6].includes(d.getUTCDay()),
+                        startDate: new Date(d), days: 1
+                    });
+                    d = addDays(d, 1);
+                }
+            } else { /* Logic for week, month, quarter, year views */ 
+                let unitStartDate = new Date(chartStartDate);
+                while (unitStartDate <= chartEndDate) {
+                    let unitEndDate, label, subLabel;
+                    const year = unitStartDate.getUTCFullYear();
+                    if (viewMode === 'week') {
+                        const dayOfWeek = unitStartDate.getUTCDay();
+                        const startOfWeek = addDays(unitStartDate, -dayOfWeek);
+                        unitEndDate = addDays(startOfWeek, 6);
+                        const weekNum = Math.ceil(( (startOfWeek - new Date(Date.UTC(year, 0, 1))) / 86400000 + 1) / 7);
+                        label = `W${weekNum}`; subLabel = `${startOfWeek.getUTCDate()}/${startOfWeek.getUTCMonth() + 1}`;
+                    } else if (viewMode === 'month') {
+                        unitStartDate = new Date(Date.UTC(year, unitStartDate.getUTCMonth(), 1));
+                        unitEndDate = new Date(Date.UTC(year, unitStartDate.getUTCMonth() + 1, 0));
+                        label = unitStartDate.toLocaleString('default', { month: 'short', year: 'numeric', timeZone: 'UTC' });
+                    } else if (viewMode === 'quarter') {
+                        const q = Math.floor(unitStartDate.getUTCMonth() / 3);
+                        unitStartDate = new Date(Date.UTC(year, q * 3, 1));
+                        unitEndDate = new Date(Date.UTC(year, unitStartDate.getUTCMonth() + 3, 0));
+                        label = `Q${q + 1} ${year}`;
+                    } else if (viewMode === 'year') {
+                        unitStartDate = new Date(Date.UTC(year, 0, 1));
+                        unitEndDate = new Date(Date.UTC(year, 11, 31));
+                        label = year;
+                    }
+                    headers.push({
+                        label, subLabel, startDate: new Date(unitStartDate),
+                        days: dayDiff(formatDateToYYYYMMDD(unitStartDate), formatDateToYYYYMMDD(unitEndDate)) + 1
+                    });
+                    unitStartDate = addDays(unitEndDate, 1);
+                }
+                chartStartDate = headers[0].startDate;
+            }
+
+            const finalChartEndDate = addDays(headers[headers.length - 1].startDate, headers[headers.length - 1].days);
+            const totalChartDays = dayDiff(formatDateToYYYYMMDD(chartStartDate), formatDateToYYYYMMDD(finalChartEndDate));
+            const frozenWidth = columnWidths.group + columnWidths.taskName + columnWidths.startDate + columnWidths.deps;
+            const timelineContainerWidth = ganttChartContainerEl.offsetWidth - frozenWidth;
+            const totalTimelinePixelWidth = Math.max(timelineContainerWidth, headers.length * columnWidth);
+            pixelsPerDay = totalTimelinePixelWidth / totalChartDays;
+
+            chartLayout = {
+                headers, groupColors, frozenWidth, totalTimelinePixelWidth,
+                headerColumnWidth: totalTimelinePixelWidth / headers.length,
+                chartStartDay: toEpochDay(chartStartDate)
+            };
+            layoutKey = nextLayoutKey;
+        }
+        chartLayout.groupColors = groupColors;
+
+        if (!sortHeaderEls) {
+            const scrollLeft = ganttChartContainerEl.scrollLeft;
+            const scrollTop = ganttChartContainerEl.scrollTop;
+            buildChartSkeleton();
+            ganttChartContainerEl.scrollLeft = scrollLeft;
+            ganttChartContainerEl.scrollTop = scrollTop;
+        }
+        updateSortIndicators();
+
+        // The full grid is sized up front (one fixed-height track per task), so the scroll
+        // extent is correct even though only the visible window is filled with cells.
+        const { headers, frozenWidth, totalTimelinePixelWidth } = chartLayout;
+        ganttChartEl.style.gridTemplateColumns = `var(--group-width) var(--task-name-width) var(--start-date-width) var(--deps-width) repeat(${headers.length}, 1fr)`;
+        ganttChartEl.style.gridTemplateRows = `repeat(${taskStore.size + 1}, ${taskRowHeight}px)`;
+        ganttChartEl.style.width = `${frozenWidth + totalTimelinePixelWidth}px`;
+
+        const paintedKey = `${taskStore.generation}:${taskStore.orderGeneration}:${layoutKey}:${JSON.stringify(groupColors)}`;
+        if (canvasTilesKey !== paintedKey) {
+            invalidateCanvasTiles();
+            canvasTilesKey = paintedKey;
+        }
+        renderVisibleWindow(true); // Also redraws the arrows if need be
+        paintTimelineCanvas();
+    };
+
+
+    // Returns the row index, left offset and width (in pixels from the start of the timeline)
+    // of a task bar, taking a bar that is being dragged into account.
+    const getBarGeometry = (taskId) => {
+        const rowIndex = taskStore.rowIndexOf(taskId);
+        if (dragPreview && dragPreview.taskId === taskId) return { rowIndex, left: dragPreview.left, width: dragPreview.width };
+        const startDay = taskStore.startDayAt(rowIndex);
+        const endDay = taskStore.endDayAt(rowIndex);
+        const { chartStartDay } = chartLayout;
+        return {
+            rowIndex,
+            left: (startDay !== null ? startDay - chartStartDay : 0) * pixelsPerDay,
+            width: ((startDay !== null && endDay !== null ? endDay - startDay : 0) + 1) * pixelsPerDay
+        };
+    };
+
+    // Every dependency as a parent/child id pair, from the store's dependency graph; collected
+    // again only after the graph changed.
+    let dependencyEdgesGeneration = -1;
+    const getDependencyEdges = () => {
+        if (dependencyEdgesGeneration !== taskStore.graphGeneration) {
+            dependencyEdges = [];
+            taskStore.forEachDependency((parentId, childId) => dependencyEdges.push({ parentId, childId }));
+            dependencyEdgesGeneration = taskStore.graphGeneration;
+        }
+        return dependencyEdges;
+    };
+
+    // The edges of one task: to its predecessors and to the tasks that depend on it.
+    const getTaskEdges = (taskId) => {
+        const edges = [];
+        taskStore.parentIds(taskId).forEach(parentId => {
+            if (taskStore.has(parentId)) edges.push({ parentId, childId: taskId });
+        });
+        taskStore.childIds(taskId).forEach(childId => {
+            if (childId !== taskId) edges.push({ parentId: taskId, childId });
+        });
+        return edges;
+    };
+
+    // Dependency edges indexed by the rows they span, so the edges crossing a range of rows are
+    // found without looking at all of them. Each edge is filed under the block of rows holding its
+    // upper end, and each block records the lowest row its edges reach. Rebuilt after the graph
+    // or the row order changed.
+    const edgeIndexBlockRows = 64;
+    let edgeIndex = null;
+    let edgeIndexKey = null;
+    const getEdgesInRows = (firstRow, lastRow) => {
+        const key = `${taskStore.graphGeneration}:${taskStore.orderGeneration}`;
+        if (edgeIndexKey !== key) {
+            edgeIndex = [];
+            for (const edge of getDependencyEdges()) {
+                const parentRow = taskStore.rowIndexOf(edge.parentId);
+                const childRow = taskStore.rowIndexOf(edge.childId);
+                const top = Math.min(parentRow, childRow);
+                const bottom = Math.max(parentRow, childRow);
+                const blockIndex = Math.floor(top / edgeIndexBlockRows);
+                const block = edgeIndex[blockIndex] || (edgeIndex[blockIndex] = { bottom, entries: [] });
+                block.bottom = Math.max(block.bottom, bottom);
+                block.entries.push({ edge, top, bottom });
+            }
+            edgeIndexKey = key;
+        }
+        const edges = [];
+        const lastBlock = Math.min(edgeIndex.length - 1, Math.floor(lastRow / edgeIndexBlockRows));
+        for (let blockIndex = 0; blockIndex <= lastBlock; blockIndex++) {
+            const block = edgeIndex[blockIndex];
+            if (!block || block.bottom < firstRow) continue;
+            for (const { edge, top, bottom } of block.entries) {
+                if (top <= lastRow && bottom >= firstRow) edges.push(edge);
+            }
+        }
+        return edges;
+    };
+
+    // Computes the range of rows and timeline columns currently inside the viewport.
+    const getVisibleWindow = () => {
+        const lastRowIndex = taskStore.size - 1;
+        const lastColumnIndex = chartLayout.headers.length - 1;
+        if (!isWindowingEnabled) return { firstRow: 0, lastRow: lastRowIndex, firstCol: 0, lastCol: lastColumnIndex };
+        const { scrollTop, scrollLeft, clientHeight, clientWidth } = ganttChartContainerEl;
+        const timelineViewWidth = Math.max(0, clientWidth - chartLayout.frozenWidth);
+        return {
+            firstRow: Math.max(0, Math.floor(scrollTop / taskRowHeight) - 1),
+            lastRow: Math.min(lastRowIndex, Math.ceil((scrollTop + clientHeight) / taskRowHeight)),
+            firstCol: Math.max(0, Math.floor(scrollLeft / chartLayout.headerColumnWidth)),
+            lastCol: Math.min(lastColumnIndex, Math.ceil((scrollLeft + timelineViewWidth) / chartLayout.headerColumnWidth))
+        };
+    };
+
+    // Re-fills the rendered window when the visible range has moved outside of it (or when forced).
+    const renderVisibleWindow = (force = false) => {
+        if (!chartLayout || (isDragging && !force)) return;
+        const visible = getVisibleWindow();
+        const rowsCovered = renderedWindow && visible.firstRow >= renderedWindow.firstRow && visible.lastRow <= renderedWindow.lastRow;
+        const columnsCovered = renderedWindow && visible.firstCol >= renderedWindow.firstCol && visible.lastCol <= renderedWindow.lastCol;
+        if (!force && rowsCovered && columnsCovered) return;
+
+        const nextWindow = { ...renderedWindow };
+        if (force || !columnsCovered) {
+            nextWindow.firstCol = Math.max(0, visible.firstCol - overscanColumns);
+            nextWindow.lastCol = Math.min(chartLayout.headers.length - 1, visible.lastCol + overscanColumns);
+            renderTimelineHeaderCells(nextWindow.firstCol, nextWindow.lastCol);
+        }
+        if (force || !rowsCovered) {
+            nextWindow.firstRow = Math.max(0, visible.firstRow - overscanRows);
+            nextWindow.lastRow = Math.min(taskStore.size - 1, visible.lastRow + overscanRows);
+            reconcileTaskRows(nextWindow.firstRow, nextWindow.lastRow);
+        }
+        renderedWindow = nextWindow;
+        refreshDependencyArrows();
+    };
+
+    const scheduleWindowUpdate = () => {
+        if (windowUpdateFrame) return;
+        windowUpdateFrame = requestAnimationFrame(() => {
+            windowUpdateFrame = null;
+            renderVisibleWindow();
+        });
+    };
+
+    const renderTimelineHeaderCells = (firstCol, lastCol) => {
+        const fragment = document.createDocumentFragment();
+        for (let i = firstCol; i <= lastCol; i++) {
+            const h = chartLayout.headers[i];
+            const cell = document.createElement('div');
+            cell.className = `sticky top-0 z-10 text-center border-b border-l border-gray-200 text-xs text-gray-500 ${h.isWeekend ? 'bg-gray-200/50' : 'bg-gray-100/50'}`;
+            cell.style.cssText = `grid-row: 1; grid-column: ${i+5}; height:${taskRowHeight}px; display:flex; flex-direction:column; justify-content:center;`;
+            cell.innerHTML = `${h.subLabel ? `<div class="text-gray-700 font-medium">${h.subLabel}</div>` : ''}<div>${h.label}</div>`;
+            fragment.appendChild(cell);
+        }
+        timelineHeaderLayerEl.replaceChildren(fragment);
+    };
+
+    // Creates the five cells of a task row. Their content is filled in by patchTaskRowNode.
+    const createTaskRowNode = (task) => {
+        const createDataCell = (col, stickyLeft) => {
+            const cell = document.createElement('div');
+            cell.className = 'sticky bg-white px-3 py-2.5 border-b border-r border-gray-200 text-sm truncate';
+            cell.style.cssText = `grid-column: ${col}; left: ${stickyLeft};`;
+            return cell;
+        };
+        const groupCell = createDataCell('1', '0px');
+        const nameCell = createDataCell('2', 'var(--group-width)');
+        nameCell.classList.add('hover:bg-gray-50', 'cursor-pointer');
+        nameCell.dataset.editTaskId = task.id;
+        const startCell = createDataCell('3', 'calc(var(--group-width) + var(--task-name-width))');
+        const depsCell = createDataCell('4', 'calc(var(--group-width) + var(--task-name-width) + var(--start-date-width))');
+        const node = {
+            cells: [groupCell, nameCell, startCell, depsCell],
+            groupCell, nameCell, startCell, depsCell, barWrapper: null,
+            rowIndex: -1, signature: null, geometryKey: null
+        };
+        if (timelineCanvasEl) return node; // Bars are painted on the canvas
+
+        const timelineCell = document.createElement('div');
+        timelineCell.className = 'relative border-b border-gray-200 task-row-timeline';
+        timelineCell.style.gridColumn = '5 / -1';
+        const barWrapper = document.createElement('div');
+        barWrapper.className = 'gantt-bar-wrapper';
+        barWrapper.dataset.taskBarId = task.id;
+        barWrapper.style.cssText = 'position: absolute; top:0; height: 100%';
+        timelineCell.appendChild(barWrapper);
+        node.cells.push(timelineCell);
+        node.barWrapper = barWrapper;
+        return node;
+    };
+
+    const getTaskColor = (task) => task.color || chartLayout.groupColors[task.group] || '#79D3C9';
+
+    const patchTaskRowNode = (node, task) => {
+        node.groupCell.textContent = task.group || '';
+        node.nameCell.textContent = task.name;
+        node.nameCell.title = `Click to edit task: "${task.name}"`;
+        node.startCell.textContent = task.start || '';
+        node.depsCell.textContent = task.dependencies || '';
+        const isCyclic = cyclicTaskIds.has(task.id);
+        node.depsCell.classList.toggle('text-red-600', isCyclic);
+        node.depsCell.classList.toggle('font-semibold', isCyclic);
+        node.depsCell.title = isCyclic ? 'Part of a dependency cycle' : '';
+        if (!node.barWrapper) return;
+        const barDurationDays = taskStore.durationDays(task);
+        const barColor = getTaskColor(task);
+        node.barWrapper.innerHTML = `<div class="absolute top-1/2 -translate-y-1/2 left-0 w-full h-3/5 rounded-md gantt-bar-bg shadow-sm" style="background-color: ${barColor}40;"><div class="h-full rounded-md gantt-bar-progress" style="width: ${task.progress}%; background-color: ${barColor};"></div></div><div class="gantt-tooltip absolute bottom-full mb-2 w-max max-w-xs p-3 rounded-lg shadow-lg text-sm z-30" style="background-color: #006152; color: white;"><div class="font-bold">#${task.id}: ${task.name}</div><div>${task.start} to ${task.end}</div><div>Duration: ${barDurationDays + 1} days</div><div>Progress: <span class="font-semibold">${task.progress}%</span></div></div><div class="gantt-bar-handle left rounded-l-md" data-handle-type="resize-left"></div><div class="gantt-bar-handle right rounded-r-md" data-handle-type="resize-right"></div>`;
+    };
+
+    // Keyed reconciliation of the rows in [firstRow, lastRow]: rows are matched to existing
+    // nodes by task id, moved by updating their grid row, patched only when their data
+    // changed, and removed once they leave the window or the task is deleted.
+    const reconcileTaskRows = (firstRow, lastRow) => {
+        const fragment = document.createDocumentFragment();
+        const windowIds = new Set();
+        for (let taskIndex = firstRow; taskIndex <= lastRow; taskIndex++) {
+            const task = taskStore.at(taskIndex);
+            windowIds.add(task.id);
+            let node = rowNodesById.get(task.id);
+            if (!node) {
+                node = createTaskRowNode(task);
+                rowNodesById.set(task.id, node);
+                fragment.append(...node.cells);
+            }
+            if (node.rowIndex !== taskIndex) {
+                node.cells.forEach(cell => { cell.style.gridRow = taskIndex + 2; });
+                node.rowIndex = taskIndex;
+            }
+            const signature = JSON.stringify([task.name, task.group, task.start, task.end, task.progress, task.dependencies, task.color, chartLayout.groupColors[task.group], cyclicTaskIds.has(task.id)]);
+            if (node.signature !== signature) {
+                patchTaskRowNode(node, task);
+                node.signature = signature;
+            }
+            if (!node.barWrapper) continue;
+            const { left, width } = getBarGeometry(task.id);
+            const geometryKey = `${left}:${width}`;
+            if (node.geometryKey !== geometryKey) {
+                node.barWrapper.style.left = `${left}px`;
+                node.barWrapper.style.width = `${width}px`;
+                node.geometryKey = geometryKey;
+            }
+        }
+        rowNodesById.forEach((node, taskId) => {
+            if (windowIds.has(taskId)) return;
+            node.cells.forEach(cell => cell.remove());
+            rowNodesById.delete(taskId);
+        });
+        taskRowsLayerEl.appendChild(fragment);
+    };
+
+    // --- CANVAS TIMELINE ---
+    // Optional renderer that paints weekend shading, row lines, bars and dependency arrows onto
+    // a viewport-sized canvas instead of creating DOM nodes per bar. The frozen columns stay in
+    // the DOM. The timeline is painted in fixed-size tiles that are cached until the model or
+    // layout changes, so scrolling only copies already painted tiles.
+    const canvasTileSize = 512;
+    const maxCachedCanvasTiles = 64;
+    const canvasTiles = new Map();
+    let canvasDragArrows = null;
+    let canvasViewport = null;
+
+    const invalidateCanvasTiles = () => {
+        canvasTiles.clear();
+    };
+
+    const fillRoundedRect = (ctx, x, y, width, height, radius) => {
+        ctx.beginPath();
+        if (ctx.roundRect) ctx.roundRect(x, y, width, height, Math.min(radius, width / 2));
+        else ctx.rect(x, y, width, height);
+        ctx.fill();
+    };
+
+    const paintCanvasBar = (ctx, task, minX, maxX) => {
+        const { rowIndex, left, width } = getBarGeometry(task.id);
+        if (left > maxX || left + width < minX) return;
+        const color = getTaskColor(task);
+        const barHeight = taskRowHeight * 0.6;
+        const top = rowIndex * taskRowHeight + (taskRowHeight - barHeight) / 2;
+        ctx.fillStyle = `${color}40`;
+        fillRoundedRect(ctx, left, top, width, barHeight, 6);
+        if (task.progress > 0) {
+            ctx.fillStyle = color;
+            fillRoundedRect(ctx, left, top, width * Math.min(task.progress, 100) / 100, barHeight, 6);
+        }
+    };
+
+    const paintCanvasArrow = (ctx, { parentId, childId }, minX, maxX) => {
+        const parent = getBarGeometry(parentId);
+        const child = getBarGeometry(childId);
+        const startX = parent.left + parent.width;
+        const endX = child.left;
+        const neckX = startX + 15;
+        if (Math.max(neckX, endX) < minX || Math.min(startX, endX) > maxX) return;
+        const startY = (parent.rowIndex + 0.5) * taskRowHeight;
+        const endY = (child.rowIndex + 0.5) * taskRowHeight;
+        const color = endX < startX ? '#DC2626' : '#006152';
+        const direction = endX >= neckX ? 1 : -1;
+        ctx.globalAlpha = 0.8;
+        ctx.strokeStyle = color;
+        ctx.fillStyle = color;
+        ctx.lineWidth = 1.5;
+        ctx.beginPath();
+        ctx.moveTo(startX, startY);
+        ctx.lineTo(neckX, startY);
+        ctx.lineTo(neckX, endY);
+        ctx.lineTo(endX, endY);
+        ctx.stroke();
+        ctx.beginPath();
+        ctx.moveTo(endX, endY);
+        ctx.lineTo(endX - 7 * direction, endY - 4);
+        ctx.lineTo(endX - 7 * direction, endY + 4);
+        ctx.closePath();
+        ctx.fill();
+        ctx.globalAlpha = 1;
+    };
+
+    const isDraggedArrow = ({ parentId, childId }) => isDragging && (parentId === currentTaskId || childId === currentTaskId);
+
+    // Paints one tile in timeline coordinates. The bar being dragged (and its arrows) is left out
+    // and drawn on top of the tiles by paintTimelineCanvas instead.
+    const paintCanvasTile = (tileX, tileY) => {
+        const dpr = window.devicePixelRatio || 1;
+        const tile = document.createElement('canvas');
+        tile.width = tile.height = Math.ceil(canvasTileSize * dpr);
+        const ctx = tile.getContext('2d');
+        const minX = tileX * canvasTileSize, minY = tileY * canvasTileSize;
+        const maxX = minX + canvasTileSize, maxY = minY + canvasTileSize;
+        ctx.setTransform(dpr, 0, 0, dpr, -minX * dpr, -minY * dpr);
+        ctx.fillStyle = '#ffffff';
+        ctx.fillRect(minX, minY, canvasTileSize, canvasTileSize);
+
+        const { headers, headerColumnWidth } = chartLayout;
+        ctx.fillStyle = 'rgba(229, 231, 235, 0.4)';
+        const lastCol = Math.min(headers.length - 1, Math.floor(maxX / headerColumnWidth));
+        for (let col = Math.floor(minX / headerColumnWidth); col <= lastCol; col++) {
+            if (headers[col].isWeekend) ctx.fillRect(col * headerColumnWidth, minY, headerColumnWidth, canvasTileSize);
+        }
+
+        const firstRow = Math.floor(minY / taskRowHeight);
+        const lastRow = Math.min(taskStore.size - 1, Math.floor(maxY / taskRowHeight));
+        ctx.fillStyle = '#e5e7eb';
+        for (let row = firstRow; row <= lastRow; row++) {
+            ctx.fillRect(minX, (row + 1) * taskRowHeight - 1, canvasTileSize, 1);
+        }
+        for (let row = firstRow; row <= lastRow; row++) {
+            const task = taskStore.at(row);
+            if (isDragging && task.id === currentTaskId) continue;
+            paintCanvasBar(ctx, task, minX, maxX);
+        }
+
+        getEdgesInRows(firstRow, lastRow).forEach(arrow => {
+            if (!isDraggedArrow(arrow)) paintCanvasArrow(ctx, arrow, minX, maxX);
+        });
+        return tile;
+    };
+
+    const getCanvasTile = (tileX, tileY) => {
+        const key = `${tileX}:${tileY}`;
+        let tile = canvasTiles.get(key);
+        if (tile) {
+            canvasTiles.delete(key); // Re-insert to keep the map in least-recently-used order
+        } else {
+            tile = paintCanvasTile(tileX, tileY);
+            if (canvasTiles.size >= maxCachedCanvasTiles) canvasTiles.delete(canvasTiles.keys().next().value);
+        }
+        canvasTiles.set(key, tile);
+        return tile;
+    };
+
+    // Sizes the sticky canvas to the visible timeline area and composes it from cached tiles.
+    const paintTimelineCanvas = () => {
+        if (!timelineCanvasEl || !chartLayout) return;
+        const timelineWidth = chartLayout.headerColumnWidth * chartLayout.headers.length;
+        const timelineHeight = taskStore.size * taskRowHeight;
+        const { scrollLeft, scrollTop, clientWidth, clientHeight } = ganttChartContainerEl;
+        const viewWidth = Math.max(0, Math.min(clientWidth - chartLayout.frozenWidth, timelineWidth));
+        const viewHeight = Math.max(0, Math.min(clientHeight - taskRowHeight, timelineHeight));
+        const dpr = window.devicePixelRatio || 1;
+        if (timelineCanvasEl.width !== Math.round(viewWidth * dpr) || timelineCanvasEl.height !== Math.round(viewHeight * dpr)) {
+            timelineCanvasEl.width = Math.round(viewWidth * dpr);
+            timelineCanvasEl.height = Math.round(viewHeight * dpr);
+            timelineCanvasEl.style.width = `${viewWidth}px`;
+            timelineCanvasEl.style.height = `${viewHeight}px`;
+        }
+        // The canvas is sticky, so it shows the timeline starting at the current scroll offset.
+        const originX = Math.min(scrollLeft, timelineWidth - viewWidth);
+        const originY = Math.min(scrollTop, timelineHeight - viewHeight);
+        canvasViewport = { originX, originY };
+
+        const ctx = timelineCanvasEl.getContext('2d');
+        ctx.setTransform(dpr, 0, 0, dpr, 0, 0);
+        ctx.clearRect(0, 0, viewWidth, viewHeight);
+        const lastTileX = Math.floor((originX + viewWidth - 1) / canvasTileSize);
+        const lastTileY = Math.floor((originY + viewHeight - 1) / canvasTileSize);
+        for (let tileY = Math.floor(originY / canvasTileSize); tileY <= lastTileY; tileY++) {
+            for (let tileX = Math.floor(originX / canvasTileSize); tileX <= lastTileX; tileX++) {
+                ctx.drawImage(getCanvasTile(tileX, tileY), tileX * canvasTileSize - originX, tileY * canvasTileSize - originY, canvasTileSize, canvasTileSize);
+            }
+        }
+
+        if (isDragging && dragPreview) {
+            const draggedTask = taskStore.get(currentTaskId);
+            if (!canvasDragArrows) canvasDragArrows = getTaskEdges(currentTaskId);
+            ctx.setTransform(dpr, 0, 0, dpr, -originX * dpr, -originY * dpr);
+            canvasDragArrows.forEach(arrow => paintCanvasArrow(ctx, arrow, originX, originX + viewWidth));
+            if (draggedTask) paintCanvasBar(ctx, draggedTask, originX, originX + viewWidth);
+        }
+    };
+
+    // Maps a pointer event on the canvas to the task bar under it and the drag type it starts.
+    const hitTestCanvas = (e) => {
+        if (!canvasViewport) return null;
+        const rect = timelineCanvasEl.getBoundingClientRect();
+        const x = e.clientX - rect.left + canvasViewport.originX;
+        const y = e.clientY - rect.top + canvasViewport.originY;
+        const task = taskStore.at(Math.floor(y / taskRowHeight));
+        if (!task) return null;
+        const { left, width } = getBarGeometry(task.id);
+        const handleWidth = 4;
+        if (x < left - handleWidth || x > left + width + handleWidth) return null;
+        const handleType = x <= left + handleWidth ? 'resize-left' : x >= left + width - handleWidth ? 'resize-right' : 'move';
+        return { task, left, width, handleType };
+    };
+
+    const handleChartPointerHover = (e) => {
+        if (isDragging || e.target !== timelineCanvasEl) return;
+        const hit = hitTestCanvas(e);
+        timelineCanvasEl.style.cursor = !hit ? 'default' : hit.handleType === 'move' ? 'grab' : 'ew-resize';
+        timelineCanvasEl.title = hit ? `#${hit.task.id}: ${hit.task.name}\n${hit.task.start} to ${hit.task.end}\nProgress: ${hit.task.progress}%` : '';
+    };
+
+    // Builds the path data of a set of arrows, leaving out those entirely outside [minX, maxX]
+    // (timeline coordinates). Arrows running backwards in time are kept apart as conflicts.
+    const buildArrowPaths = (edges, minX, maxX) => {
+        const { frozenWidth } = chartLayout;
+        const paths = { lines: '', heads: '', conflictLines: '', conflictHeads: '' };
+        for (const { parentId, childId } of edges) {
+            const parent = getBarGeometry(parentId);
+            const child = getBarGeometry(childId);
+            const startX = parent.left + parent.width;
+            const endX = child.left;
+            const neckX = startX + 15;
+            if (Math.max(neckX, endX) < minX || Math.min(startX, endX) > maxX) continue;
+            const startY = (parent.rowIndex + 1.5) * taskRowHeight;
+            const endY = (child.rowIndex + 1.5) * taskRowHeight;
+            const direction = endX >= neckX ? 1 : -1;
+            const line = `M ${frozenWidth + startX} ${startY} H ${frozenWidth + neckX} V ${endY} H ${frozenWidth + endX} `;
+            const head = `M ${frozenWidth + endX} ${endY} l ${-7 * direction} -4 v 8 z `;
+            if (endX < startX) {
+                paths.conflictLines += line;
+                paths.conflictHeads += head;
+            } else {
+                paths.lines += line;
+                paths.heads += head;
+            }
+        }
+        return paths;
+    };
+
+    const setArrowPaths = (pathEls, paths) => {
+        Object.entries(paths).forEach(([name, d]) => pathEls[name].setAttribute('d', d));
+    };
+
+    // Draws the arrows that cross the rendered window. Arrows share four paths (lines and heads,
+    // normal and conflicting), so a redraw is four attribute writes however many edges there
+    // are. While a bar is dragged its own arrows are drawn into four more paths, so that the
+    // pointer moves only rebuild those (see drawDraggedArrows).
+    const drawDependencyArrows = () => {
+        if (timelineCanvasEl) {
+            dependencyLinesEl.innerHTML = ''; // Arrows are painted on the canvas
+            dependencyPathEls = null;
+            return;
+        }
+        if (!chartLayout || !renderedWindow) return;
+        if (!dependencyPathEls) {
+            dependencyLinesEl.innerHTML = '';
+            const createPaths = () => {
+                const createPath = (attributes) => {
+                    const path = document.createElementNS('http://www.w3.org/2000/svg', 'path');
+                    Object.entries(attributes).forEach(([name, value]) => path.setAttribute(name, value));
+                    dependencyLinesEl.appendChild(path);
+                    return path;
+                };
+                return {
+                    lines: createPath({ stroke: '#006152', fill: 'none', 'stroke-width': '1.5', opacity: '0.8' }),
+                    heads: createPath({ fill: '#006152', opacity: '0.8' }),
+                    conflictLines: createPath({ stroke: '#DC2626', fill: 'none', 'stroke-width': '1.5', opacity: '0.8' }),
+                    conflictHeads: createPath({ fill: '#DC2626', opacity: '0.8' })
+                };
+            };
+            dependencyPathEls = { window: createPaths(), dragged: createPaths() };
+        }
+        dependencyLinesEl.style.width = `${chartLayout.frozenWidth + chartLayout.totalTimelinePixelWidth}px`;
+        dependencyLinesEl.style.height = `${(taskStore.size + 1) * taskRowHeight}px`;
+
+        const { firstRow, lastRow, firstCol, lastCol } = renderedWindow;
+        const { headerColumnWidth } = chartLayout;
+        const edges = getEdgesInRows(firstRow, lastRow).filter(edge => !isDraggedArrow(edge));
+        setArrowPaths(dependencyPathEls.window, buildArrowPaths(edges, firstCol * headerColumnWidth, (lastCol + 1) * headerColumnWidth));
+        drawDraggedArrows();
+    };
+
+    // Redraws only the arrows of the bar being dragged (or clears them when there is none).
+    const drawDraggedArrows = () => {
+        if (!dependencyPathEls) return;
+        const edges = isDragging ? getTaskEdges(currentTaskId) : [];
+        setArrowPaths(dependencyPathEls.dragged, buildArrowPaths(edges, -Infinity, Infinity));
+    };
+
+    // Redraws the arrows if the tasks, the layout or the rendered window changed since they were
+    // last drawn.
+    const refreshDependencyArrows = () => {
+        const key = `${canvasTilesKey}|${JSON.stringify(renderedWindow)}`;
+        if (key === arrowsKey) return;
+        drawDependencyArrows();
+        arrowsKey = key;
+    };
+
+    // --- INITIALIZATION & EVENT LISTENERS ---
+    const handleStartDateChange = (e) => {
+        const taskEndInput = document.getElementById('task-end');
+        const startDate = e.target.value;
+        if (startDate) {
+            taskEndInput.min = startDate;
+            if (taskForm.dataset.duration) {
+                const duration = parseInt(taskForm.dataset.duration, 10);
+                const newEndDate = addDays(parseDate(startDate), duration);
+                taskEndInput.value = formatDateToYYYYMMDD(newEndDate);
+            } else if (!taskEndInput.value || parseDate(taskEndInput.value) < parseDate(startDate)) {
+                taskEndInput.value = startDate;
+            }
+        }
+    };
+
+    document.getElementById('task-start').addEventListener('input', handleStartDateChange);
+    document.getElementById('task-end').addEventListener('input', () => { delete taskForm.dataset.duration; });
+    document.getElementById('task-group').addEventListener('change', updateColorPickerState);
+    document.getElementById('task-progress').addEventListener('input', (e) => { document.getElementById('progress-value').textContent = e.target.value; });
+    projectTitleEl.value = initialState.projectTitle || 'Project Timeline';
+    projectSubtitleEl.value = initialState.projectSubtitle || 'Interactive Gantt Chart';
+    viewModeSelect.value = viewMode;
+    currentDateEl.textContent = new Intl.DateTimeFormat('en-GB', { day: '2-digit', month: '2-digit', year: 'numeric' }).format(new Date());
+    addTaskBtn.addEventListener('click', () => openModal());
+    cancelBtn.addEventListener('click', closeModal);
+    taskForm.addEventListener('submit', saveTask);
+    deleteTaskBtn.addEventListener('click', deleteTask);
+    downloadBtn.addEventListener('click', downloadAsExcel);
+    downloadHtmlBtn.addEventListener('click', downloadAsHtml);
+    downloadCsvBtn.addEventListener('click', downloadAsCsv);
+    clearDataBtn.addEventListener('click', clearState);
+    printBtn.addEventListener('click', () => window.print());
+    fileInput.addEventListener('change', handleFileUpload);
+    viewModeSelect.addEventListener('change', (e) => { viewMode = e.target.value; saveState(); renderGanttChart(); });
+    timelineRendererSelect.value = timelineRenderer;
+    timelineRendererSelect.addEventListener('change', (e) => { setTimelineRenderer(e.target.value); saveState(); });
+    manageGroupsBtn.addEventListener('click', openGroupModal);
+    closeGroupModalBtn.addEventListener('click', closeGroupModal);
+    addGroupForm.addEventListener('submit', addGroup);
+    projectTitleEl.addEventListener('change', saveState);
+    projectSubtitleEl.addEventListener('change', saveState);
+    window.addEventListener('resize', renderGanttChart);
+    ganttChartEl.addEventListener('pointerdown', handleChartPointerDown);
+    ganttChartEl.addEventListener('click', handleChartClick);
+    ganttChartEl.addEventListener('contextmenu', handleChartContextMenu);
+    ganttChartEl.addEventListener('pointermove', handleChartPointerHover);
+    document.addEventListener('pointermove', handleDragMove);
+    document.addEventListener('pointerup', handleDragEnd);
+    ganttChartContainerEl.addEventListener('scroll', scheduleWindowUpdate);
+    ganttChartContainerEl.addEventListener('scroll', paintTimelineCanvas);
+    window.addEventListener('beforeunload', flushPendingSave);
+    document.addEventListener('visibilitychange', () => {
+        if (document.visibilityState === 'hidden') flushPendingSave();
+    });
+    // Printing needs every row in the DOM, not just the on-screen window, and DOM bars
+    // rather than the viewport-sized canvas.
+    let rendererBeforePrint = null;
+    window.addEventListener('beforeprint', () => {
+        isWindowingEnabled = false;
+        if (timelineRenderer === 'canvas') {
+            rendererBeforePrint = timelineRenderer;
+            setTimelineRenderer('dom');
+        } else {
+            renderVisibleWindow(true);
+        }
+    });
+    window.addEventListener('afterprint', () => {
+        isWindowingEnabled = true;
+        if (rendererBeforePrint) {
+            setTimelineRenderer(rendererBeforePrint);
+            rendererBeforePrint = null;
+        } else {
+            renderVisibleWindow(true);
+        }
+    });
+
+    // Initial render of the chart
+    refreshDependencyCycles(true);
+    markFieldsSynced();
+    renderGanttChart();
+
+    // The rendering and scheduling entry points are returned too, for benchmarks/chart_benchmark.js.
+    return { receiveState, getState, renderGanttChart, drawDependencyArrows, getDependencyUpdatePlan };
+};
+
+// --- SHEETJS ---
+// SheetJS is only needed to import or export workbooks, so it is loaded on first use: from the
+// copy that build_frontend_assets.py puts in vendor/, or from the CDN when there is none (as for an
+// exported page opened on its own).
+const sheetJsUrls = () => [
+    new URL('vendor/xlsx.full.min.js', document.baseURI).href,
+    'https://cdnjs.cloudflare.com/ajax/libs/xlsx/0.18.5/xlsx.full.min.js'
+];
+
+const loadScript = (url) => new Promise((resolve, reject) => {
+    const script = document.createElement('script');
+    script.src = url;
+    script.onload = resolve;
+    script.onerror = () => {
+        script.remove();
+        reject(new Error(`Could not load ${url}`));
+    };
+    document.head.appendChild(script);
+});
+
+let sheetJsLoading = null;
+const loadSheetJs = () => {
+    if (window.XLSX) return Promise.resolve(window.XLSX);
+    if (!sheetJsLoading) {
+        sheetJsLoading = sheetJsUrls()
+            .reduce((loaded, url) => loaded.catch(() => loadScript(url)), Promise.reject(new Error()))
+            .then(() => window.XLSX, () => {
+                sheetJsLoading = null;
+                throw new Error('Excel support is unavailable: SheetJS could not be loaded.');
+            });
+    }
+    return sheetJsLoading;
+};
+
+// --- WIRE FORMAT ---
+// Task lists travel between Python and the chart as columns rather than one object per task: ids,
+// names, start/end epoch days (with the text of unreadable dates alongside), progress, interned
+// groups and colours, and the dependencies in CSR form (see gantt_core/serialization.py for the
+// layout). Large ones are gzipped and sent as base64 as well.
+const wireFormat = 'gantt-columns';
+const wireVersion = 1;
+const wireCompressThreshold = 32 * 1024;
+
+const isWireTasks = (tasks) => !!tasks && !Array.isArray(tasks) && tasks.format === wireFormat;
+
+const streamText = (stream) => new Response(stream).text();
+const bytesToBase64 = (bytes) => {
+    let binary = '';
+    for (let i = 0; i < bytes.length; i += 0x8000) binary += String.fromCharCode(...bytes.subarray(i, i + 0x8000));
+    return btoa(binary);
+};
+
+// Resolves to the plain wire columns of a task list, unpacking a gzipped one.
+const inflateWireTasks = async (tasks) => {
+    if (!isWireTasks(tasks) || tasks.encoding !== 'gzip+base64') return tasks;
+    const bytes = Uint8Array.from(atob(tasks.payload), c => c.charCodeAt(0));
+    return JSON.parse(await streamText(new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'))));
+};
+
+// Reads a project sent from Python: gzipped JSON bytes, with the task list in wire columns.
+const readProjectPayload = async (data) => {
+    const project = data instanceof Uint8Array
+        ? JSON.parse(await streamText(new Blob([data]).stream().pipeThrough(new DecompressionStream('gzip'))))
+        : data;
+    return { ...project, tasks: await inflateWireTasks(project.tasks) };
+};
+
+// Gzips the wire columns of a task list when they are large and the browser can compress.
+const deflateWireTasks = async (tasks) => {
+    if (!isWireTasks(tasks) || typeof CompressionStream === 'undefined') return tasks;
+    const text = JSON.stringify(tasks);
+    if (text.length <= wireCompressThreshold) return tasks;
+    const compressed = await new Response(new Blob([text]).stream().pipeThrough(new CompressionStream('gzip'))).arrayBuffer();
+    return { format: wireFormat, version: wireVersion, encoding: 'gzip+base64', payload: bytesToBase64(new Uint8Array(compressed)) };
+};
+
+// --- BOOTSTRAP ---
+// Inside Streamlit the chart starts on the first render message. An exported page embeds its state
+// and starts immediately.
+//
+// Edits travel to Python as patch operations, each stamped with the next revision number. Python
+// reports the last revision it applied in every render; until then an operation stays in the
+// outbox and is resent with later ones, so an update Streamlit coalesces away is never lost.
+// When Python sees a gap in the revisions it asks for a resync and gets the whole project back as
+// one replace-project operation. A new data version means Python replaced the project itself.
+//
+// Python sends the project only until the chart reports the version it loaded, so renders that
+// change nothing carry no data. A chart started without data (its frame was reloaded while Python
+// thought it had the project) reports that it has none and is sent the project again.
+//
+// Unpacking and compressing task lists is asynchronous, so renders and outgoing operations are
+// handled one after another on a single queue; this keeps revisions in order.
+if (window.ganttStandaloneState) {
+    initGanttChart(window.ganttStandaloneState);
+} else {
+    let chart = null;
+    let dataVersion = null;
+    let revision = 0;
+    let outbox = [];
+    let queue = Promise.resolve();
+    const enqueue = (job) => {
+        queue = queue.then(job).catch(error => console.error('Gantt chart message failed', error));
+    };
+    const sendOps = (ops) => enqueue(async () => {
+        for (const op of ops) {
+            if (op.op === 'replace-tasks') op.tasks = await deflateWireTasks(op.tasks);
+            if (op.op === 'replace-project') op.data = { ...op.data, tasks: await deflateWireTasks(op.data.tasks) };
+            op.revision = ++revision;
+            outbox.push(op);
+        }
+        Streamlit.setComponentValue({ type: 'GANTT_CHART_PATCH', version: dataVersion, ops: outbox });
+    });
+    Streamlit.events.addEventListener(Streamlit.RENDER_EVENT, (event) => enqueue(async () => {
+        const { data, version, revision: appliedRevision, resync, height } = event.detail.args;
+        if (!chart || version !== dataVersion) {
+            if (!data) {
+                if (!chart) Streamlit.setComponentValue({ type: 'GANTT_CHART_LOADED', version: null });
+                return;
+            }
+            const state = await readProjectPayload(data);
+            dataVersion = version;
+            revision = appliedRevision;
+            outbox = [];
+            if (chart) {
+                chart.receiveState(state);
+            } else {
+                chart = initGanttChart(state, { onChange: sendOps });
+                Streamlit.setFrameHeight(height);
+            }
+            Streamlit.setComponentValue({ type: 'GANTT_CHART_LOADED', version });
+            return;
+        }
+        outbox = outbox.filter(op => op.revision > appliedRevision);
+        if (resync && !outbox.some(op => op.op === 'replace-project')) {
+            sendOps([{ op: 'replace-project', data: chart.getState() }]);
+        }
+    }));
+    Streamlit.setComponentReady();
+}
@@ -0,0 +1,23 @@
+// Minimal implementation of the Streamlit custom component protocol: the part of
+// streamlit-component-lib this frontend uses, so the component needs no JS build step.
+(() => {
+    const RENDER_EVENT = 'streamlit:render';
+    const events = new EventTarget();
+
+    const sendMessage = (type, data) => {
+        window.parent.postMessage({ isStreamlitMessage: true, type, ...data }, '*');
+    };
+
+    window.addEventListener('message', (event) => {
+        if (event.data?.type !== RENDER_EVENT) return;
+        events.dispatchEvent(new CustomEvent(RENDER_EVENT, { detail: event.data }));
+    });
+
+    window.Streamlit = {
+        RENDER_EVENT,
+        events,
+        setComponentReady: () => sendMessage('streamlit:componentReady', { apiVersion: 1 }),
+        setFrameHeight: (height) => sendMessage('streamlit:setFrameHeight', { height }),
+        setComponentValue: (value) => sendMessage('streamlit:setComponentValue', { value, dataType: 'json' })
+    };
+})();
@@ -0,0 +1,63 @@
+"""The Gantt chart component and the process-wide resources behind the app.
+
+Streamlit executes gantt.py again on every rerun. What is defined here is imported once per
+process instead: the component declaration, the project store and cache, and the sample project.
+A rerun then only looks these up. The data handling itself is in gantt_core, which does not
+depend on Streamlit.
+
+The chart is a bidirectional custom component. Its static frontend (HTML, CSS and JS) is served
+from the frontend/ directory and loaded once. The project travels as a component argument, and
+edits come back as revisioned patch operations through the component's value. Whole task lists
+travel in both directions in the columnar encoding from gantt_core/serialization.py.
+"""
+import os
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from gantt_core.cache import DEFAULT_MAX_TASKS, ProjectCache
+from gantt_core.model import sample_project
+from gantt_core.store import ProjectStore
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+FRONTEND_DIR = os.path.join(APP_DIR, "frontend")
+DEFAULT_DATABASE = os.path.join(APP_DIR, "gantt_projects.db")
+GANTT_COMPONENT_KEY = "gantt_chart"
+_gantt_chart = components.declare_component("gantt_chart", path=FRONTEND_DIR)
+
+
+# Projects are saved in a SQLite database shared by every session of the server process; the
+# GANTT_DATABASE environment variable points it elsewhere.
+@st.cache_resource
+def get_project_store():
+    return ProjectStore(os.environ.get('GANTT_DATABASE', DEFAULT_DATABASE))
+
+
+# Sessions with the same project open at the same store revision share one model of it, and with
+# it the parsed data, the chart's payload and the schedule. GANTT_CACHE_TASKS bounds the tasks it
+# holds.
+@st.cache_resource
+def get_project_cache():
+    return ProjectCache(int(os.environ.get('GANTT_CACHE_TASKS', DEFAULT_MAX_TASKS)))
+
+
+# Built once per process; project data is never changed in place, so every session can share it.
+get_sample_project = st.cache_resource(sample_project)
+
+
+def gantt_chart(model, version, revision, resync, send_data, height=800):
+    """Renders the chart for a ProjectModel.
+
+    The model's payload is sent only when ``send_data`` is set, as bytes built once per model.
+    The fixed key keeps the same frontend instance mounted across reruns, so changed arguments
+    reach it as render messages instead of reloading the iframe.
+    """
+    return _gantt_chart(
+        data=model.payload if send_data else None,
+        version=version,
+        revision=revision,
+        resync=resync,
+        height=height,
+        key=GANTT_COMPONENT_KEY,
+        default=None,
+    )
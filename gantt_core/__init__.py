@@ -0,0 +1,66 @@
+"""The Gantt chart's project model, scheduling, file formats, serialization and storage.
+
+Nothing here depends on Streamlit, so batch jobs, tools and benchmarks can use it directly::
+
+    from gantt_core import read_project, compute_schedule
+
+    project = read_project('plan.xlsx')
+    schedule = compute_schedule(project['tasks'])
+
+Importing the package is cheap: each name below is loaded from its module on first use, and
+heavy dependencies are only imported when needed (NumPy by scheduling, pyarrow and openpyxl by
+the file formats that use them).
+
+    model          the project dictionary, dates and dependency strings, the sample project
+    patches        the chart's patch operations
+    scheduling     critical path analysis, dependency cycles and rescheduling
+    validation     problems the chart would trip over
+    serialization  the columnar wire encoding used between Python and the chart
+    io             xlsx, CSV, Parquet and Arrow files
+    store          SQLite storage
+    cache          shared, lazily derived project models
+    synthetic      seeded plans of any size and shape, for benchmarks (see benchmarks/)
+
+``python -m gantt_core`` validates, reschedules, converts and summarizes many files at once (see
+cli.py).
+"""
+import importlib
+
+_EXPORTS = {
+    'model': (
+        'EMPTY_PROJECT', 'EPOCH_ORDINAL', 'MAX_TASK_ID', 'MIN_TASK_ID', 'format_epoch_day', 'parse_dependency_ids',
+        'parse_epoch_day', 'sample_project',
+    ),
+    'patches': ('PROJECT_FIELDS', 'VIEW_FIELDS', 'apply_gantt_ops', 'read_patch'),
+    'scheduling': (
+        'DependencyGraph', 'Schedule', 'build_dependency_graph', 'compute_schedule', 'find_dependency_cycles',
+        'reschedule_tasks', 'topological_levels',
+    ),
+    'validation': ('validate_project',),
+    'serialization': ('decode_tasks', 'encode_project', 'encode_project_payload', 'encode_tasks', 'is_encoded_tasks'),
+    'io': (
+        'READERS', 'WRITERS', 'file_format', 'read_arrow', 'read_csv', 'read_parquet', 'read_project',
+        'read_workbook', 'write_arrow', 'write_csv', 'write_parquet', 'write_project', 'write_workbook',
+    ),
+    'store': ('ProjectStore',),
+    'cache': ('DEFAULT_MAX_TASKS', 'ProjectCache', 'ProjectModel'),
+    'synthetic': ('generate_project',),
+}
+_MODULE_OF = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted(_MODULE_OF)
+
+
+def __getattr__(name):
+    if name in _MODULE_OF:
+        value = getattr(importlib.import_module(f'.{_MODULE_OF[name]}', __name__), name)
+    elif name in _EXPORTS:
+        value = importlib.import_module(f'.{name}', __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_MODULE_OF) | set(_EXPORTS))
@@ -0,0 +1,117 @@
+"""A process-wide cache of projects and the values derived from them.
+
+Sessions that open the same project at the same revision share one ``ProjectModel``: the data
+is read from the store once, and its payload for the chart, dependency graph, schedule and
+cycles are each worked out once, on first use. The cache is a least-recently-used map from
+``(project name, revision)`` to models, bounded by the total number of tasks it holds.
+
+A model's data must not be changed once it is built. Edits make a new dictionary (see
+``patches.apply_gantt_ops``) and a new model; task dictionaries are replaced rather than
+changed, so the two may share them.
+"""
+import threading
+from collections import OrderedDict
+from functools import cached_property
+
+from .serialization import encode_project_payload
+
+# Enough for a few dozen large plans; a model costs a few hundred bytes per task.
+DEFAULT_MAX_TASKS = 1_000_000
+
+
+class ProjectModel:
+    """A project's data with the values derived from it computed on first use."""
+
+    def __init__(self, data):
+        self.data = data
+
+    @property
+    def weight(self):
+        return len(self.data.get('tasks') or []) + 1
+
+    @cached_property
+    def payload(self):
+        """The data as the chart receives it: gzipped JSON with the tasks in wire columns."""
+        return encode_project_payload(self.data)
+
+    # NumPy is only imported once a schedule is asked for.
+    @cached_property
+    def graph(self):
+        from .scheduling import build_dependency_graph
+
+        return build_dependency_graph(self.data['tasks'])
+
+    @cached_property
+    def schedule(self):
+        from .scheduling import compute_schedule
+
+        return compute_schedule(self.data['tasks'], self.graph)
+
+    @cached_property
+    def cycles(self):
+        from .scheduling import find_dependency_cycles
+
+        return find_dependency_cycles(self.data['tasks'], self.graph)
+
+
+class ProjectCache:
+    """A thread-safe LRU map of models, holding at most ``max_tasks`` tasks in all.
+
+    The most recently used model is kept even if it alone is over the limit.
+    """
+
+    def __init__(self, max_tasks=DEFAULT_MAX_TASKS):
+        self.max_tasks = max_tasks
+        self._models = OrderedDict()
+        self._tasks = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            model = self._models.get(key)
+            if model is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._models.move_to_end(key)
+            return model
+
+    def put(self, key, model):
+        """Caches ``model`` under ``(name, revision)``, dropping older revisions of the project.
+
+        A model older than a cached revision of its project (a session that read the store just
+        before another saved) is returned without being cached.
+        """
+        name, revision = key
+        with self._lock:
+            revisions = [other for other in self._models if other[0] == name]
+            if any(other[1] > revision for other in revisions):
+                return model
+            for stale in revisions:
+                self._tasks -= self._models.pop(stale).weight
+            self._models[key] = model
+            self._tasks += model.weight
+            while self._tasks > self.max_tasks and len(self._models) > 1:
+                _, evicted = self._models.popitem(last=False)
+                self._tasks -= evicted.weight
+                self.evictions += 1
+        return model
+
+    def load(self, key, build):
+        """Returns the cached model for ``key``, or caches and returns ``build()``."""
+        model = self.get(key)
+        return model if model is not None else self.put(key, build())
+
+    def discard(self, name):
+        """Drops every revision of a project."""
+        with self._lock:
+            for key in [key for key in self._models if key[0] == name]:
+                self._tasks -= self._models.pop(key).weight
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'projects': len(self._models), 'tasks': self._tasks,
+            }
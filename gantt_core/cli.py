@@ -0,0 +1,248 @@
+"""Processes many project files from the command line, without the app.
+
+    python -m gantt_core validate exports/                       # report problems, exit 1 if any
+    python -m gantt_core reschedule exports/ -o fixed/            # cascade dependencies, write copies
+    python -m gantt_core reschedule plan.xlsx --in-place
+    python -m gantt_core convert exports/ --to parquet -o parquet/
+    python -m gantt_core summarize exports/ --json > portfolio.jsonl
+
+Files are any format gantt_core.io reads (xlsx, csv, parquet, arrow, feather); directories are
+searched recursively for them. Each file is handled by itself in a pool of worker processes, one
+per CPU unless --jobs says otherwise. A worker is replaced after --files-per-worker files, so
+memory a large plan leaves behind is given back, and --memory-limit caps each worker's heap
+(RLIMIT_DATA; pyarrow reserves a few hundred MB of it up front). A file that cannot be read or
+does not fit in the limit is reported, and the rest carry on. Results are printed in the order
+the files were given. reschedule --in-place leaves a file alone when no task moves, and refuses
+a file from which rows were dropped on reading (see gantt_core.io), as writing it back would
+lose them.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+from functools import partial
+
+from .io import READERS, file_format, read_project, write_project
+
+DEFAULT_FILES_PER_WORKER = 50
+# Issues listed per file by validate; the count is always given in full.
+MAX_LISTED_ISSUES = 20
+
+
+def find_project_files(paths):
+    """Expands directories into the project files under them, sorted, and keeps files as given."""
+    files = []
+    for path in paths:
+        if not os.path.isdir(path):
+            files.append(path)
+            continue
+        for folder, subfolders, names in os.walk(path):
+            subfolders.sort()
+            files.extend(
+                os.path.join(folder, name) for name in sorted(names)
+                if os.path.splitext(name)[1].lower().lstrip('.') in READERS
+            )
+    return files
+
+
+def output_path(path, output_dir, extension=None):
+    stem, current = os.path.splitext(os.path.basename(path))
+    return os.path.join(output_dir, f"{stem}.{extension or current.lstrip('.')}")
+
+
+def validate_file(path):
+    from .validation import validate_project
+
+    project = read_project(path)
+    issues = validate_project(project)
+    return {'tasks': len(project['tasks']), 'issues': len(issues), 'messages': issues[:MAX_LISTED_ISSUES]}
+
+
+def reschedule_file(path, output_dir=None):
+    """Reschedules one file, writing it to ``output_dir``, or over itself when that is None.
+
+    A file is not written over itself when no task moved, nor when reading it dropped rows, which
+    writing it back would lose.
+    """
+    from .scheduling import build_dependency_graph, find_dependency_cycles, reschedule_tasks
+
+    project = read_project(path)
+    dropped = project.get('droppedRows', 0)
+    if dropped and output_dir is None:
+        return {'error': f"reading it dropped {_count(dropped, 'row')}, which writing it back would lose; "
+                         f"reschedule it to an output directory instead"}
+    graph = build_dependency_graph(project['tasks'])
+    project['tasks'], moved = reschedule_tasks(project['tasks'], graph)
+    target = path if output_dir is None else output_path(path, output_dir)
+    if moved or output_dir is not None:
+        write_project(project, target)
+    else:
+        target = None
+    return {'tasks': len(project['tasks']), 'moved': len(moved), 'dropped': dropped,
+            'cycles': len(find_dependency_cycles(project['tasks'], graph)), 'output': target}
+
+
+def convert_file(path, output_dir, extension):
+    target = output_path(path, output_dir, extension)
+    project = read_project(path)
+    write_project(project, target)
+    return {'tasks': len(project['tasks']), 'dropped': project.get('droppedRows', 0), 'output': target}
+
+
+def summarize_file(path):
+    from .model import format_epoch_day
+    from .scheduling import build_dependency_graph, compute_schedule, find_dependency_cycles
+
+    project = read_project(path)
+    tasks = project['tasks']
+    graph = build_dependency_graph(tasks)
+    schedule = compute_schedule(tasks, graph)
+    starts, ends = graph.start[graph.valid], graph.end[graph.valid]
+    progress = [task.get('progress') or 0 for task in tasks]
+    return {
+        'title': project.get('projectTitle') or '',
+        'tasks': len(tasks),
+        'groups': len({task.get('group') or '' for task in tasks} - {''}),
+        'start': format_epoch_day(starts.min()) if starts.size else None,
+        'end': format_epoch_day(ends.max()) if ends.size else None,
+        'earliest_finish': None if schedule.project_finish is None else format_epoch_day(schedule.project_finish),
+        'critical_tasks': int(schedule.critical.sum()),
+        'cycles': len(find_dependency_cycles(tasks, graph)),
+        'progress': round(sum(progress) / len(progress), 1) if progress else 0,
+    }
+
+
+def _run_one(job, path):
+    """Runs a job on one file, reporting a failure instead of raising it."""
+    try:
+        return {'path': path, **job(path)}
+    except MemoryError:
+        return {'path': path, 'error': 'out of memory'}
+    except Exception as error:
+        return {'path': path, 'error': f"{type(error).__name__}: {error}"}
+
+
+def _limit_memory(megabytes):
+    import resource
+
+    limit = megabytes * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_DATA, (limit, limit))
+
+
+def run_jobs(job, paths, jobs=None, files_per_worker=DEFAULT_FILES_PER_WORKER, memory_limit=None):
+    """Runs ``job(path)`` for each path in a process pool and yields the results in order.
+
+    ``job`` must be picklable: a module-level function, or a partial of one. With ``jobs=1``
+    everything runs in this process.
+    """
+    run = partial(_run_one, job)
+    if jobs == 1:
+        if memory_limit:
+            _limit_memory(memory_limit)
+        yield from map(run, paths)
+        return
+    # Workers are started fresh rather than forked, so they do not inherit this process's memory;
+    # importing gantt_core is cheap, so this costs little. This is multiprocessing.Pool because
+    # ProcessPoolExecutor's max_tasks_per_child can hang when it replaces a worker (Python 3.11).
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(
+        processes=min(jobs or os.cpu_count() or 1, max(len(paths), 1)),
+        initializer=_limit_memory if memory_limit else None,
+        initargs=(memory_limit,) if memory_limit else (),
+        maxtasksperchild=files_per_worker,
+    ) as pool:
+        yield from pool.imap(run, paths)
+
+
+def _count(number, noun):
+    return f"{number:,} {noun}{'' if number == 1 else 's'}"
+
+
+def _dropped(result):
+    return f", {_count(result['dropped'], 'row')} dropped on reading" if result['dropped'] else ''
+
+
+def _print_result(command, result, as_json):
+    if as_json:
+        print(json.dumps(result), flush=True)
+        return
+    path = result['path']
+    if 'error' in result:
+        print(f"{path}: error: {result['error']}", flush=True)
+    elif command == 'validate':
+        print(f"{path}: {_count(result['tasks'], 'task')}, {_count(result['issues'], 'issue') if result['issues'] else 'OK'}")
+        for message in result['messages']:
+            print(f"  {message}")
+        if result['issues'] > len(result['messages']):
+            print(f"  ... and {result['issues'] - len(result['messages']):,} more")
+    elif command == 'reschedule':
+        cycles = f", {_count(result['cycles'], 'dependency cycle')} left as they are" if result['cycles'] else ''
+        output = f" -> {result['output']}" if result['output'] else ', unchanged'
+        print(f"{path}: moved {result['moved']:,} of {_count(result['tasks'], 'task')}{cycles}{_dropped(result)}{output}")
+    elif command == 'convert':
+        print(f"{path}: {_count(result['tasks'], 'task')}{_dropped(result)} -> {result['output']}")
+    else:
+        print(f"{path}: {result['title']!r}, {_count(result['tasks'], 'task')} in {_count(result['groups'], 'group')}, "
+              f"{result['start']} to {result['end']}, earliest finish {result['earliest_finish']}, "
+              f"{result['critical_tasks']:,} critical, {_count(result['cycles'], 'cycle')}, {result['progress']}% done")
+    sys.stdout.flush()
+
+
+def _prepare_output_dir(paths, output_dir, extension=None):
+    """Creates the output directory, refusing to write two inputs to the same file in it or to
+    write over an input (as when it is the input directory and the format stays the same)."""
+    targets = [output_path(path, output_dir, extension) for path in paths]
+    clashes = len(paths) - len(set(targets))
+    if clashes:
+        raise SystemExit(f"error: {clashes} input files would be written to the same output name")
+    inputs = {os.path.realpath(path) for path in paths}
+    overwritten = [target for target in targets if os.path.realpath(target) in inputs]
+    if overwritten:
+        raise SystemExit(f"error: {_count(len(overwritten), 'output file')} would overwrite an input file "
+                         f"({overwritten[0]}); choose another output directory")
+    os.makedirs(output_dir, exist_ok=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m gantt_core', description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('paths', nargs='+', help="project files, or directories to search for them")
+    common.add_argument('-j', '--jobs', type=int, help="worker processes (default: one per CPU; 1 runs in this process)")
+    common.add_argument('--files-per-worker', type=int, default=DEFAULT_FILES_PER_WORKER,
+                        help="files a worker handles before it is replaced (default: %(default)s)")
+    common.add_argument('--memory-limit', type=int, metavar='MB', help="heap limit per worker")
+    common.add_argument('--json', action='store_true', help="print one JSON object per file")
+    commands.add_parser('validate', parents=[common], help="report problems in each file")
+    reschedule = commands.add_parser('reschedule', parents=[common], help="move tasks to after their predecessors")
+    destination = reschedule.add_mutually_exclusive_group(required=True)
+    destination.add_argument('-o', '--output-dir', help="write the rescheduled files here")
+    destination.add_argument('--in-place', action='store_true', help="overwrite the input files")
+    convert = commands.add_parser('convert', parents=[common], help="write each file in another format")
+    convert.add_argument('--to', required=True, choices=sorted(READERS), help="output format")
+    convert.add_argument('-o', '--output-dir', required=True, help="write the converted files here")
+    commands.add_parser('summarize', parents=[common], help="print dates, size and progress of each file")
+    args = parser.parse_args(argv)
+
+    paths = find_project_files(args.paths)
+    for path in paths:
+        try:
+            file_format(path)
+        except ValueError as error:
+            parser.error(str(error))
+    if args.command == 'reschedule':
+        if not args.in_place:
+            _prepare_output_dir(paths, args.output_dir)
+        job = partial(reschedule_file, output_dir=args.output_dir)
+    elif args.command == 'convert':
+        _prepare_output_dir(paths, args.output_dir, args.to)
+        job = partial(convert_file, output_dir=args.output_dir, extension=args.to)
+    else:
+        job = {'validate': validate_file, 'summarize': summarize_file}[args.command]
+    failed = 0
+    for result in run_jobs(job, paths, args.jobs, args.files_per_worker, args.memory_limit):
+        _print_result(args.command, result, args.json)
+        failed += 'error' in result or bool(result.get('issues'))
+    return 1 if failed else 0
+
@@ -0,0 +1,311 @@
+"""Reads and writes projects in the file formats the chart imports and exports.
+
+A workbook has up to three sheets, as written by the chart's downloadAsExcel:
+
+    ProjectInfo   two label/value rows: "Project Title" and "Project Subtitle"
+    Groups        a header row (name, color) and one row per group; left out when there are none
+    Tasks         Group, Task Name, ID, Start Date, End Date, Progress (%), Dependencies, Color
+
+Reading follows the chart's importer: the task sheet is "Tasks" or else the first sheet, columns
+are found by header, and rows without a name, start or end are dropped, as are rows repeating an
+earlier row's ID and rows whose ID or a dependency ID is outside the 32-bit range the chart
+stores. Readers give the number of dropped rows, blank ones aside, as ``droppedRows`` when there
+are any. Dates may be DD/MM/YYYY text or real date cells. Workbooks are streamed row by row
+through openpyxl's read-only reader and xlsxwriter's constant-memory writer, which are imported
+only when a workbook is read or written.
+
+CSV, Parquet and Arrow (Feather) files hold the Tasks sheet alone, with the same columns, and are
+read by the same rules. Parquet and Arrow files also keep the project title, subtitle and groups
+as JSON in the schema metadata under ``gantt.project``. Their date columns may be date or
+timestamp typed as well as text. pyarrow is imported only for those two formats.
+"""
+import csv
+import io
+import json
+import os
+from datetime import date, datetime
+
+from .model import MAX_TASK_ID, MIN_TASK_ID, format_epoch_day, parse_dependency_ids
+
+PROJECT_INFO_SHEET = 'ProjectInfo'
+GROUPS_SHEET = 'Groups'
+TASKS_SHEET = 'Tasks'
+TASK_COLUMNS = ('Group', 'Task Name', 'ID', 'Start Date', 'End Date', 'Progress (%)', 'Dependencies', 'Color')
+# Column widths in characters, as the chart sets them.
+PROJECT_INFO_WIDTHS = (20, 50)
+GROUPS_WIDTHS = (25, 10)
+TASK_WIDTHS = (20, 40, 5, 12, 12, 12, 15, 10)
+ARROW_METADATA_KEY = b'gantt.project'
+
+
+def _cell_text(value):
+    """Formats a cell the way the chart's String() would, with dates as DD/MM/YYYY."""
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, date):
+        return format_epoch_day(value.toordinal() - date(1970, 1, 1).toordinal())
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+def _cell_int(value, default):
+    """Reads a whole number the way the chart's parseInt would, falling back to ``default``."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return int(value)
+    text = _cell_text(value).strip()
+    digits = len(text) - len(text.lstrip('+-'))
+    while digits < len(text) and text[digits].isdigit():
+        digits += 1
+    try:
+        return int(text[:digits])
+    except ValueError:
+        return default
+
+
+def _read_project_info(rows, project):
+    for row in rows:
+        if not row or not row[0] or len(row) < 2 or not row[1]:
+            continue
+        if row[0] == 'Project Title':
+            project.setdefault('projectTitle', _cell_text(row[1]))
+        elif row[0] == 'Project Subtitle':
+            project.setdefault('projectSubtitle', _cell_text(row[1]))
+
+
+def _read_records(rows):
+    """Turns a header row and the rows below it into dictionaries, skipping empty cells and rows."""
+    headers = None
+    for row in rows:
+        if headers is None:
+            headers = [_cell_text(header).strip() for header in row]
+            continue
+        record = {header: value for header, value in zip(headers, row) if header and value not in (None, '')}
+        if record:
+            yield record
+
+
+def _read_tasks(rows, project):
+    """Sets the project's ``tasks`` from a header row and the rows below it."""
+    project['tasks'] = tasks = []
+    headers = next(rows, None)
+    if headers is None:
+        return
+    column = {}
+    for index, header in enumerate(headers):
+        column.setdefault(_cell_text(header).strip(), index)
+
+    def cell(row, header):
+        index = column.get(header)
+        return row[index] if index is not None and index < len(row) else None
+
+    seen_ids = set()
+    dropped = 0
+    for number, row in enumerate(rows, start=1):
+        name = _cell_text(cell(row, 'Task Name'))
+        start = _cell_text(cell(row, 'Start Date'))
+        end = _cell_text(cell(row, 'End Date'))
+        if not (name and start and end):
+            dropped += any(value not in (None, '') for value in row)
+            continue
+        task_id = _cell_int(cell(row, 'ID') or None, number)
+        dependencies = _cell_text(cell(row, 'Dependencies'))
+        if task_id in seen_ids or not all(
+                MIN_TASK_ID <= value <= MAX_TASK_ID for value in [task_id, *parse_dependency_ids(dependencies)]):
+            dropped += 1
+            continue
+        seen_ids.add(task_id)
+        color = cell(row, 'Color')
+        tasks.append({
+            'id': task_id,
+            'name': name,
+            'group': _cell_text(cell(row, 'Group')),
+            'start': start,
+            'end': end,
+            'progress': _cell_int(cell(row, 'Progress (%)'), 0),
+            'dependencies': dependencies,
+            'color': _cell_text(color) if color else None,
+        })
+    if dropped:
+        project['droppedRows'] = dropped
+
+
+def read_workbook(source):
+    """Reads a project from an .xlsx path or binary file object.
+
+    Returns ``projectGroups`` and ``tasks``, plus ``projectTitle`` and ``projectSubtitle`` when
+    the workbook has them.
+    """
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        project = {'projectGroups': []}
+        if PROJECT_INFO_SHEET in workbook.sheetnames:
+            _read_project_info(workbook[PROJECT_INFO_SHEET].iter_rows(values_only=True), project)
+        if GROUPS_SHEET in workbook.sheetnames:
+            project['projectGroups'] = list(_read_records(workbook[GROUPS_SHEET].iter_rows(values_only=True)))
+        if not workbook.sheetnames:
+            raise ValueError('No task data sheet found.')
+        tasks_sheet = TASKS_SHEET if TASKS_SHEET in workbook.sheetnames else workbook.sheetnames[0]
+        _read_tasks(workbook[tasks_sheet].iter_rows(values_only=True), project)
+        return project
+    finally:
+        workbook.close()
+
+
+def _task_row(task):
+    return (
+        task.get('group') or '', task.get('name'), task.get('id'), task.get('start'),
+        task.get('end'), task.get('progress'), task.get('dependencies') or '', task.get('color') or '',
+    )
+
+
+def _add_sheet(workbook, name, widths):
+    worksheet = workbook.add_worksheet(name)
+    for index, width in enumerate(widths):
+        worksheet.set_column(index, index, width)
+    return worksheet
+
+
+def write_workbook(data, target=None):
+    """Writes a project in the chart's export layout.
+
+    ``target`` is a path or binary file object; when it is omitted the workbook is returned as
+    bytes.
+    """
+    import xlsxwriter
+
+    output = io.BytesIO() if target is None else target
+    workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+    info = _add_sheet(workbook, PROJECT_INFO_SHEET, PROJECT_INFO_WIDTHS)
+    info.write_row(0, 0, ('Project Title', data.get('projectTitle') or ''))
+    info.write_row(1, 0, ('Project Subtitle', data.get('projectSubtitle') or ''))
+    groups = data.get('projectGroups') or []
+    if groups:
+        headers = list(dict.fromkeys(key for group in groups for key in group))
+        sheet = _add_sheet(workbook, GROUPS_SHEET, GROUPS_WIDTHS)
+        sheet.write_row(0, 0, headers)
+        for row, group in enumerate(groups, start=1):
+            sheet.write_row(row, 0, [group.get(header) for header in headers])
+    sheet = _add_sheet(workbook, TASKS_SHEET, TASK_WIDTHS)
+    sheet.write_row(0, 0, TASK_COLUMNS)
+    for row, task in enumerate(data.get('tasks') or [], start=1):
+        sheet.write_row(row, 0, _task_row(task))
+    workbook.close()
+    if target is None:
+        return output.getvalue()
+
+
+def read_csv(source):
+    """Reads the tasks from a CSV path or file object (text or binary, UTF-8)."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding='utf-8-sig', newline='') as f:
+            return read_csv(f)
+    if not isinstance(source, io.TextIOBase):
+        source = io.TextIOWrapper(source, encoding='utf-8-sig', newline='')
+    project = {}
+    _read_tasks(csv.reader(source), project)
+    return project
+
+
+def write_csv(data, target=None):
+    """Writes the tasks as CSV to a path or text file object, or returns them as bytes."""
+    if isinstance(target, (str, os.PathLike)):
+        with open(target, 'w', encoding='utf-8', newline='') as f:
+            return write_csv(data, f)
+    output = io.StringIO() if target is None else target
+    writer = csv.writer(output)
+    writer.writerow(TASK_COLUMNS)
+    writer.writerows(_task_row(task) for task in data.get('tasks') or [])
+    if target is None:
+        return output.getvalue().encode('utf-8')
+
+
+def _read_table(table):
+    """Reads a pyarrow table of task columns, plus any project info in its metadata."""
+    project = json.loads((table.schema.metadata or {}).get(ARROW_METADATA_KEY) or '{}')
+    # Each column is converted to Python values in one call; the rows are then zipped together.
+    columns = [column.to_pylist() for column in table.columns]
+    _read_tasks(iter([table.column_names, *zip(*columns)]), project)
+    return project
+
+
+def _build_table(data):
+    import pyarrow as pa
+
+    tasks = data.get('tasks') or []
+    columns = list(zip(*map(_task_row, tasks))) or [()] * len(TASK_COLUMNS)
+    types = (pa.string(), pa.string(), pa.int64(), pa.string(), pa.string(), pa.int64(), pa.string(), pa.string())
+    project = {key: data[key] for key in ('projectTitle', 'projectSubtitle', 'projectGroups') if key in data}
+    return pa.table(
+        [pa.array(values, type=kind) for values, kind in zip(columns, types)],
+        names=list(TASK_COLUMNS),
+        metadata={ARROW_METADATA_KEY: json.dumps(project)},
+    )
+
+
+def read_parquet(source):
+    """Reads a project from a Parquet path or binary file object."""
+    import pyarrow.parquet as pq
+
+    return _read_table(pq.read_table(source))
+
+
+def write_parquet(data, target=None):
+    """Writes a project as Parquet to a path or binary file object, or returns it as bytes."""
+    import pyarrow.parquet as pq
+
+    output = io.BytesIO() if target is None else target
+    pq.write_table(_build_table(data), output)
+    if target is None:
+        return output.getvalue()
+
+
+def read_arrow(source):
+    """Reads a project from an Arrow IPC (Feather v2) path or binary file object."""
+    import pyarrow.feather as feather
+
+    return _read_table(feather.read_table(source))
+
+
+def write_arrow(data, target=None):
+    """Writes a project as an Arrow IPC (Feather v2) file, or returns it as bytes."""
+    import pyarrow.feather as feather
+
+    output = io.BytesIO() if target is None else target
+    feather.write_feather(_build_table(data), output)
+    if target is None:
+        return output.getvalue()
+
+
+# Readers and writers by file extension. Readers return the project fields the file holds: CSV
+# has only tasks.
+READERS = {
+    'xlsx': read_workbook, 'csv': read_csv, 'parquet': read_parquet,
+    'arrow': read_arrow, 'feather': read_arrow,
+}
+WRITERS = {
+    'xlsx': write_workbook, 'csv': write_csv, 'parquet': write_parquet,
+    'arrow': write_arrow, 'feather': write_arrow,
+}
+
+
+def file_format(name):
+    """Returns the format of a file name from its extension, or raises ValueError."""
+    extension = os.path.splitext(str(name))[1].lower().lstrip('.')
+    if extension not in READERS:
+        raise ValueError(f"Unsupported file type: {name}")
+    return extension
+
+
+def read_project(source, name=None):
+    """Reads a project from a path, or from a file object whose format is given by ``name``."""
+    return READERS[file_format(name or source)](source)
+
+
+def write_project(data, target, name=None):
+    """Writes a project to a path, or to a file object whose format is given by ``name``."""
+    return WRITERS[file_format(name or target)](data, target)
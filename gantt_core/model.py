@@ -0,0 +1,87 @@
+"""The project data the chart works with.
+
+A project is a dictionary::
+
+    {'projectTitle': str, 'projectSubtitle': str,
+     'projectGroups': [{'name': str, 'color': '#rrggbb'}, ...],
+     'tasks': [{'id': int, 'name': str, 'group': str, 'start': 'DD/MM/YYYY', 'end': 'DD/MM/YYYY',
+                'progress': int, 'dependencies': '1,2', 'color': str or None}, ...],
+     ...view settings (patches.VIEW_FIELDS)}
+
+End days are inclusive, and ``dependencies`` lists the ids of a task's predecessors. Project
+dictionaries are treated as values: changes make new dictionaries (see patches.py), so one may be
+shared between sessions and caches.
+"""
+from datetime import date
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+# The chart keeps task ids (and the ids in dependency lists) in 32-bit integer columns.
+MIN_TASK_ID = -2 ** 31
+MAX_TASK_ID = 2 ** 31 - 1
+
+EMPTY_PROJECT = {
+    'tasks': [],
+    'projectGroups': [],
+    'projectTitle': 'Project Timeline',
+    'projectSubtitle': 'Interactive Gantt Chart'
+}
+
+
+def parse_epoch_day(value):
+    """Parses a chart date string into days since 1970-01-01, or None if it is unreadable.
+
+    Mirrors the chart's parseDate: DD/MM/YYYY or YYYY-MM-DD, and a day past the end of the
+    month rolls over into the next one.
+    """
+    if not isinstance(value, str):
+        return None
+    for separator, order in (('/', (2, 1, 0)), ('-', (0, 1, 2))):
+        parts = value.split(separator)
+        if len(parts) != 3:
+            continue
+        try:
+            year, month, day = (int(parts[i]) for i in order)
+        except ValueError:
+            continue
+        if year > 1000 and 1 <= month <= 12 and 1 <= day <= 31:
+            return date(year, month, 1).toordinal() + day - 1 - EPOCH_ORDINAL
+    return None
+
+
+def format_epoch_day(day):
+    """Formats days since 1970-01-01 as the chart's DD/MM/YYYY."""
+    return date.fromordinal(int(day) + EPOCH_ORDINAL).strftime('%d/%m/%Y')
+
+
+def parse_dependency_ids(dependencies):
+    """Returns the predecessor ids listed in a task's dependency string."""
+    ids = []
+    for part in str(dependencies or '').split(','):
+        part = part.strip()
+        if part.lstrip('-').isdigit():
+            ids.append(int(part))
+    return ids
+
+
+def sample_project():
+    """Returns the seven-task example project."""
+    return {
+        'tasks': [
+            {'id': 1, 'name': 'Project Kick-off & Requirement Gathering', 'group': 'Planning', 'start': '01/08/2024', 'end': '15/08/2024', 'progress': 100, 'dependencies': '', 'color': None},
+            {'id': 2, 'name': 'UI/UX Wireframing', 'group': 'Design', 'start': '16/08/2024', 'end': '31/08/2024', 'progress': 75, 'dependencies': '1', 'color': None},
+            {'id': 3, 'name': 'Frontend Development', 'group': 'Development', 'start': '01/09/2024', 'end': '30/09/2024', 'progress': 50, 'dependencies': '2', 'color': None},
+            {'id': 4, 'name': 'Backend Development', 'group': 'Development', 'start': '01/09/2024', 'end': '15/10/2024', 'progress': 60, 'dependencies': '2', 'color': None},
+            {'id': 5, 'name': 'API Integration', 'group': 'Development', 'start': '01/10/2024', 'end': '20/10/2024', 'progress': 25, 'dependencies': '3,4', 'color': None},
+            {'id': 6, 'name': 'User Acceptance Testing', 'group': 'Testing', 'start': '21/10/2024', 'end': '05/11/2024', 'progress': 0, 'dependencies': '5', 'color': None},
+            {'id': 7, 'name': 'Deployment to Production', 'group': 'Deployment', 'start': '06/11/2024', 'end': '10/11/2024', 'progress': 0, 'dependencies': '6', 'color': None}
+        ],
+        'projectGroups': [
+            {'name': 'Planning', 'color': '#79D3C9'},
+            {'name': 'Design', 'color': '#25B8A3'},
+            {'name': 'Development', 'color': '#006152'},
+            {'name': 'Testing', 'color': '#FF6B6B'},
+            {'name': 'Deployment', 'color': '#4ECDC4'}
+        ],
+        'projectTitle': 'Example Software Project',
+        'projectSubtitle': 'Q3-Q4 2024 Timeline'
+    }
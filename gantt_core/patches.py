@@ -0,0 +1,70 @@
+"""Applies the patch operations the chart reports edits as.
+
+Each operation is stamped with a revision number: ``set-view`` and ``set-project``
+(``fields``), ``upsert-task`` (``task``), ``move-task`` (``id``, ``start``, ``end``),
+``delete-task`` (``id``), ``replace-tasks`` (``tasks``) and ``replace-project`` (``data``).
+Whole task lists may come in the encoding from serialization.py.
+"""
+from .serialization import decode_tasks
+
+# Fields each patch operation may set on the project.
+VIEW_FIELDS = ('viewMode', 'timelineRenderer', 'columnWidths', 'sortConfig')
+PROJECT_FIELDS = ('projectTitle', 'projectSubtitle', 'projectGroups')
+
+
+def apply_gantt_ops(data, ops):
+    """Returns the project data with a list of patch operations from the chart applied.
+
+    ``data`` itself is left as it is; the result shares the task dictionaries that did not change.
+    """
+    data = dict(data)
+    tasks_by_id = {task['id']: task for task in data['tasks']}
+    for op in ops:
+        kind = op.get('op')
+        if kind == 'set-view' or kind == 'set-project':
+            allowed = VIEW_FIELDS if kind == 'set-view' else PROJECT_FIELDS
+            data.update({field: value for field, value in op['fields'].items() if field in allowed})
+        elif kind == 'upsert-task':
+            tasks_by_id[op['task']['id']] = op['task']
+        elif kind == 'move-task':
+            task = tasks_by_id.get(op['id'])
+            if task is not None:
+                tasks_by_id[op['id']] = {**task, 'start': op['start'], 'end': op['end']}
+        elif kind == 'delete-task':
+            tasks_by_id.pop(op['id'], None)
+        elif kind == 'replace-tasks':
+            tasks_by_id = {task['id']: task for task in decode_tasks(op['tasks'])}
+        elif kind == 'replace-project':
+            data = {key: value for key, value in op['data'].items() if key != 'tasks'}
+            tasks_by_id = {task['id']: task for task in decode_tasks(op['data']['tasks'])}
+    data['tasks'] = list(tasks_by_id.values())
+    return data
+
+
+def read_patch(message, revision, resync):
+    """Works out which operations of a patch message from the chart to apply next.
+
+    ``revision`` is the last revision applied and ``resync`` whether a full snapshot has been
+    requested. Returns the operations to apply, in order, with the new values of both.
+
+    The chart resends every operation until a render reports it as applied, and the component
+    keeps returning its last value on every rerun, so operations at or below the applied revision
+    are skipped. A missing or out-of-order revision means the two sides have diverged: nothing
+    more is applied until the chart answers the resync request with a full snapshot.
+    """
+    pending = [op for op in message.get('ops') or [] if op.get('revision', 0) > revision]
+    snapshots = [index for index, op in enumerate(pending) if op.get('op') == 'replace-project']
+    if snapshots:
+        pending = pending[snapshots[-1]:]
+        revision = pending[0]['revision'] - 1
+        resync = False
+    elif resync:
+        return [], revision, resync
+    applied = []
+    for op in pending:
+        if op['revision'] != revision + 1:
+            resync = True
+            break
+        applied.append(op)
+        revision = op['revision']
+    return applied, revision, resync
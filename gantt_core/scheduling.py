@@ -0,0 +1,345 @@
+"""Critical path scheduling for Gantt chart task lists.
+
+Works on the chart's task dictionaries (see model.py): dates are ``DD/MM/YYYY`` (or
+``YYYY-MM-DD``) strings with an inclusive end day, and ``dependencies`` is a comma-separated
+string of predecessor ids. As in the chart, a task may start on the day after its latest
+predecessor ends at the earliest.
+
+Dates are turned into epoch-day integers and the dependencies into a CSR adjacency once; the
+forward and backward passes then run over NumPy arrays one topological level at a time, or row
+by row when the levels are too narrow for that to pay off.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from .model import format_epoch_day, parse_dependency_ids, parse_epoch_day
+
+# Sentinel for an unreadable date in the epoch-day arrays.
+NO_DAY = np.iinfo(np.int64).min
+# Below this many rows per topological level, NumPy's per-call overhead outweighs the work, so
+# long dependency chains are walked with plain Python lists instead.
+MIN_VECTOR_LEVEL_WIDTH = 32
+
+
+@dataclass
+class DependencyGraph:
+    """Tasks as rows 0..n-1 with their dates and predecessor -> successor edges in CSR form.
+
+    The successors of row ``i`` are ``indices[indptr[i]:indptr[i + 1]]``. Edges whose
+    predecessor id does not exist are dropped.
+    """
+    ids: np.ndarray
+    row_of: dict
+    start: np.ndarray
+    end: np.ndarray
+    valid: np.ndarray
+    indptr: np.ndarray
+    indices: np.ndarray
+
+    @property
+    def size(self):
+        return len(self.ids)
+
+    def edges(self):
+        """Returns the (predecessor_rows, successor_rows) arrays of every edge."""
+        sources = np.repeat(np.arange(self.size), np.diff(self.indptr))
+        return sources, self.indices
+
+
+def build_dependency_graph(tasks):
+    """Parses dates and dependencies of a task list once into a DependencyGraph."""
+    n = len(tasks)
+    ids = np.fromiter((task['id'] for task in tasks), dtype=np.int64, count=n)
+    row_of = {task_id: row for row, task_id in enumerate(ids.tolist())}
+
+    # Plans repeat the same dates a lot, so each distinct string is parsed once.
+    parsed = {}
+
+    def day_of(value):
+        if value not in parsed:
+            day = parse_epoch_day(value)
+            parsed[value] = NO_DAY if day is None else day
+        return parsed[value]
+
+    start = np.fromiter((day_of(task.get('start')) for task in tasks), dtype=np.int64, count=n)
+    end = np.fromiter((day_of(task.get('end')) for task in tasks), dtype=np.int64, count=n)
+    valid = (start != NO_DAY) & (end != NO_DAY)
+
+    sources, targets = [], []
+    for row, task in enumerate(tasks):
+        if not task.get('dependencies'):
+            continue
+        for parent_id in parse_dependency_ids(task['dependencies']):
+            parent_row = row_of.get(parent_id)
+            if parent_row is not None:
+                sources.append(parent_row)
+                targets.append(row)
+    sources = np.asarray(sources, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    order = np.argsort(sources, kind='stable')
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=n), out=indptr[1:])
+    return DependencyGraph(ids, row_of, start, end, valid, indptr, targets[order])
+
+
+def _gather_successors(graph, rows):
+    """Concatenates the successor lists of the given rows without a Python-level loop."""
+    starts = graph.indptr[rows]
+    counts = graph.indptr[rows + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return graph.indices[offsets + np.arange(total)]
+
+
+def topological_levels(graph):
+    """Assigns each row its topological level (Kahn's algorithm, one frontier per level).
+
+    Rows that sit on or downstream of a dependency cycle never reach in-degree zero and keep
+    level -1.
+    """
+    indegree = np.bincount(graph.indices, minlength=graph.size)
+    level = np.full(graph.size, -1, dtype=np.int64)
+    frontier = np.flatnonzero(indegree == 0)
+    depth = 0
+    while frontier.size >= MIN_VECTOR_LEVEL_WIDTH:
+        level[frontier] = depth
+        successors = _gather_successors(graph, frontier)
+        rows, counts = np.unique(successors, return_counts=True)
+        indegree[rows] -= counts
+        frontier = rows[indegree[rows] == 0]
+        depth += 1
+    if frontier.size == 0:
+        return level
+
+    # Narrow frontiers: finish the same walk on Python lists.
+    indptr, indices = graph.indptr.tolist(), graph.indices.tolist()
+    indegree, levels = indegree.tolist(), level.tolist()
+    current = frontier.tolist()
+    while current:
+        following = []
+        for row in current:
+            levels[row] = depth
+            for successor in indices[indptr[row]:indptr[row + 1]]:
+                indegree[successor] -= 1
+                if indegree[successor] == 0:
+                    following.append(successor)
+        current = following
+        depth += 1
+    return np.asarray(levels, dtype=np.int64)
+
+
+def find_dependency_cycles(tasks, graph=None):
+    """Finds every dependency cycle with Tarjan's strongly connected components algorithm.
+
+    Runs in linear time and without recursion, so long chains are fine. Returns one list of task
+    ids per cycle: each component of more than one task, and any task that depends on itself.
+    """
+    if graph is None:
+        graph = build_dependency_graph(tasks)
+    indptr, indices = graph.indptr.tolist(), graph.indices.tolist()
+    ids = graph.ids.tolist()
+    index_of = [-1] * graph.size
+    low_link = [0] * graph.size
+    on_stack = [False] * graph.size
+    stack, cycles = [], []
+    next_index = 0
+    for root in range(graph.size):
+        if index_of[root] != -1:
+            continue
+        index_of[root] = low_link[root] = next_index
+        next_index += 1
+        stack.append(root)
+        on_stack[root] = True
+        # Each frame is [row, position of the next successor to look at].
+        work = [[root, indptr[root]]]
+        while work:
+            frame = work[-1]
+            row, position = frame
+            if position < indptr[row + 1]:
+                frame[1] += 1
+                successor = indices[position]
+                if index_of[successor] == -1:
+                    index_of[successor] = low_link[successor] = next_index
+                    next_index += 1
+                    stack.append(successor)
+                    on_stack[successor] = True
+                    work.append([successor, indptr[successor]])
+                elif on_stack[successor]:
+                    low_link[row] = min(low_link[row], index_of[successor])
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low_link[parent] = min(low_link[parent], low_link[row])
+            if low_link[row] != index_of[row]:
+                continue
+            component = []
+            while True:
+                member = stack.pop()
+                on_stack[member] = False
+                component.append(member)
+                if member == row:
+                    break
+            if len(component) > 1 or row in indices[indptr[row]:indptr[row + 1]]:
+                cycles.append([ids[member] for member in reversed(component)])
+    return cycles
+
+
+def _sequential_passes(order, sources, targets, early_start, duration):
+    """Forward and backward passes row by row in topological order, on Python lists.
+
+    Returns early start/finish, late start/finish and the project finish.
+    """
+    n = len(duration)
+    by_target = np.argsort(targets, kind='stable')
+    by_source = np.argsort(sources, kind='stable')
+    predecessor_ptr = np.searchsorted(targets[by_target], np.arange(n + 1)).tolist()
+    predecessors = sources[by_target].tolist()
+    successor_ptr = np.searchsorted(sources[by_source], np.arange(n + 1)).tolist()
+    successors = targets[by_source].tolist()
+    order, duration, early_start = order.tolist(), duration.tolist(), early_start.tolist()
+
+    early_finish = [0] * n
+    for row in order:
+        start = early_start[row]
+        for parent in predecessors[predecessor_ptr[row]:predecessor_ptr[row + 1]]:
+            start = max(start, early_finish[parent] + 1)
+        early_start[row] = start
+        early_finish[row] = start + duration[row]
+
+    project_finish = max((early_finish[row] for row in order), default=None)
+    late_finish = [project_finish or 0] * n
+    late_start = [0] * n
+    for row in reversed(order):
+        finish = late_finish[row]
+        for child in successors[successor_ptr[row]:successor_ptr[row + 1]]:
+            finish = min(finish, late_start[child] - 1)
+        late_finish[row] = finish
+        late_start[row] = finish - duration[row]
+
+    arrays = (np.asarray(values, dtype=np.int64) for values in (early_start, early_finish, late_start, late_finish))
+    return (*arrays, project_finish)
+
+
+@dataclass
+class Schedule:
+    """Result of a critical path analysis, one array entry per task in input order.
+
+    Days are epoch days with inclusive finish days. Tasks that could not be scheduled (an
+    unreadable date, or on or after a dependency cycle) are False in ``scheduled`` and hold
+    meaningless values elsewhere.
+    """
+    ids: np.ndarray
+    scheduled: np.ndarray
+    early_start: np.ndarray
+    early_finish: np.ndarray
+    late_start: np.ndarray
+    late_finish: np.ndarray
+    total_float: np.ndarray
+    critical: np.ndarray
+    project_finish: object
+
+    @property
+    def critical_path(self):
+        """Ids of the zero-float tasks, ordered by early start."""
+        rows = np.flatnonzero(self.critical)
+        rows = rows[np.argsort(self.early_start[rows], kind='stable')]
+        return self.ids[rows].tolist()
+
+
+def compute_schedule(tasks, graph=None):
+    """Runs the CPM forward and backward passes over a task list.
+
+    Each task keeps its planned start as a no-earlier-than constraint and is pushed later only
+    when a predecessor ends on or after that day, which is the rule the chart's drag cascade
+    applies. Tasks without successors must finish by the project finish. Tasks in or after a
+    dependency cycle are left unscheduled; find_dependency_cycles names the cycles.
+    """
+    if graph is None:
+        graph = build_dependency_graph(tasks)
+    n = graph.size
+    duration = np.where(graph.valid, graph.end - graph.start, 0)
+    level = topological_levels(graph)
+    scheduled = graph.valid & (level >= 0)
+
+    # Only edges between schedulable tasks take part in the passes. They are grouped by the
+    # level of the task they constrain: the forward pass walks successor levels upwards, the
+    # backward pass walks predecessor levels downwards.
+    sources, targets = graph.edges()
+    keep = scheduled[sources] & scheduled[targets]
+    sources, targets = sources[keep], targets[keep]
+
+    early_start = np.where(scheduled, graph.start, 0)
+    early_finish = early_start + duration
+    depth = int(level.max()) + 1 if n else 0
+    rows_by_level = np.argsort(level, kind='stable')
+    level_bounds = np.searchsorted(level[rows_by_level], np.arange(depth + 1))
+
+    if depth and n < depth * MIN_VECTOR_LEVEL_WIDTH:
+        # Long, narrow chains of dependencies.
+        order = rows_by_level[level_bounds[0]:]
+        early_start, early_finish, late_start, late_finish, project_finish = _sequential_passes(
+            order[scheduled[order]], sources, targets, early_start, duration)
+    else:
+        by_target = np.argsort(level[targets], kind='stable')
+        target_bounds = np.searchsorted(level[targets][by_target], np.arange(depth + 1))
+        for current in range(1, depth):
+            edge_slice = by_target[target_bounds[current]:target_bounds[current + 1]]
+            if edge_slice.size == 0:
+                continue
+            np.maximum.at(early_start, targets[edge_slice], early_finish[sources[edge_slice]] + 1)
+            rows = rows_by_level[level_bounds[current]:level_bounds[current + 1]]
+            early_finish[rows] = early_start[rows] + duration[rows]
+
+        project_finish = int(early_finish[scheduled].max()) if scheduled.any() else None
+        late_finish = np.full(n, project_finish if project_finish is not None else 0, dtype=np.int64)
+        late_start = late_finish - duration
+        by_source = np.argsort(level[sources], kind='stable')
+        source_bounds = np.searchsorted(level[sources][by_source], np.arange(depth + 1))
+        for current in range(depth - 1, -1, -1):
+            edge_slice = by_source[source_bounds[current]:source_bounds[current + 1]]
+            if edge_slice.size == 0:
+                continue
+            np.minimum.at(late_finish, sources[edge_slice], late_start[targets[edge_slice]] - 1)
+            rows = rows_by_level[level_bounds[current]:level_bounds[current + 1]]
+            late_start[rows] = late_finish[rows] - duration[rows]
+
+    total_float = late_start - early_start
+    return Schedule(
+        ids=graph.ids,
+        scheduled=scheduled,
+        early_start=early_start,
+        early_finish=early_finish,
+        late_start=late_start,
+        late_finish=late_finish,
+        total_float=total_float,
+        critical=scheduled & (total_float <= 0),
+        project_finish=project_finish,
+    )
+
+
+def reschedule_tasks(tasks, graph=None):
+    """Moves every task that starts on or before the end of one of its predecessors.
+
+    Such a task moves to the day after its latest predecessor ends and keeps its duration. The
+    move carries down the dependency chain. This is the rule the chart's getDependencyUpdatePlan
+    applies below a dragged task, here applied to the whole plan at once.
+
+    Returns the new task list and the ids of the moved tasks. Tasks that cannot be scheduled (see
+    compute_schedule) keep their dates. The input list and its dictionaries are not changed.
+    """
+    if graph is None:
+        graph = build_dependency_graph(tasks)
+    schedule = compute_schedule(tasks, graph)
+    moved = np.flatnonzero(schedule.scheduled & (schedule.early_start != graph.start))
+    tasks = list(tasks)
+    for row in moved.tolist():
+        tasks[row] = {
+            **tasks[row],
+            'start': format_epoch_day(schedule.early_start[row]),
+            'end': format_epoch_day(schedule.early_finish[row]),
+        }
+    return tasks, graph.ids[moved].tolist()
@@ -0,0 +1,159 @@
+"""Compact columnar encoding of task lists for the chart's component messages.
+
+A task list travels as one array per field instead of one dictionary per task, which drops the
+repeated keys and the date strings:
+
+    {"format": "gantt-columns", "version": 1, "count": n,
+     "ids": [...], "names": [...],
+     "startDays": [...], "endDays": [...],          # days since 1970-01-01, null if unreadable
+     "rawStarts": {"3": "next week"}, "rawEnds": {}, # unreadable date text, by row
+     "progress": [...],
+     "groups": ["", ...], "groupIndex": [...],      # interned group names
+     "colors": [null, ...], "colorIndex": [...],    # interned colours
+     "depOffsets": [...], "depIds": [...]}          # predecessor ids in CSR form
+
+Task ``i`` depends on ``depIds[depOffsets[i]:depOffsets[i + 1]]``. A date that is set but cannot
+be read has a null day and its text kept in ``rawStarts`` or ``rawEnds``, so it comes back as the
+user typed it. Ids must fit the chart's 32-bit columns (``MIN_TASK_ID`` to ``MAX_TASK_ID``). When the JSON of the columns is
+larger than ``COMPRESS_THRESHOLD`` bytes it is gzipped and sent as base64 instead:
+
+    {"format": "gantt-columns", "version": 1, "encoding": "gzip+base64", "payload": "..."}
+
+frontend/gantt.js reads and writes the same format. Whole projects go to the chart as one
+gzipped JSON document (``encode_project_payload``).
+"""
+import base64
+import gzip
+import json
+
+from .model import MAX_TASK_ID, MIN_TASK_ID, format_epoch_day, parse_dependency_ids, parse_epoch_day
+
+WIRE_FORMAT = 'gantt-columns'
+WIRE_VERSION = 1
+COMPRESS_THRESHOLD = 32 * 1024
+
+
+class _StringTable:
+    """Interns strings in order of first appearance."""
+
+    def __init__(self, first_value):
+        self.values = [first_value]
+        self._index = {first_value: 0}
+
+    def intern(self, value):
+        index = self._index.get(value)
+        if index is None:
+            index = self._index[value] = len(self.values)
+            self.values.append(value)
+        return index
+
+
+def is_encoded_tasks(value):
+    return isinstance(value, dict) and value.get('format') == WIRE_FORMAT
+
+
+def encode_tasks(tasks, compress=None):
+    """Encodes task dictionaries as wire columns.
+
+    ``compress`` forces gzip on or off; by default it is used above ``COMPRESS_THRESHOLD``. Raises
+    ValueError for an id, or a dependency id, the chart cannot hold.
+    """
+    groups, colors = _StringTable(''), _StringTable(None)
+    parsed = {}
+
+    def parse_day(value):
+        if value not in parsed:
+            parsed[value] = parse_epoch_day(value)
+        return parsed[value]
+
+    columns = {
+        'format': WIRE_FORMAT, 'version': WIRE_VERSION, 'count': len(tasks),
+        'ids': [], 'names': [], 'startDays': [], 'endDays': [], 'progress': [],
+        'groupIndex': [], 'colorIndex': [], 'depOffsets': [0], 'depIds': [],
+        'rawStarts': {}, 'rawEnds': {},
+    }
+    for row, task in enumerate(tasks):
+        columns['ids'].append(task['id'])
+        columns['names'].append(task.get('name', ''))
+        start, end = task.get('start'), task.get('end')
+        start_day, end_day = parse_day(start), parse_day(end)
+        columns['startDays'].append(start_day)
+        columns['endDays'].append(end_day)
+        if start_day is None and start not in (None, ''):
+            columns['rawStarts'][str(row)] = str(start)
+        if end_day is None and end not in (None, ''):
+            columns['rawEnds'][str(row)] = str(end)
+        try:
+            progress = int(task.get('progress') or 0)
+        except (TypeError, ValueError):
+            progress = 0
+        columns['progress'].append(min(100, max(0, progress)))
+        columns['groupIndex'].append(groups.intern(task.get('group') or ''))
+        columns['colorIndex'].append(colors.intern(task.get('color') or None))
+        columns['depIds'].extend(dict.fromkeys(parse_dependency_ids(task.get('dependencies'))))
+        columns['depOffsets'].append(len(columns['depIds']))
+    for name, values in (('id', columns['ids']), ('dependency id', columns['depIds'])):
+        if values and (min(values) < MIN_TASK_ID or max(values) > MAX_TASK_ID):
+            value = next(value for value in values if not MIN_TASK_ID <= value <= MAX_TASK_ID)
+            raise ValueError(f"Task {name} {value} is outside the range the chart supports "
+                             f"({MIN_TASK_ID} to {MAX_TASK_ID})")
+    columns['groups'] = groups.values
+    columns['colors'] = colors.values
+    text = json.dumps(columns, separators=(',', ':'))
+    if compress is None:
+        compress = len(text) > COMPRESS_THRESHOLD
+    if not compress:
+        return columns
+    return {
+        'format': WIRE_FORMAT, 'version': WIRE_VERSION, 'encoding': 'gzip+base64',
+        'payload': base64.b64encode(gzip.compress(text.encode('utf-8'))).decode('ascii'),
+    }
+
+
+def decode_tasks(value):
+    """Decodes wire columns back into task dictionaries. A plain list of tasks is returned as is."""
+    if not is_encoded_tasks(value):
+        return value
+    if value.get('version') != WIRE_VERSION:
+        raise ValueError(f"Unsupported task encoding version: {value.get('version')}")
+    if value.get('encoding') == 'gzip+base64':
+        value = json.loads(gzip.decompress(base64.b64decode(value['payload'])))
+    formatted = {None: ''}
+
+    def format_day(day):
+        if day not in formatted:
+            formatted[day] = format_epoch_day(day)
+        return formatted[day]
+
+    groups, colors, offsets, dep_ids = value['groups'], value['colors'], value['depOffsets'], value['depIds']
+    raw_starts, raw_ends = value.get('rawStarts') or {}, value.get('rawEnds') or {}
+    return [
+        {
+            'id': task_id,
+            'name': name,
+            'group': groups[group_index],
+            'start': format_day(start_day) if start_day is not None else raw_starts.get(str(i), ''),
+            'end': format_day(end_day) if end_day is not None else raw_ends.get(str(i), ''),
+            'progress': progress,
+            'dependencies': ','.join(str(dep_id) for dep_id in dep_ids[offsets[i]:offsets[i + 1]]),
+            'color': colors[color_index],
+        }
+        for i, (task_id, name, start_day, end_day, progress, group_index, color_index) in enumerate(zip(
+            value['ids'], value['names'], value['startDays'], value['endDays'], value['progress'],
+            value['groupIndex'], value['colorIndex']))
+    ]
+
+
+def encode_project(data, compress=None):
+    """Returns the project with its task list encoded, ready to pass to the chart."""
+    return {**data, 'tasks': encode_tasks(data.get('tasks') or [], compress)}
+
+
+def encode_project_payload(data):
+    """Returns the project as gzipped JSON with its task list in wire columns.
+
+    This is how the chart receives a project: as a bytes argument, which Streamlit passes through
+    without encoding it again as JSON or base64.
+    """
+    text = json.dumps(encode_project(data, compress=False), separators=(',', ':'))
+    return gzip.compress(text.encode('utf-8'), compresslevel=6)
@@ -0,0 +1,273 @@
+"""SQLite storage for projects, so plans outlive the Streamlit session and the server process.
+
+Each project is a row in ``projects`` with its groups, tasks and dependency edges in their own
+tables. Task dates are kept as the chart's text and as epoch days, which are indexed along with
+the project so that date-range queries need not read whole plans. A task's ``dependencies``
+string is stored as one edge per predecessor and rebuilt as comma-separated ids, so it comes back
+normalised (``"3, 4"`` loads as ``"3,4"``; ids that are not numbers are dropped). Tasks are keyed
+by id, so a project whose ids repeat is refused rather than stored with the repeats collapsed.
+
+The database runs in WAL mode, so readers do not wait for a writer. Every save is one
+``BEGIN IMMEDIATE`` transaction whose rows go through ``executemany`` on prepared statements.
+Connections are pooled and may be used from any thread, one at a time.
+"""
+import json
+import queue
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from .model import parse_dependency_ids, parse_epoch_day
+
+# Project fields with their own columns; any other field but ``tasks`` (the view settings) is
+# kept as JSON in ``projects.view``.
+PROJECT_COLUMNS = ('projectTitle', 'projectSubtitle', 'projectGroups')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL DEFAULT '',
+    subtitle TEXT NOT NULL DEFAULT '',
+    view TEXT NOT NULL DEFAULT '{}',
+    revision INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS project_groups (
+    project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    color TEXT,
+    PRIMARY KEY (project_id, position)
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    group_name TEXT NOT NULL DEFAULT '',
+    start_date TEXT NOT NULL DEFAULT '',
+    end_date TEXT NOT NULL DEFAULT '',
+    start_day INTEGER,
+    end_day INTEGER,
+    progress INTEGER NOT NULL DEFAULT 0,
+    color TEXT,
+    PRIMARY KEY (project_id, id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tasks_by_start ON tasks (project_id, start_day);
+CREATE INDEX IF NOT EXISTS tasks_by_end ON tasks (project_id, end_day);
+CREATE TABLE IF NOT EXISTS task_dependencies (
+    project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    task_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    predecessor_id INTEGER NOT NULL,
+    PRIMARY KEY (project_id, task_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS task_dependencies_by_predecessor ON task_dependencies (project_id, predecessor_id);
+"""
+
+INSERT_TASK = """
+INSERT OR REPLACE INTO tasks
+    (project_id, id, position, name, group_name, start_date, end_date, start_day, end_day, progress, color)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+INSERT_DEPENDENCY = "INSERT INTO task_dependencies (project_id, task_id, position, predecessor_id) VALUES (?, ?, ?, ?)"
+INSERT_GROUP = "INSERT INTO project_groups (project_id, position, name, color) VALUES (?, ?, ?, ?)"
+
+
+def _task_row(project_id, position, task):
+    try:
+        progress = int(task.get('progress') or 0)
+    except (TypeError, ValueError):
+        progress = 0
+    return (
+        project_id, task['id'], position, task.get('name') or '', task.get('group') or '',
+        task.get('start') or '', task.get('end') or '',
+        parse_epoch_day(task.get('start')), parse_epoch_day(task.get('end')),
+        progress, task.get('color') or None,
+    )
+
+
+def _check_unique_ids(tasks):
+    seen = set()
+    for task in tasks:
+        if task['id'] in seen:
+            raise ValueError(f"Task id {task['id']} is used by more than one task")
+        seen.add(task['id'])
+
+
+def _dependency_rows(project_id, task):
+    return (
+        (project_id, task['id'], position, predecessor_id)
+        for position, predecessor_id in enumerate(dict.fromkeys(parse_dependency_ids(task.get('dependencies'))))
+    )
+
+
+class ProjectStore:
+    """Projects in a SQLite database file, looked up by name."""
+
+    def __init__(self, path):
+        self.path = path
+        self._idle = queue.SimpleQueue()
+        with self._connection() as db:
+            db.executescript(SCHEMA)
+
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        db.execute('PRAGMA journal_mode = WAL')
+        db.execute('PRAGMA synchronous = NORMAL')
+        db.execute('PRAGMA foreign_keys = ON')
+        return db
+
+    @contextmanager
+    def _connection(self):
+        try:
+            db = self._idle.get_nowait()
+        except queue.Empty:
+            db = self._connect()
+        try:
+            yield db
+        finally:
+            self._idle.put(db)
+
+    @contextmanager
+    def _transaction(self, write=False):
+        with self._connection() as db:
+            db.execute('BEGIN IMMEDIATE' if write else 'BEGIN')
+            try:
+                yield db
+            except BaseException:
+                db.execute('ROLLBACK')
+                raise
+            db.execute('COMMIT')
+
+    def list_projects(self):
+        """Returns ``(name, title, task count, revision)`` for each project, most recently saved first."""
+        with self._connection() as db:
+            return db.execute("""
+                SELECT name, title, (SELECT COUNT(*) FROM tasks WHERE project_id = projects.id), revision
+                FROM projects ORDER BY updated_at DESC, name
+            """).fetchall()
+
+    def project_names(self):
+        """Returns the project names, most recently saved first, without counting their tasks."""
+        with self._connection() as db:
+            return [name for (name,) in db.execute('SELECT name FROM projects ORDER BY updated_at DESC, name')]
+
+    def revision(self, name):
+        """Returns the project's revision, which goes up with every save, or None if it does not exist."""
+        with self._connection() as db:
+            row = db.execute('SELECT revision FROM projects WHERE name = ?', (name,)).fetchone()
+        return row[0] if row else None
+
+    def load_project(self, name):
+        """Returns the project as the chart's data dictionary along with its revision, or
+        ``(None, None)`` if it does not exist."""
+        with self._transaction() as db:
+            row = db.execute('SELECT id, title, subtitle, view, revision FROM projects WHERE name = ?', (name,)).fetchone()
+            if row is None:
+                return None, None
+            project_id, title, subtitle, view, revision = row
+            groups = [
+                {'name': group_name, 'color': color}
+                for group_name, color in db.execute(
+                    'SELECT name, color FROM project_groups WHERE project_id = ? ORDER BY position', (project_id,))
+            ]
+            dependencies = {}
+            for task_id, predecessor_id in db.execute(
+                    'SELECT task_id, predecessor_id FROM task_dependencies WHERE project_id = ? ORDER BY task_id, position',
+                    (project_id,)):
+                dependencies.setdefault(task_id, []).append(str(predecessor_id))
+            tasks = [
+                {
+                    'id': task_id, 'name': task_name, 'group': group_name, 'start': start, 'end': end,
+                    'progress': progress, 'dependencies': ','.join(dependencies.get(task_id, ())), 'color': color,
+                }
+                for task_id, task_name, group_name, start, end, progress, color in db.execute("""
+                    SELECT id, name, group_name, start_date, end_date, progress, color
+                    FROM tasks WHERE project_id = ? ORDER BY position
+                """, (project_id,))
+            ]
+        data = {**json.loads(view), 'projectTitle': title, 'projectSubtitle': subtitle, 'projectGroups': groups, 'tasks': tasks}
+        return data, revision
+
+    def _touch(self, db, name):
+        """Bumps the project's revision, creating it if need be, and returns its id and new revision."""
+        now = datetime.now(timezone.utc).isoformat()
+        return db.execute("""
+            INSERT INTO projects (name, updated_at) VALUES (?, ?)
+            ON CONFLICT (name) DO UPDATE SET revision = revision + 1, updated_at = excluded.updated_at
+            RETURNING id, revision
+        """, (name, now)).fetchone()
+
+    def _write_project_fields(self, db, project_id, data):
+        view = {key: value for key, value in data.items() if key != 'tasks' and key not in PROJECT_COLUMNS}
+        db.execute('UPDATE projects SET title = ?, subtitle = ?, view = ? WHERE id = ?', (
+            data.get('projectTitle') or '', data.get('projectSubtitle') or '', json.dumps(view), project_id))
+        db.execute('DELETE FROM project_groups WHERE project_id = ?', (project_id,))
+        db.executemany(INSERT_GROUP, (
+            (project_id, position, group.get('name') or '', group.get('color'))
+            for position, group in enumerate(data.get('projectGroups') or [])
+        ))
+
+    def save_project(self, name, data):
+        """Replaces the stored project (or creates it) with ``data`` and returns its new revision.
+        Raises ValueError, leaving the stored project as it was, if two tasks share an id."""
+        tasks = data.get('tasks') or []
+        _check_unique_ids(tasks)
+        with self._transaction(write=True) as db:
+            project_id, revision = self._touch(db, name)
+            self._write_project_fields(db, project_id, data)
+            db.execute('DELETE FROM task_dependencies WHERE project_id = ?', (project_id,))
+            db.execute('DELETE FROM tasks WHERE project_id = ?', (project_id,))
+            db.executemany(INSERT_TASK, (_task_row(project_id, position, task) for position, task in enumerate(tasks)))
+            db.executemany(INSERT_DEPENDENCY, (row for task in tasks for row in _dependency_rows(project_id, task)))
+        return revision
+
+    def save_changes(self, name, data, ops):
+        """Stores what a list of the chart's patch operations changed, reading the values from
+        ``data``, the project after they were applied. Falls back to a full save when an
+        operation replaced the task list or the project does not exist yet. Returns the new
+        revision; raises ValueError, as save_project does, if two of the changed tasks share an id."""
+        if any(op.get('op') in ('replace-tasks', 'replace-project') for op in ops) or self.revision(name) is None:
+            return self.save_project(name, data)
+        changed_ids = {op['task']['id'] if op.get('op') == 'upsert-task' else op.get('id')
+                       for op in ops if op.get('op') in ('upsert-task', 'move-task', 'delete-task')}
+        changed_tasks = [task for task in data.get('tasks') or [] if task['id'] in changed_ids]
+        _check_unique_ids(changed_tasks)
+        removed_ids = changed_ids - {task['id'] for task in changed_tasks}
+        with self._transaction(write=True) as db:
+            project_id, revision = self._touch(db, name)
+            if any(op.get('op') in ('set-view', 'set-project') for op in ops):
+                self._write_project_fields(db, project_id, data)
+            db.executemany('DELETE FROM task_dependencies WHERE project_id = ? AND task_id = ?',
+                           ((project_id, task_id) for task_id in changed_ids))
+            db.executemany('DELETE FROM tasks WHERE project_id = ? AND id = ?',
+                           ((project_id, task_id) for task_id in removed_ids))
+            # A task keeps its row position; a new one goes after the last.
+            positions = dict(db.execute('SELECT id, position FROM tasks WHERE project_id = ? AND id IN (SELECT value FROM json_each(?))',
+                                        (project_id, json.dumps([task['id'] for task in changed_tasks]))))
+            next_position = db.execute('SELECT COALESCE(MAX(position), -1) + 1 FROM tasks WHERE project_id = ?',
+                                       (project_id,)).fetchone()[0]
+            rows = []
+            for task in changed_tasks:
+                if task['id'] not in positions:
+                    positions[task['id']] = next_position
+                    next_position += 1
+                rows.append(_task_row(project_id, positions[task['id']], task))
+            db.executemany(INSERT_TASK, rows)
+            db.executemany(INSERT_DEPENDENCY, (row for task in changed_tasks for row in _dependency_rows(project_id, task)))
+        return revision
+
+    def delete_project(self, name):
+        with self._transaction(write=True) as db:
+            db.execute('DELETE FROM projects WHERE name = ?', (name,))
+
+    def tasks_between(self, name, first_day, last_day):
+        """Returns the ids of the project's tasks that overlap the given epoch days, by the indexes."""
+        with self._connection() as db:
+            return [task_id for (task_id,) in db.execute("""
+                SELECT tasks.id FROM tasks JOIN projects ON projects.id = tasks.project_id
+                WHERE projects.name = ? AND tasks.start_day <= ? AND tasks.end_day >= ?
+                ORDER BY tasks.start_day
+            """, (name, last_day, first_day))]
@@ -0,0 +1,121 @@
+"""Seeded synthetic plans for benchmarks and load tests.
+
+    from gantt_core.synthetic import generate_project
+
+    project = generate_project(100_000, groups=20, depth=50, fan_in=3, fan_out=4, seed=1)
+
+The plan is an ordinary project dictionary (see model.py), the same as the chart sends and a file
+import produces. Its tasks are laid out in ``depth`` dependency levels of about equal width: every
+task past the first level depends on one task of the level before it, so the longest dependency
+chain is exactly ``depth`` tasks, and on up to ``fan_in - 1`` more from the two levels before it.
+No task has more than ``fan_out`` successors; where that leaves a task without a predecessor in the
+level before it, the chain through it is shorter. Dates follow the dependencies (a task starts on
+the day after its latest predecessor ends, or a few days later) except for a ``conflicts`` share
+of tasks, which start before a predecessor ends, as after a drag that was not cascaded.
+
+The same arguments give the same plan on every run and platform.
+"""
+import random
+
+from .model import format_epoch_day, parse_epoch_day
+
+GROUP_COLORS = ('#79D3C9', '#25B8A3', '#006152', '#FF6B6B', '#4ECDC4', '#F4A261', '#6C5CE7', '#2D3436')
+# Extra predecessors are picked from this many levels before a task's own.
+PREDECESSOR_LEVELS = 2
+# Random picks made for each extra predecessor before giving up on it (the level may be full).
+PICK_ATTEMPTS = 4
+
+
+def _level_sizes(count, depth):
+    depth = max(1, min(depth, count))
+    return [count // depth + (level < count % depth) for level in range(depth)]
+
+
+def generate_project(tasks=1000, groups=10, depth=10, fan_in=2, fan_out=4, seed=0,
+                     start='01/01/2024', max_duration=10, conflicts=0.0):
+    """Returns a synthetic project with ``tasks`` tasks in ``groups`` groups.
+
+    ``depth`` is the number of dependency levels, ``fan_in`` the most predecessors a task has and
+    ``fan_out`` the most successors. Durations are 1 to ``max_duration`` days, and ``conflicts``
+    is the share of tasks (0 to 1) scheduled to start before one of their predecessors ends.
+    """
+    if tasks < 0 or groups < 1 or depth < 1 or fan_in < 0 or fan_out < 0 or max_duration < 1:
+        raise ValueError("tasks must not be negative, groups, depth and max_duration must be at least 1 "
+                         "and fan_in and fan_out must not be negative")
+    if not 0 <= conflicts <= 1:
+        raise ValueError(f"conflicts must be between 0 and 1, not {conflicts}")
+    first_day = parse_epoch_day(start)
+    if first_day is None:
+        raise ValueError(f"unreadable start date {start!r}")
+
+    rng = random.Random(seed)
+    group_names = [f"Group {number}" for number in range(1, groups + 1)]
+    levels = []
+    next_id = 1
+    for size in _level_sizes(tasks, depth) if tasks else []:
+        levels.append(range(next_id, next_id + size))
+        next_id += size
+    successor_count = [0] * (tasks + 1)
+    end_day = [0] * (tasks + 1)
+    # Plans reuse the same few hundred days, so each is formatted once.
+    formatted = {}
+
+    def date_text(day):
+        if day not in formatted:
+            formatted[day] = format_epoch_day(day)
+        return formatted[day]
+
+    def take(candidates):
+        task_id = candidates[rng.randrange(len(candidates))]
+        if successor_count[task_id] >= fan_out:
+            return None
+        successor_count[task_id] += 1
+        return task_id
+
+    task_list = []
+    for level, ids in enumerate(levels):
+        earlier = [task_id for previous in levels[max(0, level - PREDECESSOR_LEVELS):level] for task_id in previous]
+        for task_id in ids:
+            parents = []
+            if level and fan_in:
+                for _ in range(PICK_ATTEMPTS):
+                    parent = take(levels[level - 1])
+                    if parent is not None:
+                        parents.append(parent)
+                        break
+                for _ in range(rng.randint(0, fan_in - 1)):
+                    for _ in range(PICK_ATTEMPTS):
+                        parent = take(earlier)
+                        if parent is not None:
+                            if parent in parents:
+                                successor_count[parent] -= 1
+                            else:
+                                parents.append(parent)
+                            break
+            duration = rng.randint(1, max_duration)
+            if not parents:
+                first = first_day + rng.randrange(5)
+            elif rng.random() < conflicts:
+                first = max(end_day[parent] for parent in parents) - rng.randrange(duration)
+            else:
+                first = max(end_day[parent] for parent in parents) + 1 + rng.randrange(3)
+            end_day[task_id] = first + duration - 1
+            task_list.append({
+                'id': task_id,
+                'name': f"Task {task_id}",
+                'group': group_names[rng.randrange(groups)],
+                'start': date_text(first),
+                'end': date_text(end_day[task_id]),
+                'progress': rng.randint(0, 100),
+                'dependencies': ','.join(map(str, sorted(parents))),
+                'color': None,
+            })
+
+    return {
+        'tasks': task_list,
+        'projectGroups': [
+            {'name': name, 'color': GROUP_COLORS[index % len(GROUP_COLORS)]} for index, name in enumerate(group_names)
+        ],
+        'projectTitle': f"Synthetic plan, {tasks:,} tasks",
+        'projectSubtitle': f"seed {seed}, {len(levels)} levels, fan-in {fan_in}, fan-out {fan_out}",
+    }
@@ -0,0 +1,64 @@
+"""Checks a project for the problems the chart would trip over or quietly drop.
+
+Each problem is reported as one line of text naming the task, in the style of the chart's import
+issues: ``task 12: end date 01/02/2024 is before the start date``. Dependencies are checked with
+the same rule the chart's drag cascade enforces: a task may start on the day after its latest
+predecessor ends at the earliest.
+"""
+from .model import MAX_TASK_ID, MIN_TASK_ID, parse_dependency_ids, parse_epoch_day
+from .scheduling import build_dependency_graph, find_dependency_cycles
+
+
+def validate_project(data, graph=None):
+    """Returns the problems found in a project as a list of messages, empty if there are none."""
+    tasks = data.get('tasks') or []
+    group_names = {group.get('name') for group in data.get('projectGroups') or []}
+    issues = []
+    seen_ids = set()
+    for task in tasks:
+        task_id = task.get('id')
+        label = f"task {task_id}"
+        if task_id in seen_ids:
+            issues.append(f"{label}: the id is used by more than one task")
+        seen_ids.add(task_id)
+        if isinstance(task_id, int) and not MIN_TASK_ID <= task_id <= MAX_TASK_ID:
+            issues.append(f"{label}: the id is outside the range the chart supports")
+        if not task.get('name'):
+            issues.append(f"{label}: no name")
+        start, end = parse_epoch_day(task.get('start')), parse_epoch_day(task.get('end'))
+        if start is None:
+            issues.append(f"{label}: unreadable start date {task.get('start')!r}")
+        if end is None:
+            issues.append(f"{label}: unreadable end date {task.get('end')!r}")
+        if start is not None and end is not None and end < start:
+            issues.append(f"{label}: end date {task.get('end')} is before the start date {task.get('start')}")
+        progress = task.get('progress')
+        if not isinstance(progress, int) or isinstance(progress, bool) or not 0 <= progress <= 100:
+            issues.append(f"{label}: progress {progress!r} is not a whole number from 0 to 100")
+        if group_names and task.get('group') and task['group'] not in group_names:
+            issues.append(f"{label}: group {task['group']!r} is not one of the project's groups")
+
+    if graph is None:
+        graph = build_dependency_graph(tasks)
+    for task in tasks:
+        for parent_id in parse_dependency_ids(task.get('dependencies')):
+            if not MIN_TASK_ID <= parent_id <= MAX_TASK_ID:
+                issues.append(f"task {task.get('id')}: depends on task {parent_id}, an id outside the range the chart supports")
+            elif parent_id not in graph.row_of:
+                issues.append(f"task {task.get('id')}: depends on task {parent_id}, which does not exist")
+    cycle_of = {}
+    for number, cycle in enumerate(find_dependency_cycles(tasks, graph)):
+        issues.append(f"task {cycle[0]}: in a dependency cycle {' → '.join(map(str, cycle + cycle[:1]))}")
+        cycle_of.update(dict.fromkeys(cycle, number))
+
+    # Dependencies within a cycle (self-dependencies included) cannot all be met, and the cycle
+    # has been reported once above, so they are not reported again here.
+    sources, targets = graph.edges()
+    early = graph.valid[sources] & graph.valid[targets] & (graph.start[targets] <= graph.end[sources]) \
+        & (sources != targets)
+    for source, target in zip(sources[early].tolist(), targets[early].tolist()):
+        source_id, target_id = graph.ids[source], graph.ids[target]
+        if source_id in cycle_of and cycle_of[source_id] == cycle_of.get(target_id):
+            continue
+        issues.append(f"task {target_id}: starts on or before task {source_id} ends")
+    return issues
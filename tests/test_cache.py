@@ -0,0 +1,74 @@
+from gantt_core.cache import ProjectCache, ProjectModel
+from gantt_core.model import sample_project
+
+
+def model(tasks):
+    """A model whose weight is ``tasks`` + 1."""
+    return ProjectModel({'tasks': sample_project()['tasks'][:1] * tasks})
+
+
+def test_get_counts_hits_and_misses():
+    cache = ProjectCache()
+    plan = cache.put(('plan', 0), model(3))
+    assert cache.get(('plan', 0)) is plan
+    assert cache.get(('plan', 1)) is None
+    assert cache.get(('other', 0)) is None
+    assert cache.stats() == {'hits': 1, 'misses': 2, 'evictions': 0, 'projects': 1, 'tasks': 4}
+
+
+def test_least_recently_used_is_evicted_first():
+    cache = ProjectCache(max_tasks=12)
+    a = cache.put(('a', 0), model(3))
+    cache.put(('b', 0), model(3))
+    cache.put(('c', 0), model(3))
+    # Reading a makes b the least recently used.
+    assert cache.get(('a', 0)) is a
+    cache.put(('d', 0), model(3))
+    assert cache.get(('b', 0)) is None
+    assert cache.get(('a', 0)) is a
+    assert cache.stats()['evictions'] == 1
+    assert (cache.stats()['projects'], cache.stats()['tasks']) == (3, 12)
+
+
+def test_a_model_over_the_limit_is_kept_alone():
+    cache = ProjectCache(max_tasks=5)
+    cache.put(('a', 0), model(2))
+    big = cache.put(('b', 0), model(10))
+    assert cache.get(('a', 0)) is None
+    assert cache.get(('b', 0)) is big
+    assert cache.stats()['tasks'] == 11
+
+
+def test_put_drops_older_revisions():
+    cache = ProjectCache()
+    cache.put(('plan', 1), model(2))
+    cache.put(('other', 1), model(2))
+    newer = cache.put(('plan', 2), model(4))
+    assert cache.get(('plan', 1)) is None
+    assert cache.get(('plan', 2)) is newer
+    # An older revision put after a newer one is returned but not cached.
+    older = model(2)
+    assert cache.put(('plan', 1), older) is older
+    assert cache.get(('plan', 1)) is None
+    assert cache.get(('plan', 2)) is newer
+    # The same revision again replaces the cached model.
+    again = cache.put(('plan', 2), model(1))
+    assert cache.get(('plan', 2)) is again
+    assert (cache.stats()['projects'], cache.stats()['tasks']) == (2, 5)
+    assert cache.stats()['evictions'] == 0
+
+
+def test_load_and_discard():
+    cache = ProjectCache()
+    built = []
+
+    def build():
+        built.append(model(1))
+        return built[-1]
+
+    first = cache.load(('plan', 0), build)
+    assert cache.load(('plan', 0), build) is first
+    assert len(built) == 1
+    cache.discard('plan')
+    assert cache.stats()['projects'] == cache.stats()['tasks'] == 0
+    assert cache.load(('plan', 0), build) is not first
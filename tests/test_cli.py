@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+from gantt_core.cli import main
+from gantt_core.io import read_project, write_project
+from gantt_core.model import sample_project
+
+
+@pytest.fixture
+def exports(tmp_path):
+    folder = tmp_path / 'exports'
+    folder.mkdir()
+    write_project(sample_project(), str(folder / 'plan.csv'))
+    return folder
+
+
+def test_convert(exports, tmp_path):
+    assert main(['convert', str(exports), '--to', 'csv', '-o', str(tmp_path / 'out'), '-j', '1']) == 0
+    assert read_project(str(tmp_path / 'out' / 'plan.csv'))['tasks'] == sample_project()['tasks']
+
+
+def test_convert_refuses_to_overwrite_its_input(exports):
+    before = (exports / 'plan.csv').read_bytes()
+    with pytest.raises(SystemExit, match='would overwrite an input file'):
+        main(['convert', str(exports), '--to', 'csv', '-o', str(exports), '-j', '1'])
+    # The same folder reached by another path is caught too.
+    with pytest.raises(SystemExit, match='would overwrite an input file'):
+        main(['reschedule', str(exports / 'plan.csv'), '-o', os.path.join(str(exports), '..', 'exports'), '-j', '1'])
+    assert (exports / 'plan.csv').read_bytes() == before
+
+
+def test_validate_exit_status(exports, capsys):
+    # The sample plan has one task starting before its predecessor ends.
+    assert main(['validate', str(exports), '-j', '1']) == 1
+    assert 'task 5: starts on or before task 4 ends' in capsys.readouterr().out
+
+
+def test_reschedule_in_place(exports, capsys):
+    path = exports / 'plan.csv'
+    assert main(['reschedule', str(path), '--in-place', '-j', '1']) == 0
+    assert [task['start'] for task in read_project(str(path))['tasks']][4:] == ['16/10/2024', '05/11/2024', '21/11/2024']
+    assert 'moved 3 of 7 tasks' in capsys.readouterr().out
+    # Nothing is left to move, so the file is not written again.
+    os.utime(path, ns=(0, 0))
+    assert main(['reschedule', str(path), '--in-place', '-j', '1']) == 0
+    assert os.stat(path).st_mtime_ns == 0
+    assert 'moved 0 of 7 tasks, unchanged' in capsys.readouterr().out
+
+
+def test_reschedule_in_place_refuses_files_with_dropped_rows(exports, tmp_path, capsys):
+    path = exports / 'plan.csv'
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write("Deployment,Repeated,7,01/12/2024,02/12/2024,0,,\n,No dates,8,,,0,,\n\n")
+    before = path.read_bytes()
+    assert main(['reschedule', str(path), '--in-place', '-j', '1']) == 1
+    assert 'reading it dropped 2 rows' in capsys.readouterr().out
+    assert path.read_bytes() == before
+    assert main(['reschedule', str(path), '-o', str(tmp_path / 'out'), '-j', '1']) == 0
+    assert '2 rows dropped on reading' in capsys.readouterr().out
+    assert len(read_project(str(tmp_path / 'out' / 'plan.csv'))['tasks']) == 7
@@ -0,0 +1,104 @@
+import io
+import json
+from datetime import date, datetime
+
+import pytest
+
+from gantt_core.io import (
+    ARROW_METADATA_KEY, read_arrow, read_csv, read_parquet, read_workbook, write_arrow, write_csv, write_parquet,
+    write_workbook,
+)
+from gantt_core.model import sample_project
+from gantt_core.serialization import decode_tasks, encode_tasks
+
+
+def test_csv_round_trip():
+    project = sample_project()
+    assert read_csv(io.BytesIO(write_csv(project))) == {'tasks': project['tasks']}
+
+
+def test_rows_repeating_an_id_are_dropped():
+    text = ("Group,Task Name,ID,Start Date,End Date,Progress (%),Dependencies,Color\n"
+            "A,First,1,01/08/2024,02/08/2024,0,,\n"
+            "A,Second,1,03/08/2024,04/08/2024,0,,\n"
+            "A,Third,,05/08/2024,06/08/2024,0,1,\n")
+    project = read_csv(io.StringIO(text))
+    assert [(task['id'], task['name']) for task in project['tasks']] == [(1, 'First'), (3, 'Third')]
+    assert project['droppedRows'] == 1
+
+
+def test_rows_outside_the_chart_id_range_are_dropped():
+    text = ("Group,Task Name,ID,Start Date,End Date,Progress (%),Dependencies,Color\n"
+            "A,First,1,01/08/2024,02/08/2024,0,,\n"
+            "A,Too large,3000000000,03/08/2024,04/08/2024,0,1,\n"
+            "A,Depends on it,3,05/08/2024,06/08/2024,0,\"1, 3000000000\",\n"
+            "A,Last,4,07/08/2024,08/08/2024,0,1,\n")
+    project = read_csv(io.StringIO(text))
+    tasks = project['tasks']
+    assert [task['id'] for task in tasks] == [1, 4]
+    assert project['droppedRows'] == 2
+    assert decode_tasks(encode_tasks(tasks)) == tasks
+
+
+def test_workbook_round_trip():
+    pytest.importorskip('openpyxl')
+    pytest.importorskip('xlsxwriter')
+    project = sample_project()
+    assert read_workbook(io.BytesIO(write_workbook(project))) == project
+
+
+def test_workbook_date_cells():
+    openpyxl = pytest.importorskip('openpyxl')
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = 'Plan'
+    sheet.append(['Task Name', 'ID', 'Start Date', 'End Date', 'Dependencies', 'Progress (%)'])
+    sheet.append(['Design', 4.0, datetime(2024, 8, 1), date(2024, 8, 5), None, 50.0])
+    sheet.append(['Build', None, '06/08/2024', datetime(2024, 8, 20, 17, 30), 4.0, None])
+    output = io.BytesIO()
+    workbook.save(output)
+    # Without a Tasks sheet the first sheet is read; a row without an ID takes its row number.
+    tasks = read_workbook(output)['tasks']
+    assert [(t['id'], t['start'], t['end'], t['dependencies'], t['progress']) for t in tasks] == [
+        (4, '01/08/2024', '05/08/2024', '', 50), (2, '06/08/2024', '20/08/2024', '4', 0)]
+
+
+@pytest.mark.parametrize('write, read', [(write_parquet, read_parquet), (write_arrow, read_arrow)])
+def test_table_round_trip(write, read):
+    pytest.importorskip('pyarrow')
+    project = sample_project()
+    assert read(io.BytesIO(write(project))) == project
+    # Files without project info, or without tasks, read back as such.
+    assert read(io.BytesIO(write({'tasks': project['tasks']}))) == {'tasks': project['tasks']}
+    assert read(io.BytesIO(write({}))) == {'tasks': []}
+
+
+def test_table_metadata():
+    pq = pytest.importorskip('pyarrow.parquet')
+    schema = pq.read_schema(io.BytesIO(write_parquet(sample_project())))
+    project = json.loads(schema.metadata[ARROW_METADATA_KEY])
+    assert project == {key: sample_project()[key] for key in ('projectTitle', 'projectSubtitle', 'projectGroups')}
+
+
+@pytest.mark.parametrize('kind', ['date32', 'timestamp'])
+def test_typed_date_columns(kind):
+    pa = pytest.importorskip('pyarrow')
+    pq = pytest.importorskip('pyarrow.parquet')
+    feather = pytest.importorskip('pyarrow.feather')
+    if kind == 'date32':
+        starts, ends, type_ = [date(2024, 8, 1), date(2024, 8, 6)], [date(2024, 8, 5), None], pa.date32()
+    else:
+        starts, ends = [datetime(2024, 8, 1, 9), datetime(2024, 8, 6)], [datetime(2024, 8, 5), None]
+        type_ = pa.timestamp('ms')
+    table = pa.table({
+        'Task Name': ['Design', 'Build'], 'ID': [1, 2],
+        'Start Date': pa.array(starts, type=type_), 'End Date': pa.array(ends, type=type_),
+    })
+    expected = [(1, '01/08/2024', '05/08/2024')]
+    parquet, arrow = io.BytesIO(), io.BytesIO()
+    pq.write_table(table, parquet)
+    feather.write_feather(table, arrow)
+    # The task without an end date is dropped, as the chart drops it.
+    for project in (read_parquet(parquet), read_arrow(arrow)):
+        assert [(t['id'], t['start'], t['end']) for t in project['tasks']] == expected
+        assert project['droppedRows'] == 1
@@ -0,0 +1,108 @@
+import copy
+
+from gantt_core.model import sample_project
+from gantt_core.patches import apply_gantt_ops, read_patch
+from gantt_core.serialization import encode_tasks
+
+
+def ops(*revisions, op='set-view'):
+    return [{'op': op, 'fields': {'viewMode': 'week'}, 'revision': revision} for revision in revisions]
+
+
+def snapshot(revision, tasks=()):
+    return {'op': 'replace-project', 'data': {'projectTitle': 'Snapshot', 'tasks': encode_tasks(list(tasks))},
+            'revision': revision}
+
+
+def test_read_patch_applies_new_operations_in_order():
+    applied, revision, resync = read_patch({'ops': ops(1, 2, 3)}, 0, False)
+    assert [op['revision'] for op in applied] == [1, 2, 3]
+    assert (revision, resync) == (3, False)
+
+
+def test_read_patch_skips_operations_already_applied():
+    # The chart resends its outbox until a render reports the revisions as applied, and the
+    # component returns its last value again on every rerun.
+    applied, revision, resync = read_patch({'ops': ops(1, 2, 3, 4)}, 2, False)
+    assert [op['revision'] for op in applied] == [3, 4]
+    assert read_patch({'ops': ops(1, 2, 3, 4)}, 4, False) == ([], 4, False)
+    assert read_patch({}, 4, False) == ([], 4, False)
+
+
+def test_read_patch_stops_at_a_gap_and_asks_for_a_resync():
+    applied, revision, resync = read_patch({'ops': ops(1, 2, 4, 5)}, 0, False)
+    assert [op['revision'] for op in applied] == [1, 2]
+    assert (revision, resync) == (2, True)
+
+
+def test_read_patch_stops_at_out_of_order_revisions():
+    applied, revision, resync = read_patch({'ops': ops(1, 3, 2)}, 0, False)
+    assert [op['revision'] for op in applied] == [1]
+    assert (revision, resync) == (1, True)
+
+
+def test_read_patch_waits_for_a_snapshot_while_resyncing():
+    assert read_patch({'ops': ops(3, 4)}, 2, True) == ([], 2, True)
+    # The snapshot and what follows it are applied; what came before it is superseded.
+    applied, revision, resync = read_patch({'ops': ops(3, 4) + [snapshot(5)] + ops(6)}, 2, True)
+    assert [op['revision'] for op in applied] == [5, 6]
+    assert applied[0]['op'] == 'replace-project'
+    assert (revision, resync) == (6, False)
+
+
+def test_read_patch_uses_the_last_snapshot():
+    applied, revision, resync = read_patch({'ops': [snapshot(1)] + ops(2) + [snapshot(3)]}, 0, False)
+    assert [op['revision'] for op in applied] == [3]
+    assert (revision, resync) == (3, False)
+
+
+def test_apply_leaves_the_data_unchanged():
+    data = sample_project()
+    before = copy.deepcopy(data)
+    result = apply_gantt_ops(data, [
+        {'op': 'move-task', 'id': 2, 'start': '17/08/2024', 'end': '01/09/2024'},
+        {'op': 'delete-task', 'id': 3},
+        {'op': 'set-project', 'fields': {'projectTitle': 'Renamed'}},
+    ])
+    assert data == before
+    assert result['projectTitle'] == 'Renamed'
+    assert [task['id'] for task in result['tasks']] == [1, 2, 4, 5, 6, 7]
+    assert result['tasks'][1] == {**before['tasks'][1], 'start': '17/08/2024', 'end': '01/09/2024'}
+    # Tasks that did not change are shared, not copied.
+    assert result['tasks'][0] is data['tasks'][0]
+
+
+def test_apply_replace_tasks_then_upserts():
+    data = sample_project()
+    replacement = [{**task, 'progress': 10} for task in data['tasks'][:2]]
+    added = {'id': 9, 'name': 'Launch', 'group': 'Deployment', 'start': '01/12/2024', 'end': '02/12/2024',
+             'progress': 0, 'dependencies': '2', 'color': None}
+    result = apply_gantt_ops(data, [
+        {'op': 'replace-tasks', 'tasks': encode_tasks(replacement)},
+        {'op': 'upsert-task', 'task': {**replacement[0], 'name': 'Kick-off'}},
+        {'op': 'upsert-task', 'task': added},
+        # Tasks of the old list are gone: moving one does nothing.
+        {'op': 'move-task', 'id': 5, 'start': '01/01/2025', 'end': '02/01/2025'},
+    ])
+    assert result['tasks'] == [{**replacement[0], 'name': 'Kick-off'}, replacement[1], added]
+
+
+def test_apply_delete_of_a_missing_task_is_ignored():
+    data = sample_project()
+    result = apply_gantt_ops(data, [{'op': 'delete-task', 'id': 42}, {'op': 'delete-task', 'id': 7},
+                                    {'op': 'delete-task', 'id': 7}])
+    assert result['tasks'] == data['tasks'][:6]
+
+
+def test_apply_only_sets_known_fields():
+    result = apply_gantt_ops(sample_project(), [
+        {'op': 'set-view', 'fields': {'viewMode': 'month', 'projectTitle': 'Not a view field'}},
+        {'op': 'set-project', 'fields': {'projectSubtitle': 'Q4', 'viewMode': 'year'}},
+    ])
+    assert (result['viewMode'], result['projectTitle'], result['projectSubtitle']) == (
+        'month', 'Example Software Project', 'Q4')
+
+
+def test_apply_replace_project():
+    result = apply_gantt_ops(sample_project(), [snapshot(1, sample_project()['tasks'][:1])])
+    assert result == {'projectTitle': 'Snapshot', 'tasks': sample_project()['tasks'][:1]}
@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+from gantt_core import scheduling
+from gantt_core.model import format_epoch_day, sample_project
+from gantt_core.scheduling import (
+    build_dependency_graph, compute_schedule, find_dependency_cycles, reschedule_tasks, topological_levels,
+)
+from gantt_core.synthetic import generate_project
+
+
+def task(task_id, start='01/08/2024', end='05/08/2024', dependencies=''):
+    return {'id': task_id, 'name': f"Task {task_id}", 'group': '', 'start': start, 'end': end,
+            'progress': 0, 'dependencies': dependencies, 'color': None}
+
+
+def crowded_project(count):
+    """A synthetic plan with every task moved to the same week, so most of them must move later."""
+    tasks = generate_project(count, groups=5, depth=12, seed=4)['tasks']
+    return [{**item, 'start': '01/08/2024', 'end': f"{1 + row % 7:02d}/08/2024"} for row, item in enumerate(tasks)]
+
+
+def days(values):
+    return [format_epoch_day(value) for value in values.tolist()]
+
+
+def test_sample_project_schedule():
+    tasks = sample_project()['tasks']
+    graph = build_dependency_graph(tasks)
+    assert topological_levels(graph).tolist() == [0, 1, 2, 2, 3, 4, 5]
+    schedule = compute_schedule(tasks, graph)
+    assert schedule.scheduled.all()
+    # Task 5 starts before task 4 ends, so it and everything after it is pushed later.
+    assert days(schedule.early_start) == [
+        '01/08/2024', '16/08/2024', '01/09/2024', '01/09/2024', '16/10/2024', '05/11/2024', '21/11/2024']
+    assert days(schedule.early_finish) == [
+        '15/08/2024', '31/08/2024', '30/09/2024', '15/10/2024', '04/11/2024', '20/11/2024', '25/11/2024']
+    assert days(schedule.late_start) == [
+        '01/08/2024', '16/08/2024', '16/09/2024', '01/09/2024', '16/10/2024', '05/11/2024', '21/11/2024']
+    assert days(schedule.late_finish) == [
+        '15/08/2024', '31/08/2024', '15/10/2024', '15/10/2024', '04/11/2024', '20/11/2024', '25/11/2024']
+    assert schedule.total_float.tolist() == [0, 0, 15, 0, 0, 0, 0]
+    assert schedule.critical_path == [1, 2, 4, 5, 6, 7]
+    assert format_epoch_day(schedule.project_finish) == '25/11/2024'
+
+
+def test_reschedule_sample_project():
+    tasks = sample_project()['tasks']
+    rescheduled, moved = reschedule_tasks(tasks)
+    assert moved == [5, 6, 7]
+    assert [(t['start'], t['end']) for t in rescheduled[4:]] == [
+        ('16/10/2024', '04/11/2024'), ('05/11/2024', '20/11/2024'), ('21/11/2024', '25/11/2024')]
+    assert rescheduled[:4] == tasks[:4]
+    assert tasks == sample_project()['tasks']
+    # A plan that has been rescheduled has nothing left to move.
+    assert reschedule_tasks(rescheduled)[1] == []
+
+
+@pytest.mark.parametrize('tasks', [
+    sample_project()['tasks'],
+    crowded_project(3000),
+], ids=['narrow', 'wide'])
+def test_level_wise_and_row_by_row_passes_agree(tasks, monkeypatch):
+    graph = build_dependency_graph(tasks)
+    results = []
+    # A width of 1 takes every level as a vector; a huge one walks every row on Python lists.
+    for width in (1, 10 ** 9):
+        monkeypatch.setattr(scheduling, 'MIN_VECTOR_LEVEL_WIDTH', width)
+        results.append((topological_levels(graph), compute_schedule(tasks, graph)))
+    (vector_levels, vector), (row_levels, by_row) = results
+    assert np.array_equal(vector_levels, row_levels)
+    for field in ('scheduled', 'early_start', 'early_finish', 'late_start', 'late_finish', 'total_float', 'critical'):
+        assert np.array_equal(getattr(vector, field), getattr(by_row, field)), field
+    assert vector.project_finish == by_row.project_finish
+
+
+def test_sequential_passes_match_the_level_wise_pass():
+    tasks = crowded_project(3000)
+    graph = build_dependency_graph(tasks)
+    schedule = compute_schedule(tasks, graph)
+    assert schedule.scheduled.all() and (schedule.early_start != graph.start).any()
+    level = topological_levels(graph)
+    sources, targets = graph.edges()
+    duration = graph.end - graph.start
+    passes = scheduling._sequential_passes(
+        np.argsort(level, kind='stable'), sources, targets, graph.start.copy(), duration)
+    for field, values in zip(('early_start', 'early_finish', 'late_start', 'late_finish'), passes):
+        assert np.array_equal(getattr(schedule, field), values), field
+    assert passes[4] == schedule.project_finish
+
+
+def test_cycles_are_left_unscheduled():
+    tasks = [task(1, dependencies='2'), task(2, dependencies='1'), task(3, dependencies='2'),
+             task(4), task(5, dependencies='5')]
+    graph = build_dependency_graph(tasks)
+    assert topological_levels(graph).tolist() == [-1, -1, -1, 0, -1]
+    assert find_dependency_cycles(tasks, graph) == [[1, 2], [5]]
+    schedule = compute_schedule(tasks, graph)
+    assert schedule.scheduled.tolist() == [False, False, False, True, False]
+    assert schedule.critical_path == [4]
+    assert reschedule_tasks(tasks, graph) == (tasks, [])
+
+
+def test_unreadable_dates_and_missing_predecessors():
+    tasks = [task(1, end='TBD'), task(2, dependencies='1'), task(3, dependencies='9'),
+             task(4, start='06/08/2024', end='06/08/2024', dependencies='2,9')]
+    graph = build_dependency_graph(tasks)
+    assert graph.valid.tolist() == [False, True, True, True]
+    # The edge from the missing task 9 is dropped; the one from task 1 is kept in the graph.
+    assert graph.edges()[1].tolist() == [1, 3]
+    schedule = compute_schedule(tasks, graph)
+    assert schedule.scheduled.tolist() == [False, True, True, True]
+    # Task 2 is not held back by task 1, whose dates cannot be read.
+    assert days(schedule.early_start[1:]) == ['01/08/2024', '01/08/2024', '06/08/2024']
+    rescheduled, moved = reschedule_tasks(tasks, graph)
+    assert (rescheduled, moved) == (tasks, [])
@@ -0,0 +1,92 @@
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from gantt_core.model import MAX_TASK_ID
+from gantt_core.serialization import COMPRESS_THRESHOLD, decode_tasks, encode_tasks
+from gantt_core.synthetic import generate_project
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def task(task_id, **fields):
+    return {'id': task_id, 'name': f"Task {task_id}", 'group': '', 'start': '01/08/2024', 'end': '05/08/2024',
+            'progress': 0, 'dependencies': '', 'color': None, **fields}
+
+
+def test_round_trip():
+    tasks = [
+        task(1, group='Design', progress=40, color='#FF6B6B'),
+        task(2, group='Build', dependencies='1'),
+        task(3, group='Design', dependencies='1,2', start='2024-08-10', end='12/08/2024'),
+    ]
+    decoded = decode_tasks(encode_tasks(tasks, compress=False))
+    # ISO dates come back in the chart's DD/MM/YYYY.
+    assert decoded == tasks[:2] + [{**tasks[2], 'start': '10/08/2024'}]
+
+
+def test_unreadable_dates_keep_their_text():
+    tasks = [task(1, start='next week', end=''), task(2), task(3, end='31/02/x')]
+    encoded = encode_tasks(tasks, compress=False)
+    assert encoded['startDays'][0] is None
+    assert encoded['rawStarts'] == {'0': 'next week'}
+    assert encoded['rawEnds'] == {'2': '31/02/x'}
+    assert decode_tasks(encoded) == tasks
+
+
+def test_large_lists_are_gzipped():
+    tasks = generate_project(2000, groups=5, depth=10, seed=3)['tasks']
+    tasks[7]['start'] = 'TBD'
+    assert len(json.dumps(encode_tasks(tasks, compress=False))) > COMPRESS_THRESHOLD
+    encoded = encode_tasks(tasks)
+    assert encoded['encoding'] == 'gzip+base64'
+    assert set(encoded) == {'format', 'version', 'encoding', 'payload'}
+    assert decode_tasks(encoded) == tasks
+
+
+def test_small_lists_are_sent_plain():
+    assert 'encoding' not in encode_tasks([task(1)])
+
+
+@pytest.mark.parametrize('tasks', [
+    [task(MAX_TASK_ID + 1)],
+    [task(1, dependencies=str(MAX_TASK_ID + 1))],
+])
+def test_ids_outside_the_chart_range_are_refused(tasks):
+    with pytest.raises(ValueError, match='outside the range'):
+        encode_tasks(tasks)
+
+
+def test_unknown_version_is_refused():
+    with pytest.raises(ValueError, match='version'):
+        decode_tasks({**encode_tasks([task(1)]), 'version': 99})
+
+
+def test_plain_task_lists_pass_through():
+    tasks = [task(1)]
+    assert decode_tasks(tasks) is tasks
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="node is not on PATH")
+def test_round_trip_through_the_chart():
+    """Python's columns, loaded into the chart's task store and written back, decode unchanged."""
+    tasks = [task(1, start='soon'), task(2, dependencies='1', end='later'), task(MAX_TASK_ID, dependencies='2')]
+    script = """
+        const fs = require('fs');
+        const { addElementsWithIds } = require('./benchmarks/headless_dom');
+        addElementsWithIds(fs.readFileSync('frontend/index.html', 'utf8'));
+        new Function(fs.readFileSync('frontend/streamlit.js', 'utf8'))();
+        globalThis.Streamlit = window.Streamlit;
+        const source = ['gantt-engine.js', 'gantt.js'].map(name => fs.readFileSync(`frontend/${name}`, 'utf8')).join('\\n;\\n');
+        const initGanttChart = new Function(`${source}\\nreturn initGanttChart;`)();
+        const tasks = JSON.parse(fs.readFileSync(0, 'utf8'));
+        const chart = initGanttChart({ tasks, projectGroups: [] });
+        process.stdout.write(JSON.stringify(chart.getState().tasks));
+        process.exit(0);
+    """
+    completed = subprocess.run(['node', '-e', script], input=json.dumps(encode_tasks(tasks, compress=False)),
+                               cwd=REPO_DIR, capture_output=True, text=True, check=True)
+    assert decode_tasks(json.loads(completed.stdout)) == tasks
@@ -0,0 +1,87 @@
+import pytest
+
+from gantt_core.model import sample_project
+from gantt_core.patches import apply_gantt_ops
+from gantt_core.serialization import encode_tasks
+from gantt_core.store import ProjectStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ProjectStore(str(tmp_path / 'projects.db'))
+
+
+def save_ops(store, name, data, ops):
+    """Applies ops to data as the app does and stores the changes; returns the new data and revision."""
+    data = apply_gantt_ops(data, ops)
+    return data, store.save_changes(name, data, ops)
+
+
+def test_save_and_load_project(store):
+    project = sample_project()
+    assert store.save_project('plan', project) == 0
+    loaded, revision = store.load_project('plan')
+    assert revision == 0
+    assert loaded == project
+    assert store.load_project('missing') == (None, None)
+
+
+def test_save_changes_writes_task_edits(store):
+    data = sample_project()
+    store.save_project('plan', data)
+    new_task = {'id': 8, 'name': 'Retrospective', 'group': 'Deployment', 'start': '11/11/2024',
+                'end': '12/11/2024', 'progress': 0, 'dependencies': '7, 6', 'color': '#FF6B6B'}
+    data, revision = save_ops(store, 'plan', data, [
+        {'op': 'move-task', 'id': 3, 'start': '02/09/2024', 'end': '01/10/2024', 'revision': 1},
+        {'op': 'upsert-task', 'task': {**data['tasks'][1], 'name': 'Wireframes', 'dependencies': ''}, 'revision': 2},
+        {'op': 'upsert-task', 'task': new_task, 'revision': 3},
+        {'op': 'delete-task', 'id': 5, 'revision': 4},
+        {'op': 'set-project', 'fields': {'projectTitle': 'Renamed'}, 'revision': 5},
+    ])
+    assert revision == 1
+    loaded, loaded_revision = store.load_project('plan')
+    assert loaded_revision == 1
+    # Dependency strings come back normalised; everything else as saved, in the same order.
+    assert loaded == {**data, 'tasks': [
+        {**task, 'dependencies': '7,6'} if task['id'] == 8 else task for task in data['tasks']]}
+    assert [task['id'] for task in loaded['tasks']] == [1, 2, 3, 4, 6, 7, 8]
+    assert loaded['projectTitle'] == 'Renamed'
+
+
+def test_save_changes_keeps_positions(store):
+    data = sample_project()
+    store.save_project('plan', data)
+    data, _ = save_ops(store, 'plan', data, [
+        {'op': 'upsert-task', 'task': {**data['tasks'][0], 'name': 'Kick-off'}, 'revision': 1},
+    ])
+    loaded, _ = store.load_project('plan')
+    assert [task['id'] for task in loaded['tasks']] == [1, 2, 3, 4, 5, 6, 7]
+    assert loaded['tasks'][0]['name'] == 'Kick-off'
+
+
+def test_save_changes_falls_back_to_a_full_save(store):
+    data = sample_project()
+    store.save_project('plan', data)
+    tasks = [{**task, 'progress': 100} for task in data['tasks'][:3]]
+    data, _ = save_ops(store, 'plan', data, [{'op': 'replace-tasks', 'tasks': encode_tasks(tasks), 'revision': 1}])
+    assert store.load_project('plan')[0]['tasks'] == tasks
+    # A project that was never saved is written whole.
+    store.save_changes('new', data, [{'op': 'move-task', 'id': 1, 'start': '01/01/2025', 'end': '02/01/2025'}])
+    assert store.load_project('new')[0] == data
+
+
+def test_repeated_ids_are_refused(store):
+    project = sample_project()
+    store.save_project('plan', project)
+    repeated = {**project, 'tasks': project['tasks'] + [{**project['tasks'][0], 'name': 'Copy'}]}
+    with pytest.raises(ValueError, match='Task id 1 is used by more than one task'):
+        store.save_project('plan', repeated)
+    with pytest.raises(ValueError, match='Task id 1'):
+        store.save_changes('plan', repeated, [{'op': 'upsert-task', 'task': repeated['tasks'][-1]}])
+    assert store.load_project('plan') == (project, 0)
+
+
+def test_tasks_between(store):
+    store.save_project('plan', sample_project())
+    # 1 to 20 September 2024, in days since 1970-01-01.
+    assert sorted(store.tasks_between('plan', 19967, 19986)) == [3, 4]
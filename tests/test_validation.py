@@ -0,0 +1,45 @@
+from gantt_core.model import MAX_TASK_ID, MIN_TASK_ID, sample_project
+from gantt_core.validation import validate_project
+
+
+def task(task_id, start, end, dependencies=''):
+    return {'id': task_id, 'name': f"Task {task_id}", 'group': '', 'start': start, 'end': end,
+            'progress': 0, 'dependencies': dependencies, 'color': None}
+
+
+def test_sample_project():
+    # API Integration is planned to start before Backend Development ends.
+    assert validate_project(sample_project()) == ["task 5: starts on or before task 4 ends"]
+
+
+def test_each_cycle_is_reported_once():
+    tasks = [
+        task(1, '01/08/2024', '02/08/2024', '3'),
+        task(2, '03/08/2024', '04/08/2024', '1'),
+        task(3, '05/08/2024', '06/08/2024', '2'),
+        task(4, '01/08/2024', '01/08/2024', '4'),
+        # Starts before task 3 ends, outside of any cycle.
+        task(5, '06/08/2024', '07/08/2024', '3'),
+    ]
+    assert validate_project({'tasks': tasks}) == [
+        "task 1: in a dependency cycle 1 → 2 → 3 → 1",
+        "task 4: in a dependency cycle 4 → 4",
+        "task 5: starts on or before task 3 ends",
+    ]
+
+
+def test_task_problems():
+    tasks = [
+        task(1, 'soon', '02/08/2024'),
+        task(1, '05/08/2024', '01/08/2024', '9'),
+        {**task(MAX_TASK_ID + 1, '01/08/2024', '02/08/2024'), 'progress': 120},
+        task(2, '03/08/2024', '04/08/2024', str(MIN_TASK_ID - 1)),
+    ]
+    issues = validate_project({'tasks': tasks})
+    assert "task 1: unreadable start date 'soon'" in issues
+    assert "task 1: the id is used by more than one task" in issues
+    assert "task 1: end date 01/08/2024 is before the start date 05/08/2024" in issues
+    assert "task 1: depends on task 9, which does not exist" in issues
+    assert f"task {MAX_TASK_ID + 1}: the id is outside the range the chart supports" in issues
+    assert f"task 2: depends on task {MIN_TASK_ID - 1}, an id outside the range the chart supports" in issues
+    assert f"task {MAX_TASK_ID + 1}: progress 120 is not a whole number from 0 to 100" in issues